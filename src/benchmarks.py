@@ -0,0 +1,333 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+import numpy as np
+import generator
+import logic
+import solver
+
+# Domyślnie badane rozmiary planszy (n, m) oraz gęstości min
+sizes = [(8, 8), (15, 15), (30, 16), (100, 100), (300, 300), (1000, 1000)]
+densities = [0.1, 0.15, 0.2]
+
+# Dopuszczalny względny wzrost czasu względem poprzednich wyników, powyżej którego zgłaszana jest regresja
+threshold = 1.25
+
+# Liczba wydarzeń w jednym powtórzeniu pomiaru Game.event_handler
+events_count = 100
+
+# Liczba plansz w jednym powtórzeniu pomiaru generowania plansz bez zgadywania
+no_guess_count = 1000
+
+# Liczba pól odkrywanych naraz w pomiarze Game.reveal_many
+reveal_many_count = 100
+
+
+def measure(function, setup=None, repeat=5):
+    """
+    Funkcja mierząca czas wykonania badanej funkcji. Bez funkcji przygotowującej badana funkcja wywoływana jest
+    wielokrotnie w pętli (liczba wywołań dobierana jest automatycznie), w przeciwnym wypadku każde powtórzenie
+    dostaje świeży stan z funkcji przygotowującej, której czas nie jest mierzony.
+    :param function: badana funkcja; przy funkcji przygotowującej przyjmuje jej wynik i może zwrócić liczbę
+    wykonanych operacji, przez którą dzielony jest czas
+    :param setup: funkcja przygotowująca stan dla każdego powtórzenia
+    :param repeat: liczba powtórzeń
+    :return: słownik z najkrótszym i środkowym czasem jednej operacji w milisekundach
+    """
+    if setup is None:
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        times = [total / number for total in timer.repeat(repeat, number)]
+    else:
+        times = []
+        for _ in range(repeat):
+            argument = setup()
+            start = time.perf_counter()
+            operations = function(argument)
+            times.append((time.perf_counter() - start) / (operations or 1))
+    return {"min_ms": min(times) * 1e3, "median_ms": statistics.median(times) * 1e3, "repeat": repeat}
+
+
+def safe_cells(mines_array, count, rng, zero=None, viewport=None):
+    """
+    Funkcja losująca pola bez min.
+    :param mines_array: macierz min planszy
+    :param count: liczba pól
+    :param rng: generator liczb pseudolosowych
+    :param zero: macierz pól bez min w sąsiedztwie, z których losowanie ma być preferowane
+    :param viewport: widok planszy, do którego widocznych pól ma być ograniczone losowanie
+    :return: lista (i, j) wylosowanych pól
+    """
+    cells = ~mines_array if zero is None or not zero.any() else zero
+    if viewport is not None:
+        top, bottom, left, right = viewport.visible_range()
+        visible = np.zeros(cells.shape, dtype=bool)
+        visible[top:bottom, left:right] = True
+        cells = cells & visible
+    cells = np.argwhere(cells)
+    return [tuple(cell) for cell in cells[rng.choice(len(cells), min(count, len(cells)), replace=False)].tolist()]
+
+
+def started_game(n, m, mines, rng, screen=None):
+    """
+    Funkcja tworząca grę w trakcie rozgrywki - z kilkoma odkrytymi obszarami i postawionymi flagami.
+    :return: gra
+    """
+    game = logic.Game(n, m, mines, screen, rng=rng, large=True)
+    board = game.get_board()
+    mines_array = board.get_mines_array()
+    for cell in safe_cells(mines_array, 3, rng):
+        board.reveal(*cell)
+    for cell in safe_cells(mines_array, 3, rng):
+        board.cycle_flag(*cell)
+    board.pop_changes()
+    return game
+
+
+def field_center(game, i, j):
+    """
+    :return: (x, y) środek pola na ekranie
+    """
+    x, y, w, h = game.get_viewport().cell_rect(i, j)
+    return x + w / 2, y + h / 2
+
+
+def benchmark_create_field_arrays(n, m, mines, rng, repeat):
+    return measure(lambda: logic.create_field_arrays(n, m, mines, rng), repeat=repeat)
+
+
+def benchmark_border_values(n, m, mines, rng, repeat):
+    mines_array = logic.create_field_arrays(n, m, mines, rng)
+    return measure(lambda: logic.border_values(n, m, mines_array), repeat=repeat)
+
+
+def benchmark_reveal_nearby(n, m, mines, rng, repeat):
+    """
+    Pomiar odkrycia obszaru z pola bez min w sąsiedztwie na świeżej planszy (pierwsze kliknięcie).
+    """
+    def setup():
+        game = logic.Game(n, m, mines, rng=rng, large=True)
+        board = game.get_board()
+        return game, safe_cells(board.get_mines_array(), 1, rng, board.get_border_values() == 0)[0]
+
+    def run(state):
+        game, cell = state
+        game.reveal_nearby(*cell)
+
+    return measure(run, setup, repeat)
+
+
+def benchmark_reveal_many(n, m, mines, rng, repeat):
+    """
+    Pomiar odkrycia naraz wielu losowych pól bez min na świeżej planszy jednym wywołaniem Game.reveal_many.
+    """
+    def setup():
+        game = logic.Game(n, m, mines, rng=rng, large=True)
+        cells = safe_cells(game.get_board().get_mines_array(), reveal_many_count, rng)
+        return game, tuple(zip(*cells))
+
+    def run(state):
+        game, cells = state
+        game.reveal_many(cells)
+
+    return measure(run, setup, repeat)
+
+
+def benchmark_check_win_condition(n, m, mines, rng, repeat):
+    game = started_game(n, m, mines, rng)
+    return measure(game.check_win_condition, repeat=repeat)
+
+
+def benchmark_event_handler(button):
+    """
+    Funkcja tworząca pomiar czasu obsługi jednego wydarzenia przez Game.event_handler.
+    :param button: przycisk myszy wydarzeń MOUSEBUTTONDOWN albo None dla wydarzeń MOUSEMOTION
+    :return: funkcja wykonująca pomiar
+    """
+    def benchmark(n, m, mines, rng, repeat):
+        import pygame as pg
+
+        def setup():
+            game = started_game(n, m, mines, rng)
+            cells = safe_cells(game.get_board().get_mines_array(), events_count, rng, viewport=game.get_viewport())
+            if button is None:
+                return game, [pg.event.Event(pg.MOUSEMOTION, pos=field_center(game, *cell), rel=(1, 1),
+                                             buttons=(0, 0, 0)) for cell in cells]
+            return game, [pg.event.Event(pg.MOUSEBUTTONDOWN, pos=field_center(game, *cell), button=button)
+                          for cell in cells]
+
+        def run(state):
+            game, events = state
+            for event in events:
+                game.event_handler(event)
+            return len(events)
+
+        return measure(run, setup, repeat)
+
+    return benchmark
+
+
+def benchmark_no_guess(n, m, mines, rng, repeat):
+    """
+    Pomiar generowania plansz możliwych do rozwiązania bez zgadywania z pierwszym kliknięciem w środku planszy.
+    Wynikiem jest czas wygenerowania jednej planszy.
+    """
+    def run(count):
+        generator.generate(count, n, m, mines, (m // 2, n // 2), rng)
+        return count
+
+    return measure(run, lambda: no_guess_count, repeat)
+
+
+def benchmark_probability_sampling(n, m, mines, rng, repeat):
+    """
+    Pomiar szacowania losowaniem składowej większej od limitu dokładnego przeglądania. Składową jest prosty brzeg
+    odkrytego obszaru biegnący przez całą szerokość planszy: każde pole z cyfrą ogranicza trzy nieodkryte pola pod nim,
+    a miny w tym rzędzie rozmieszczone są z gęstością planszy.
+    """
+    row = rng.random(n) < mines / (n * m)
+    positions = [list(range(max(j - 1, 0), min(j + 2, n))) for j in range(n)]
+    targets = [int(row[cells].sum()) for cells in positions]
+    count = max(1, min(solver.samples, solver.max_sampled_cells // n))
+    return measure(lambda: solver.sample_component(n, positions, targets, count, rng), repeat=repeat)
+
+
+def benchmark_display(n, m, mines, rng, repeat):
+    import pygame as pg
+    import interface
+
+    screen = interface.set_window((395, 590), "Minesweeper", (200, 200, 200))
+    game = started_game(n, m, mines, rng, screen)
+    display = interface.Interface(screen, pg.font.SysFont('timesnewroman.ttf', 24), game, (200, 200, 200))
+    display.display()
+    return measure(display.display, repeat=repeat)
+
+
+# Warunki pominięcia pomiaru dla rozmiaru planszy i liczby min: gra niedopuszczalna w trybie dużych plansz albo
+# plansza zbyt duża, by generować ją bez zgadywania
+game_skip = lambda n, m, mines: logic.large_size_condition(n, m) or logic.mines_condition(mines, n, m)
+no_guess_skip = lambda n, m, mines: game_skip(n, m, mines) or n * m > generator.max_size
+sampling_skip = lambda n, m, mines: n <= solver.max_component
+
+# Badane funkcje: nazwa -> (pomiar, warunek pominięcia albo None)
+benchmarks = {
+    "create_field_arrays": (benchmark_create_field_arrays, None),
+    "border_values": (benchmark_border_values, None),
+    "reveal_nearby": (benchmark_reveal_nearby, game_skip),
+    "reveal_many": (benchmark_reveal_many, game_skip),
+    "check_win_condition": (benchmark_check_win_condition, game_skip),
+    "event_handler_left": (benchmark_event_handler(1), game_skip),
+    "event_handler_right": (benchmark_event_handler(3), game_skip),
+    "event_handler_motion": (benchmark_event_handler(None), game_skip),
+    "display": (benchmark_display, game_skip),
+    "no_guess_generate": (benchmark_no_guess, no_guess_skip),
+    "probability_sampling": (benchmark_probability_sampling, sampling_skip),
+}
+
+
+def run(selected_sizes=None, selected_densities=None, names=None, repeat=5, seed=0, log=None):
+    """
+    Funkcja wykonująca wybrane pomiary dla wszystkich kombinacji rozmiarów planszy i gęstości min. Pomiary wymagające
+    gry pomijane są dla rozmiarów, których gra nie dopuszcza, a generowanie bez zgadywania - dla dużych plansz.
+    :param selected_sizes: lista rozmiarów (n, m), domyślnie sizes
+    :param selected_densities: lista gęstości min, domyślnie densities
+    :param names: nazwy pomiarów, domyślnie wszystkie
+    :param repeat: liczba powtórzeń każdego pomiaru
+    :param seed: ziarno losowania plansz
+    :param log: strumień, do którego wypisywane są kolejne wyniki
+    :return: lista wyników pomiarów
+    """
+    results = []
+    for name in names or benchmarks:
+        benchmark, skip = benchmarks[name]
+        for n, m in selected_sizes or sizes:
+            for density in selected_densities or densities:
+                mines = round(density * n * m)
+                if skip is not None and skip(n, m, mines):
+                    continue
+                rng = np.random.default_rng([seed, n, m, mines])
+                result = {"benchmark": name, "n": n, "m": m, "density": density, "mines": mines}
+                result.update(benchmark(n, m, mines, rng, repeat))
+                results.append(result)
+                if log is not None:
+                    print("{benchmark:>22} {n:>5}x{m:<5} {density:>5.2f} {median_ms:>12.4f} ms".format(**result),
+                          file=log, flush=True)
+    return results
+
+
+def environment():
+    """
+    :return: opis środowiska, w którym wykonano pomiary
+    """
+    pygame = sys.modules.get("pygame")
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "pygame": pygame.version.ver if pygame is not None else None, "platform": platform.platform(),
+            "processor": platform.processor(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(previous, current, limit=threshold):
+    """
+    Funkcja porównująca dwa zestawy wyników i wyszukująca pomiary, które spowolniły.
+    :param previous: wcześniejsze wyniki (lista słowników jak z run)
+    :param current: nowe wyniki
+    :param limit: dopuszczalny stosunek nowego czasu do poprzedniego
+    :return: lista (wynik, poprzedni czas, nowy czas) dla pomiarów, których stosunek czasów przekracza limit
+    """
+    key = lambda result: (result["benchmark"], result["n"], result["m"], result["density"])
+    old = {key(result): result["median_ms"] for result in previous}
+    return [(result, old[key(result)], result["median_ms"]) for result in current
+            if key(result) in old and result["median_ms"] > old[key(result)] * limit]
+
+
+def main(args=None):
+    """
+    Punkt wejścia pomiarów uruchamianych z linii poleceń. Zapisuje wyniki w pliku JSON i opcjonalnie porównuje je
+    z wcześniej zapisanymi, kończąc się kodem 1, jeśli któryś pomiar spowolnił.
+    :param args: argumenty linii poleceń, domyślnie sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Pomiary wydajności logiki i rysowania sapera.")
+    parser.add_argument("--sizes", default=",".join("{}x{}".format(n, m) for n, m in sizes),
+                        help="rozmiary planszy oddzielone przecinkami, np. 8x8,30x16")
+    parser.add_argument("--densities", default=",".join(str(density) for density in densities),
+                        help="gęstości min oddzielone przecinkami")
+    parser.add_argument("--only", help="nazwy pomiarów oddzielone przecinkami: " + ", ".join(benchmarks))
+    parser.add_argument("--repeat", type=int, default=5, help="liczba powtórzeń każdego pomiaru")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno losowania plansz")
+    parser.add_argument("--output", default="benchmarks.json", help="plik, do którego zapisywane są wyniki")
+    parser.add_argument("--compare", help="plik z wcześniejszymi wynikami do porównania")
+    parser.add_argument("--threshold", type=float, default=threshold, help="dopuszczalny stosunek czasów")
+    parsed = parser.parse_args(args)
+
+    try:
+        selected_sizes = [tuple(int(value) for value in size.split("x")) for size in parsed.sizes.split(",")]
+        selected_densities = [float(density) for density in parsed.densities.split(",")]
+    except ValueError:
+        parser.error("niepoprawne rozmiary lub gęstości")
+    names = parsed.only.split(",") if parsed.only else None
+    if names and any(name not in benchmarks for name in names):
+        parser.error("nieznany pomiar")
+
+    # Rysowanie mierzone jest bez okna
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    results = run(selected_sizes, selected_densities, names, parsed.repeat, parsed.seed, sys.stdout)
+    with open(parsed.output, "w") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=1)
+
+    if parsed.compare:
+        with open(parsed.compare) as file:
+            previous = json.load(file)["results"]
+        regressions = compare(previous, results, parsed.threshold)
+        for result, old, new in regressions:
+            print("regresja: {benchmark} {n}x{m} {density}: ".format(**result) +
+                  "{:.4f} ms -> {:.4f} ms ({:.2f}x)".format(old, new, new / old))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
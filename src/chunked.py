@@ -0,0 +1,255 @@
+from collections import OrderedDict
+import numpy as np
+import logic
+
+# Domyślny bok fragmentu planszy w polach oraz największa liczba fragmentów, których miny i liczby min
+# w sąsiedztwie są jednocześnie przechowywane
+chunk_size = 64
+max_chunks = 1024
+
+# Przesunięcia ośmiu sąsiednich fragmentów
+neighbours = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if (di, dj) != (0, 0)]
+
+
+class ChunkedBoard:
+    """
+    Klasa opisująca planszę podzieloną na fragmenty o stałym boku, przeznaczoną dla plansz zbyt dużych, żeby
+    przechowywać je w całości. Miny fragmentu losowane są przy pierwszym odczycie z ziarna planszy i współrzędnych
+    fragmentu, więc każdy fragment można w dowolnej chwili odtworzyć. Miny i liczby min w sąsiedztwie (liczone
+    z uwzględnieniem pól sąsiednich fragmentów) przechowywane są jedynie dla ostatnio używanych fragmentów, a stan
+    gracza (odkrycia i flagi) - wyłącznie dla fragmentów, w których coś zmienił. Nieodwiedzone fragmenty nie zajmują
+    pamięci.
+    """
+
+    def __init__(self, n, m, density, seed=None, size=chunk_size, limit=max_chunks):
+        """
+        Konstruktor planszy.
+        :param n: pierwszy rozmiar planszy
+        :param m: drugi rozmiar planszy
+        :param density: gęstość min; każdy fragment zawiera zaokrągloną część min odpowiadającą jego rozmiarowi
+        :param seed: ziarno planszy, domyślnie losowe
+        :param size: bok fragmentu w polach
+        :param limit: największa liczba przechowywanych fragmentów z minami i liczbami min
+        """
+        self.__n = n
+        self.__m = m
+        self.__density = density
+        self.__entropy = np.random.SeedSequence(seed).entropy
+        self.__size = size
+        self.__limit = limit
+        self.__chunks = (-(-m // size), -(-n // size))
+        self.__mines = OrderedDict()
+        self.__values = OrderedDict()
+        self.__state = {}
+        self.__revealed_safe = 0
+        self.__exploded = False
+
+    def __cached(self, cache, chunk, create):
+        """
+        Metoda zwracająca wartość z pamięci ostatnio używanych fragmentów, tworząc ją w razie potrzeby i usuwając
+        najdawniej używany fragment po przekroczeniu limitu.
+        """
+        if chunk in cache:
+            cache.move_to_end(chunk)
+            return cache[chunk]
+        value = cache[chunk] = create(*chunk)
+        if len(cache) > self.__limit:
+            cache.popitem(last=False)
+        return value
+
+    def __shape(self, ci, cj):
+        return min(self.__size, self.__m - ci * self.__size), min(self.__size, self.__n - cj * self.__size)
+
+    def __contains(self, ci, cj):
+        return 0 <= ci < self.__chunks[0] and 0 <= cj < self.__chunks[1]
+
+    def __create_mines(self, ci, cj):
+        h, w = self.__shape(ci, cj)
+        rng = np.random.default_rng(np.random.SeedSequence(self.__entropy, spawn_key=(ci, cj)))
+        return logic.read_only(logic.create_field_arrays(w, h, round(self.__density * w * h), rng))
+
+    def __create_values(self, ci, cj):
+        """
+        Metoda licząca miny w sąsiedztwie pól fragmentu. Fragment obramowywany jest skrajnymi polami sąsiednich
+        fragmentów, więc liczby przy krawędziach uwzględniają miny po drugiej stronie granicy.
+        """
+        h, w = self.__shape(ci, cj)
+        padded = np.zeros((h + 2, w + 2), dtype=bool)
+        padded[1:-1, 1:-1] = self.get_chunk_mines(ci, cj)
+        for di, dj in neighbours:
+            if not self.__contains(ci + di, cj + dj):
+                continue
+            mines = self.get_chunk_mines(ci + di, cj + dj)
+            rows = slice(1, -1) if di == 0 else (0 if di < 0 else -1)
+            columns = slice(1, -1) if dj == 0 else (0 if dj < 0 else -1)
+            padded[rows, columns] = mines[slice(None) if di == 0 else (-1 if di < 0 else 0),
+                                          slice(None) if dj == 0 else (-1 if dj < 0 else 0)]
+        return logic.read_only(logic.border_values(w + 2, h + 2, padded)[1:-1, 1:-1])
+
+    def get_chunk_mines(self, ci, cj):
+        """
+        :return: macierz min fragmentu (ci, cj)
+        """
+        return self.__cached(self.__mines, (ci, cj), self.__create_mines)
+
+    def get_chunk_values(self, ci, cj):
+        """
+        :return: macierz liczby min w sąsiedztwie pól fragmentu (ci, cj); pole z miną wlicza również samo siebie
+        """
+        return self.__cached(self.__values, (ci, cj), self.__create_values)
+
+    def __chunk_state(self, ci, cj, create=False):
+        """
+        Metoda zwracająca [odkryte pola, flagi] fragmentu albo None, jeśli gracz niczego w nim nie zmienił.
+        """
+        if (ci, cj) not in self.__state and create:
+            shape = self.__shape(ci, cj)
+            self.__state[(ci, cj)] = [np.zeros(shape, dtype=bool), np.zeros(shape, dtype=np.uint8)]
+        return self.__state.get((ci, cj))
+
+    def __locate(self, i, j):
+        ci, i = divmod(i, self.__size)
+        cj, j = divmod(j, self.__size)
+        return (ci, cj), (i, j)
+
+    def is_mine(self, i, j):
+        chunk, cell = self.__locate(i, j)
+        return bool(self.get_chunk_mines(*chunk)[cell])
+
+    def get_border_value(self, i, j):
+        chunk, cell = self.__locate(i, j)
+        return int(self.get_chunk_values(*chunk)[cell])
+
+    def is_revealed(self, i, j):
+        chunk, cell = self.__locate(i, j)
+        state = self.__chunk_state(*chunk)
+        return state is not None and bool(state[0][cell])
+
+    def get_flag(self, i, j):
+        chunk, cell = self.__locate(i, j)
+        state = self.__chunk_state(*chunk)
+        return 0 if state is None else int(state[1][cell])
+
+    def cycle_flag(self, i, j):
+        """
+        Metoda zmieniająca stan flagi nieodkrytego pola: brak flagi, "Tu jest mina" i "Tu może być mina".
+        """
+        chunk, cell = self.__locate(i, j)
+        revealed, flags = self.__chunk_state(*chunk, create=True)
+        if not revealed[cell]:
+            flags[cell] = (flags[cell] + 1) % 3
+
+    def reveal(self, i, j):
+        """
+        Metoda odkrywająca pole tak, jakby zostało kliknięte. Pole bez min w sąsiedztwie odkrywa cały spójny obszar
+        takich pól wraz z obramowaniem, także ponad granicami fragmentów: obszar wyznaczany jest osobno w każdym
+        fragmencie, a pola sąsiednich fragmentów przylegające do niego stają się punktami startowymi w tych
+        fragmentach.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        chunk, (a, b) = self.__locate(i, j)
+        seeds = np.zeros(self.__shape(*chunk), dtype=bool)
+        seeds[a, b] = True
+        pending = {chunk: seeds}
+        changed_rows, changed_columns = [], []
+
+        while pending:
+            (ci, cj), seeds = pending.popitem()
+            revealed, flags = self.__chunk_state(ci, cj, create=True)
+            seeds &= ~revealed
+            if not seeds.any():
+                continue
+            values = self.get_chunk_values(ci, cj)
+            zero = values == 0
+
+            # Obszary pól bez min w sąsiedztwie, do których należą punkty startowe, wraz z obramowaniem
+            zero_area = np.zeros(zero.shape, dtype=bool)
+            if (seeds & zero).any():
+                regions, _ = logic.zero_regions(zero)
+                zero_area = np.isin(regions, regions[seeds & zero])
+            area = (logic.dilate(zero_area) | seeds) & ~revealed
+
+            revealed |= area
+            flags[area] = 0
+            mines = self.get_chunk_mines(ci, cj)
+            new_mines = int(np.count_nonzero(area & mines))
+            self.__revealed_safe += int(np.count_nonzero(area)) - new_mines
+            self.__exploded = self.__exploded or new_mines > 0
+            rows, columns = np.nonzero(area)
+            changed_rows.append(rows + ci * self.__size)
+            changed_columns.append(columns + cj * self.__size)
+
+            # Pola sąsiednich fragmentów przylegające do obszaru
+            if not zero_area.any():
+                continue
+            h, w = zero.shape
+            touching = np.zeros((h + 2, w + 2), dtype=bool)
+            touching[1:-1, 1:-1] = zero_area
+            touching = logic.dilate(touching)
+            for di, dj in neighbours:
+                if not self.__contains(ci + di, cj + dj):
+                    continue
+                rows = slice(1, -1) if di == 0 else (0 if di < 0 else -1)
+                columns = slice(1, -1) if dj == 0 else (0 if dj < 0 else -1)
+                border = touching[rows, columns]
+                if not np.any(border):
+                    continue
+                neighbour = (ci + di, cj + dj)
+                if neighbour not in pending:
+                    pending[neighbour] = np.zeros(self.__shape(*neighbour), dtype=bool)
+                pending[neighbour][slice(None) if di == 0 else (-1 if di < 0 else 0),
+                                   slice(None) if dj == 0 else (-1 if dj < 0 else 0)] |= border
+
+        return np.concatenate(changed_rows or [np.empty(0, dtype=np.intp)]), \
+            np.concatenate(changed_columns or [np.empty(0, dtype=np.intp)])
+
+    def get_window(self, top, bottom, left, right):
+        """
+        Metoda składająca z fragmentów stan prostokąta planszy, np. widocznego fragmentu do narysowania.
+        :param top: pierwszy wiersz prostokąta
+        :param bottom: wiersz za ostatnim wierszem prostokąta
+        :param left: pierwsza kolumna prostokąta
+        :param right: kolumna za ostatnią kolumną prostokąta
+        :return: (miny, liczby min w sąsiedztwie, odkryte pola, flagi) prostokąta
+        """
+        shape = (bottom - top, right - left)
+        mines, values = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=np.uint8)
+        revealed, flags = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=np.uint8)
+        for ci in range(top // self.__size, -(-bottom // self.__size)):
+            for cj in range(left // self.__size, -(-right // self.__size)):
+                # Część wspólna prostokąta i fragmentu we współrzędnych fragmentu oraz prostokąta
+                y0, x0 = ci * self.__size, cj * self.__size
+                a, b = max(top, y0), min(bottom, y0 + self.__size)
+                c, d = max(left, x0), min(right, x0 + self.__size)
+                source = (slice(a - y0, b - y0), slice(c - x0, d - x0))
+                target = (slice(a - top, b - top), slice(c - left, d - left))
+                mines[target] = self.get_chunk_mines(ci, cj)[source]
+                values[target] = self.get_chunk_values(ci, cj)[source]
+                state = self.__chunk_state(ci, cj)
+                if state is not None:
+                    revealed[target] = state[0][source]
+                    flags[target] = state[1][source]
+        return mines, values, revealed, flags
+
+    def get_size(self):
+        return self.__n, self.__m
+
+    def count_revealed_safe(self):
+        return self.__revealed_safe
+
+    def is_mine_revealed(self):
+        return self.__exploded
+
+    def count_cached_chunks(self):
+        """
+        :return: liczba fragmentów, których miny są obecnie przechowywane
+        """
+        return len(self.__mines)
+
+    def count_touched_chunks(self):
+        """
+        :return: liczba fragmentów, w których gracz cokolwiek zmienił
+        """
+        return len(self.__state)
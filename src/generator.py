@@ -0,0 +1,258 @@
+import numpy as np
+
+# Liczba plansz rozwiązywanych razem oraz największa liczba rund przenoszenia min, po której plansza losowana jest
+# od nowa
+batch_size = 512
+max_rounds = 60
+
+# Ograniczenia generowania planszy dla gry przy pierwszym kliknięciu: największa liczba pól, największa gęstość min
+# oraz największa liczba rozwiązywań paczki, po której gra rozmieszcza miny zwyczajnie, zamiast czekać
+max_size = 30 * 16
+max_density = 0.22
+max_passes = 2
+
+
+class GenerationFailed(Exception):
+    """
+    Wyjątek rzucany, gdy nie udało się wygenerować planszy możliwej do rozwiązania bez zgadywania.
+    """
+    pass
+
+
+def window_sums(array):
+    """
+    Funkcja sumująca wartości w pionowych i poziomych trójkach pól oraz w kwadratach 3x3 dla stosu plansz. Sumy
+    trójek zwracane są razem z kolumnami (wierszami) obramowania, bo reguła par korzysta z trójek leżących obok pary.
+    :param array: macierz o wymiarach (plansze, m, n)
+    :return: (sumy kwadratów (k, m, n), sumy pionowych trójek (k, m, n + 2), sumy poziomych trójek (k, m + 2, n))
+    """
+    k, m, n = array.shape
+    padded = np.zeros((k, m + 2, n + 2), dtype=np.int8)
+    padded[:, 1:-1, 1:-1] = array
+    vertical = padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]
+    horizontal = padded[:, :, :-2] + padded[:, :, 1:-1] + padded[:, :, 2:]
+    return vertical[:, :, :-2] + vertical[:, :, 1:-1] + vertical[:, :, 2:], vertical, horizontal
+
+
+def dilate(array):
+    """
+    Funkcja rozszerzająca maski logiczne stosu plansz o wszystkich ośmiu sąsiadów każdego zaznaczonego pola.
+    """
+    return window_sums(array)[0] > 0
+
+
+def pair_rules(unknown, remaining, revealed, vertical, horizontal):
+    """
+    Funkcja stosująca regułę par do sąsiadujących ze sobą odkrytych pól A i B. Zbiory nieznanych sąsiadów obu pól
+    różnią się jedynie trójką pól po stronie A i trójką po stronie B; jeśli różnica liczby pozostałych min jest równa
+    liczbie nieznanych pól trójki A, to wszystkie one są minami, a nieznane pola trójki B są bezpieczne.
+    :param unknown: maski nieznanych pól
+    :param remaining: liczby min pozostałych do wskazania wśród nieznanych sąsiadów
+    :param revealed: maski odkrytych pól
+    :param vertical: liczby nieznanych pól w pionowych trójkach (z obramowaniem kolumn)
+    :param horizontal: liczby nieznanych pól w poziomych trójkach (z obramowaniem wierszy)
+    :return: (maski pól wywnioskowanych jako bezpieczne, maski pól wywnioskowanych jako miny)
+    """
+    k, m, n = unknown.shape
+    new_safe = np.zeros((k, m, n), dtype=bool)
+    new_mines = np.zeros((k, m, n), dtype=bool)
+    for axis, counts in ((2, vertical), (1, horizontal)):
+        # A i B to pola o indeksach t i t + 1 wzdłuż osi, trójki leżą na indeksach t - 1 i t + 2
+        first, second = [slice(None)] * 3, [slice(None)] * 3
+        first[axis], second[axis] = slice(None, -1), slice(1, None)
+        outer_a, outer_b = [slice(None)] * 3, [slice(None)] * 3
+        outer_a[axis], outer_b[axis] = slice(None, -3), slice(3, None)
+        first, second, outer_a, outer_b = tuple(first), tuple(second), tuple(outer_a), tuple(outer_b)
+
+        both = revealed[first] & revealed[second]
+        a, b = remaining[first], remaining[second]
+        only_a, only_b = counts[outer_a], counts[outer_b]
+        any_only = (only_a + only_b) > 0
+        a_mines = both & any_only & (a - b == only_a)
+        b_mines = both & any_only & (b - a == only_b)
+
+        # Oznaczenia par przenoszone są na trójki: przesunięcie wzdłuż osi i rozszerzenie w poprzek niej
+        shape = (k, m + 2, n) if axis == 1 else (k, m, n + 2)
+        safe, mines = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool)
+        mines[outer_a] |= a_mines
+        safe[outer_b] |= a_mines
+        mines[outer_b] |= b_mines
+        safe[outer_a] |= b_mines
+        inner = [slice(None)] * 3
+        inner[axis] = slice(1, -1)
+        across = 3 - axis
+        for marks, result in ((safe[tuple(inner)], new_safe), (mines[tuple(inner)], new_mines)):
+            spread = marks.copy()
+            lower, upper = [slice(None)] * 3, [slice(None)] * 3
+            lower[across], upper[across] = slice(None, -1), slice(1, None)
+            spread[tuple(lower)] |= marks[tuple(upper)]
+            spread[tuple(upper)] |= marks[tuple(lower)]
+            result |= spread
+    return new_safe & unknown, new_mines & unknown
+
+
+def solve(mines_arrays, first):
+    """
+    Funkcja rozwiązująca jednocześnie stos plansz od pierwszego kliknięcia wyłącznie wnioskowaniem. W każdym kroku dla
+    wszystkich plansz naraz stosowane są reguły pojedynczego ograniczenia (wszystkie miny wskazane - pozostali sąsiedzi
+    są bezpieczni; tyle nieznanych sąsiadów, ile min - wszyscy są minami), a gdy nic z nich nie wynika - reguła par
+    sąsiednich ograniczeń oraz łączna liczba min. Kroki powtarzane są, dopóki którakolwiek plansza się zmienia.
+    :param mines_arrays: miny plansz o wymiarach (plansze, m, n)
+    :param first: (i, j) pole pierwszego kliknięcia
+    :return: (maski odkrytych pól, maski pól wywnioskowanych jako miny) w chwili rozwiązania albo utknięcia
+    """
+    k, m, n = mines_arrays.shape
+    values = window_sums(mines_arrays)[0]
+    total = mines_arrays.reshape(k, m * n).sum(axis=1)
+    revealed = np.zeros((k, m, n), dtype=bool)
+    revealed[:, first[0], first[1]] = True
+    flagged = np.zeros((k, m, n), dtype=bool)
+
+    # W kolejnych krokach rozwiązywane są tylko plansze, które zmieniły się w poprzednim
+    active = np.arange(k)
+    while len(active):
+        r, f = revealed[active], flagged[active]
+        unknown = ~(r | f)
+        unknown_counts, vertical, horizontal = window_sums(unknown)
+        remaining = values[active] - window_sums(f)[0]
+        new_safe = dilate(r & (remaining == 0)) & unknown
+        new_mines = dilate(r & (remaining == unknown_counts)) & unknown
+
+        stuck = ~(new_safe | new_mines).reshape(len(active), -1).any(axis=1)
+        if stuck.any():
+            pairs_safe, pairs_mines = pair_rules(unknown[stuck], remaining[stuck], r[stuck], vertical[stuck],
+                                                 horizontal[stuck])
+            new_safe[stuck] |= pairs_safe
+            new_mines[stuck] |= pairs_mines
+
+            # Łączna liczba min: wszystkie wskazane albo tyle, ile nieznanych pól
+            left = total[active] - f.reshape(len(active), -1).sum(axis=1)
+            hidden = unknown.reshape(len(active), -1).sum(axis=1)
+            new_safe[stuck & (left == 0)] |= unknown[stuck & (left == 0)]
+            new_mines[stuck & (left == hidden)] |= unknown[stuck & (left == hidden)]
+
+        revealed[active] = r | new_safe
+        flagged[active] = f | new_mines
+        active = active[(new_safe | new_mines).reshape(len(active), -1).any(axis=1)]
+    return revealed, flagged
+
+
+def random_layouts(count, n, m, mines, excluded, rng):
+    """
+    Funkcja losująca równomiernie rozmieszczenia min poza wykluczonymi polami dla wielu plansz naraz.
+    :return: miny plansz o wymiarach (count, m, n)
+    """
+    keys = rng.random((count, n * m))
+    keys[:, excluded.ravel()] = 2
+    layouts = np.zeros((count, n * m), dtype=bool)
+    if mines:
+        np.put_along_axis(layouts, np.argpartition(keys, mines - 1, axis=1)[:, :mines], True, axis=1)
+    return layouts.reshape(count, m, n)
+
+
+def move_mines(layouts, revealed, flagged, rng):
+    """
+    Funkcja przenosząca miny na planszach, na których wnioskowanie utknęło. Na każdej planszy losowane jest jedno
+    ograniczenie na granicy odkrytego obszaru, a miny spośród jego nieznanych sąsiadów przenoszone są na losowe pola
+    z dala od odkrytego obszaru. Wybrane ograniczenie przestaje wtedy wymagać min, więc przy kolejnym rozwiązywaniu
+    jego sąsiedzi są bezpieczni. Reszta rozmieszczenia min zostaje bez zmian.
+    :param layouts: miny plansz, modyfikowane w miejscu
+    :param revealed: maski odkrytych pól w chwili utknięcia
+    :param flagged: maski pól wywnioskowanych jako miny
+    :param rng: generator liczb pseudolosowych
+    :return: maska plansz, na których nie było gdzie przenieść min
+    """
+    k, m, n = layouts.shape
+    unknown = ~(revealed | flagged)
+    frontier = revealed & dilate(unknown)
+    keys = rng.random((k, m * n))
+    keys[~frontier.reshape(k, m * n)] = -1
+    chosen = np.zeros((k, m * n), dtype=bool)
+    np.put_along_axis(chosen, keys.argmax(axis=1)[:, None], True, axis=1)
+    sources = dilate(chosen.reshape(k, m, n)) & unknown & layouts
+
+    # Cele: nieznane pola bez min, które nie sąsiadują z odkrytym obszarem
+    targets = (unknown & ~layouts & ~dilate(revealed)).reshape(k, m * n)
+    counts = sources.reshape(k, m * n).sum(axis=1)
+    keys = rng.random((k, m * n))
+    keys[~targets] = 2
+    ranks = np.argsort(np.argsort(keys, axis=1), axis=1)
+    picked = ((ranks < counts[:, None]) & targets).reshape(k, m, n)
+
+    failed = targets.sum(axis=1) < counts
+    moved = ~failed
+    layouts[moved] = (layouts[moved] & ~sources[moved]) | picked[moved]
+    return failed
+
+
+def generate(count, n, m, mines, first, rng=None, safe_area=True, passes=None):
+    """
+    Funkcja generująca plansze, które można rozwiązać od pierwszego kliknięcia bez zgadywania. Miny losowane są
+    równomiernie poza pierwszym kliknięciem (i jego sąsiedztwem), po czym wszystkie plansze paczki rozwiązywane są
+    naraz. Rozwiązane plansze trafiają do wyniku, a na pozostałych miny przy miejscu utknięcia przenoszone są w głąb
+    nieodkrytego obszaru i plansza rozwiązywana jest ponownie od pierwszego kliknięcia, zamiast losować ją od nowa.
+    Każda zwrócona plansza przeszła więc pełne rozwiązanie od pierwszego kliknięcia.
+    :param count: liczba plansz
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param first: (i, j) pole pierwszego kliknięcia
+    :param rng: generator liczb pseudolosowych albo ziarno, domyślnie losowe
+    :param safe_area: czy sąsiedztwo pierwszego kliknięcia także ma być wolne od min (o ile starczy miejsca)
+    :param passes: największa liczba rozwiązywań paczki, domyślnie bez ograniczenia
+    :return: miny plansz o wymiarach (count, m, n)
+    """
+    rng = np.random.default_rng(rng)
+    first = tuple(int(index) for index in first)
+    excluded = np.zeros((m, n), dtype=bool)
+    excluded[first] = True
+    if safe_area:
+        area = excluded.copy()
+        area[max(first[0] - 1, 0):first[0] + 2, max(first[1] - 1, 0):first[1] + 2] = True
+        if n * m - int(area.sum()) >= mines:
+            excluded = area
+    if n * m - int(excluded.sum()) < mines:
+        raise GenerationFailed
+
+    results = []
+    found = 0
+    drawn = 0
+    pool = np.zeros((0, m, n), dtype=bool)
+    rounds = np.zeros(0, dtype=np.int64)
+    while found < count:
+        if passes is not None and passes <= 0:
+            raise GenerationFailed
+        missing = min(batch_size, max(2 * (count - found), 16)) - len(pool)
+        if missing > 0:
+            if drawn > 1000 * count:
+                raise GenerationFailed
+            pool = np.concatenate([pool, random_layouts(missing, n, m, mines, excluded, rng)])
+            rounds = np.concatenate([rounds, np.zeros(missing, dtype=np.int64)])
+            drawn += missing
+
+        revealed, flagged = solve(pool, first)
+        if passes is not None:
+            passes -= 1
+        solved = revealed.reshape(len(pool), -1).sum(axis=1) == n * m - mines
+        results.append(pool[solved])
+        found += int(solved.sum())
+
+        pool, revealed, flagged, rounds = pool[~solved], revealed[~solved], flagged[~solved], rounds[~solved] + 1
+        failed = move_mines(pool, revealed, flagged, rng) | (rounds >= max_rounds)
+        pool, rounds = pool[~failed], rounds[~failed]
+    return np.concatenate(results)[:count]
+
+
+def create_no_guess_arrays(n, m, mines, first, rng=None, safe_area=True, passes=None):
+    """
+    Funkcja losująca jedno rozmieszczenie min, które można rozwiązać od pierwszego kliknięcia bez zgadywania.
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param first: (i, j) pole pierwszego kliknięcia
+    :param rng: generator liczb pseudolosowych albo ziarno, domyślnie losowe
+    :param safe_area: czy sąsiedztwo pierwszego kliknięcia także ma być wolne od min (o ile starczy miejsca)
+    :param passes: największa liczba rozwiązywań paczki, domyślnie bez ograniczenia
+    :return: macierz min o wymiarach m na n
+    """
+    return generate(1, n, m, mines, first, rng, safe_area, passes)[0]
@@ -0,0 +1,203 @@
+import bisect
+import json
+import time
+import pygame as pg
+import interface
+
+# Granice przedziałów histogramów czasu (w milisekundach) oraz liczby narysowanych pól
+time_edges = [0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3, 66.7, 125, 250]
+fields_edges = [0, 1, 4, 16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576]
+
+# Wysokość paska z podsumowaniem pomiarów dodawanego pod oknem gry oraz co ile sekund jest odświeżany
+overlay_height = 40
+overlay_interval = 0.5
+
+
+class Histogram:
+    """
+    Klasa zliczająca wartości w przedziałach o zadanych granicach. Ostatni przedział zbiera wartości większe od
+    ostatniej granicy. Oprócz liczności przedziałów przechowywane są liczba, suma i maksimum wartości.
+    """
+
+    def __init__(self, edges):
+        """
+        Konstruktor histogramu.
+        :param edges: rosnące granice przedziałów (wartość równa granicy należy do przedziału kończącego się na niej)
+        """
+        self.__edges = list(edges)
+        self.__counts = [0] * (len(self.__edges) + 1)
+        self.__count = 0
+        self.__total = 0
+        self.__max = 0
+
+    def add(self, value):
+        self.__counts[bisect.bisect_left(self.__edges, value)] += 1
+        self.__count += 1
+        self.__total += value
+        self.__max = max(self.__max, value)
+
+    def percentile(self, fraction):
+        """
+        Metoda szacująca kwantyl jako górną granicę przedziału, w którym się znajduje.
+        :param fraction: rząd kwantyla z przedziału [0, 1]
+        :return: górna granica przedziału albo maksimum dla ostatniego przedziału
+        """
+        if not self.__count:
+            return 0
+        needed = fraction * self.__count
+        total = 0
+        for edge, count in zip(self.__edges, self.__counts):
+            total += count
+            if total >= needed:
+                return min(edge, self.__max)
+        return self.__max
+
+    def get_count(self):
+        return self.__count
+
+    def get_mean(self):
+        return self.__total / self.__count if self.__count else 0
+
+    def get_max(self):
+        return self.__max
+
+    def to_dict(self):
+        return {"edges": self.__edges, "counts": self.__counts, "count": self.__count, "mean": self.get_mean(),
+                "max": self.__max, "p50": self.percentile(0.5), "p95": self.percentile(0.95),
+                "p99": self.percentile(0.99)}
+
+
+class FrameStats:
+    """
+    Klasa mierząca koszt klatek głównej pętli: czas obsługi wydarzeń, czas rysowania, liczbę narysowanych pól
+    planszy oraz liczbę pełnych i częściowych odrysowań. Po wyłączeniu metoda render tylko wywołuje funkcję rysującą,
+    a metody zbierające pomiary i rysujące podsumowanie nic nie robią, więc obiekt można zawsze przekazywać do pętli
+    gry.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Konstruktor pomiarów.
+        :param enabled: czy pomiary są włączone
+        """
+        self.__enabled = enabled
+        self.__histograms = {"frame_ms": Histogram(time_edges), "events_ms": Histogram(time_edges),
+                             "render_ms": Histogram(time_edges), "fields": Histogram(fields_edges),
+                             "interval_ms": Histogram(time_edges)}
+        self.__full = 0
+        self.__partial = 0
+        self.__events = 0
+        self.__merged = 0
+        self.__frame_start = None
+        self.__previous_start = None
+        self.__render = 0.0
+        self.__fields = 0
+        self.__overlay_time = 0.0
+
+    def is_enabled(self):
+        return self.__enabled
+
+    def start_frame(self):
+        """
+        Metoda rozpoczynająca pomiar klatki, wywoływana na początku obrotu pętli.
+        """
+        if self.__enabled:
+            self.__previous_start, self.__frame_start = self.__frame_start, time.perf_counter()
+            self.__render = 0.0
+            self.__fields = 0
+
+    def render(self, function, game, full=False):
+        """
+        Metoda wywołująca funkcję rysującą i doliczająca jej czas oraz narysowane pola do bieżącej klatki.
+        :param function: funkcja rysująca, np. Interface.display albo Interface.display_changes
+        :param game: gra, której planszę rysuje funkcja
+        :param full: czy funkcja odrysowuje cały ekran
+        """
+        if not self.__enabled:
+            function()
+            return
+        start = time.perf_counter()
+        function()
+        self.__render += time.perf_counter() - start
+        self.__fields += game.get_surface().pop_drawn_count()
+        if full:
+            # Pełne odrysowanie zamalowuje również pasek z podsumowaniem, więc trzeba go narysować ponownie
+            self.__full += 1
+            self.__overlay_time = 0.0
+        else:
+            self.__partial += 1
+
+    def count_events(self, received, handled):
+        """
+        Metoda doliczająca wydarzenia klatki: odebrane z kolejki oraz pozostałe do obsłużenia po ich połączeniu.
+        :param received: liczba odebranych wydarzeń
+        :param handled: liczba obsłużonych wydarzeń
+        """
+        if self.__enabled:
+            self.__events += received
+            self.__merged += received - handled
+
+    def end_frame(self):
+        """
+        Metoda kończąca pomiar klatki, wywoływana przed czekaniem na kolejną klatkę. Czas obsługi wydarzeń to czas
+        klatki bez czasu rysowania.
+        """
+        if not self.__enabled or self.__frame_start is None:
+            return
+        frame = time.perf_counter() - self.__frame_start
+        self.__histograms["frame_ms"].add(frame * 1e3)
+        self.__histograms["events_ms"].add((frame - self.__render) * 1e3)
+        self.__histograms["render_ms"].add(self.__render * 1e3)
+        self.__histograms["fields"].add(self.__fields)
+        if self.__previous_start is not None:
+            self.__histograms["interval_ms"].add((self.__frame_start - self.__previous_start) * 1e3)
+
+    def get_histogram(self, name):
+        return self.__histograms[name]
+
+    def get_full_redraws(self):
+        return self.__full
+
+    def get_partial_redraws(self):
+        return self.__partial
+
+    def get_merged_events(self):
+        return self.__merged
+
+    def to_dict(self):
+        return {"frames": self.__histograms["frame_ms"].get_count(), "full_redraws": self.__full,
+                "partial_redraws": self.__partial,
+                "events": self.__events, "merged_events": self.__merged,
+                "histograms": {name: histogram.to_dict() for name, histogram in self.__histograms.items()}}
+
+    def dump(self, path):
+        """
+        Metoda zapisująca zebrane pomiary do pliku JSON.
+        :param path: ścieżka pliku
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=1)
+
+    def draw_overlay(self, screen, rect, background_color):
+        """
+        Metoda rysująca pasek z podsumowaniem pomiarów. Pasek odświeżany jest co overlay_interval sekund, żeby samo
+        rysowanie podsumowania nie zaburzało pomiarów.
+        :param screen: ekran
+        :param rect: prostokąt paska
+        :param background_color: kolor tła paska
+        """
+        now = time.perf_counter()
+        if not self.__enabled or now - self.__overlay_time < overlay_interval:
+            return
+        self.__overlay_time = now
+        frame, render = self.__histograms["frame_ms"], self.__histograms["render_ms"]
+        lines = ["klatka p50 {:.2f} p95 {:.2f} max {:.2f} ms  odstęp max {:.1f} ms".format(
+                     frame.percentile(0.5), frame.percentile(0.95), frame.get_max(),
+                     self.__histograms["interval_ms"].get_max()),
+                 "rysowanie p95 {:.2f} ms  pola max {}  pełne {}  częściowe {}".format(
+                     render.percentile(0.95), self.__histograms["fields"].get_max(), self.__full, self.__partial)]
+        screen.fill(background_color, rect)
+        font = interface.get_font(16)
+        for index, line in enumerate(lines):
+            interface.write_text(font, screen, line, (rect.x + 5, rect.y + 4 + index * 16))
+        pg.display.update(rect)
@@ -1,4 +1,6 @@
 from abc import abstractmethod, ABC
+from functools import lru_cache
+import numpy as np
 import pygame as pg
 
 black = (0, 0, 0)
@@ -34,6 +36,223 @@ def write_text(font, screen, text="", position=(0, 0), color="black"):
     screen.blit(img, position)
 
 
+def wait_events(timeout=None):
+    """
+    Funkcja usypiająca program do nadejścia wydarzenia zamiast odpytywać kolejkę w każdej klatce, dzięki czemu
+    bezczynne okno nie zużywa procesora.
+    :param timeout: najdłuższy czas czekania w milisekundach, domyślnie bez ograniczenia
+    :return: lista wydarzeń, które nadeszły, pusta po upływie czasu czekania
+    """
+    event = pg.event.wait() if timeout is None else pg.event.wait(timeout)
+    events = [] if event.type == pg.NOEVENT else [event]
+    return events + pg.event.get()
+
+
+def coalesce_events(events):
+    """
+    Funkcja łącząca wydarzenia jednej klatki, których osobna obsługa niczego nie zmienia: z ruchów myszki zostaje
+    jedynie ostatni, a kolejne obroty kółka sumowane są w jeden.
+    :param events: lista wydarzeń w kolejności nadejścia
+    :return: lista wydarzeń do obsłużenia
+    """
+    last_motion = max((index for index, event in enumerate(events) if event.type == pg.MOUSEMOTION), default=None)
+    coalesced = []
+    for index, event in enumerate(events):
+        if event.type == pg.MOUSEMOTION and index != last_motion:
+            continue
+        if event.type == pg.MOUSEWHEEL and coalesced and coalesced[-1].type == pg.MOUSEWHEEL:
+            previous = coalesced.pop()
+            event = pg.event.Event(pg.MOUSEWHEEL, x=previous.x + event.x, y=previous.y + event.y)
+        coalesced.append(event)
+    return coalesced
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """
+    Funkcja zwracająca font o zadanym rozmiarze. Fonty wczytywane są raz i współdzielone przez wszystkie pola.
+    :param size: rozmiar fonta
+    :return: font
+    """
+    return pg.font.SysFont('timesnewroman.ttf', size)
+
+
+@lru_cache(maxsize=None)
+def get_glyph(text, size, color="black"):
+    """
+    Funkcja zwracająca wyrenderowany tekst (cyfrę lub znak zapytania) o zadanym rozmiarze i kolorze. Każdy znak
+    renderowany jest raz, a rysowanie pola sprowadza się do skopiowania gotowej powierzchni.
+    :param text: tekst do wyrenderowania
+    :param size: rozmiar fonta
+    :param color: kolor tekstu
+    :return: powierzchnia z tekstem
+    """
+    return get_font(size).render(text, True, color)
+
+
+class TileAtlas:
+    """
+    Klasa przechowująca kafelki pól o zadanym rozmiarze - gotowe powierzchnie dla każdego koloru pola i znaku na nim
+    (cyfra min w sąsiedztwie, flaga X, znak zapytania). Kafelek renderowany jest raz, przy pierwszym użyciu.
+    """
+
+    def __init__(self, w, h):
+        """
+        Konstruktor atlasu.
+        :param w: szerokość pola
+        :param h: wysokość pola
+        """
+        self.__w = w
+        self.__h = h
+        self.__tiles = {}
+
+    def get_tile(self, color, mark=None, border=False):
+        """
+        Metoda zwracająca kafelek dla zadanego stanu pola.
+        :param color: kolor pola
+        :param mark: cyfra min w sąsiedztwie, "X", "?" albo None
+        :param border: czy kafelek ma zawierać otoczkę dookoła
+        :return: powierzchnia kafelka
+        """
+        key = (color, mark, border)
+        if key not in self.__tiles:
+            self.__tiles[key] = self.__render(color, mark, border)
+        return self.__tiles[key]
+
+    def __render(self, color, mark, border):
+        margin = 1 if border else 0
+        tile = pg.Surface((self.__w + 2 * margin, self.__h + 2 * margin))
+        rect = pg.Rect(margin, margin, self.__w, self.__h)
+        pg.draw.rect(tile, color, rect)
+        if border:
+            pg.draw.rect(tile, black, tile.get_rect(), 3)
+
+        size = int(self.__h // 1.5) if self.__h <= self.__w else int(self.__w // 1.5)
+        height = get_font(size).get_height()
+        if mark == "X":
+            pg.draw.line(tile, black, rect.bottomleft, rect.topright, 3)
+            pg.draw.line(tile, black, rect.bottomright, rect.topleft, 3)
+        elif mark is not None:
+            tile.blit(get_glyph(str(mark), size), (rect.centerx - height / 3, rect.centery - height / 2))
+        return tile
+
+
+def field_color(color, mines_color, mine, revealed):
+    """
+    Funkcja wyliczająca kolor pola ze stanu planszy: miny mogą mieć wspólny kolor ustawiony przez grę, a odkryte pola
+    bez min są rozjaśnione.
+    :param color: podstawowy kolor pól
+    :param mines_color: kolor min ustawiony przez grę albo None
+    :param mine: czy pole zawiera minę
+    :param revealed: czy pole jest odkryte
+    :return: kolor pola
+    """
+    if mine and mines_color is not None:
+        return mines_color
+    if revealed and not mine:
+        r, g, b = color
+        return r + 30 if r < 225 else 255, g + 30 if g < 225 else 255, b + 30 if b < 225 else 255
+    return color
+
+
+def field_mark(mine, revealed, flag, border_mines):
+    """
+    Funkcja wybierająca znak na polu: cyfrę min w sąsiedztwie, jeżeli pole jest odkryte, albo X lub ? jako flagę,
+    jeśli pole jest nieodkryte.
+    :return: cyfra, "X", "?" albo None
+    """
+    if revealed and border_mines != 0 and not mine:
+        return border_mines
+    elif flag == 1 and not revealed:
+        return "X"
+    elif flag == 2 and not revealed:
+        return "?"
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_tile_atlas(w, h):
+    """
+    Funkcja zwracająca atlas kafelków dla pól o zadanym rozmiarze, tworzony raz dla każdego rozmiaru pola.
+    :param w: szerokość pola
+    :param h: wysokość pola
+    :return: atlas kafelków
+    """
+    return TileAtlas(w, h)
+
+
+class BoardSurface:
+    """
+    Klasa przechowująca pozaekranową powierzchnię planszy, na którą kopiowane są kafelki pól. Zmiana stanu pola
+    kosztuje skopiowanie jednego kafelka, a na ekran cała plansza trafia jednym kopiowaniem.
+    """
+
+    def __init__(self, x, y, w, h):
+        """
+        Konstruktor powierzchni planszy.
+        :param x: położenie x planszy
+        :param y: położenie y planszy
+        :param w: szerokość planszy
+        :param h: wysokość planszy
+        """
+        self.__rect = pg.Rect(x - 1, y - 1, w + 2, h + 2)
+        self.__surface = pg.Surface(self.__rect.size)
+        self.__surface.fill(black)
+        self.__drawn_count = 0
+
+    def draw_cells(self, board, rows, columns, viewport, color):
+        """
+        Metoda kopiująca na powierzchnię planszy kafelki zadanych pól wraz z otoczką. Stan pól odczytywany jest
+        jednorazowo z macierzy planszy, bez tworzenia obiektów pól.
+        :param board: plansza (logic.Board)
+        :param rows: wiersze pól do narysowania
+        :param columns: kolumny pól do narysowania
+        :param viewport: widok planszy (logic.Viewport) wyznaczający położenie pól
+        :param color: podstawowy kolor pól
+        :return: lista prostokątów ekranu zajmowanych przez narysowane pola
+        """
+        rows, columns = np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)
+        w, h = viewport.get_cell_size()
+        atlas = get_tile_atlas(int(w), int(h))
+        mines_color = board.get_mines_color()
+        states = zip(rows.tolist(), columns.tolist(), board.get_mines_array()[rows, columns].tolist(),
+                     board.get_revealed_array()[rows, columns].tolist(),
+                     board.get_flags_array()[rows, columns].tolist(), board.get_border_values()[rows, columns].tolist())
+        rects = []
+        for i, j, mine, revealed, flag, border_mines in states:
+            x, y, _, _ = viewport.cell_rect(i, j)
+            rect = pg.Rect(x, y, w, h)
+            tile = atlas.get_tile(field_color(color, mines_color, mine, revealed),
+                                  field_mark(mine, revealed, flag, border_mines), True)
+            self.__surface.blit(tile, (rect.x - 1 - self.__rect.x, rect.y - 1 - self.__rect.y))
+            rects.append(rect.inflate(4, 4).clip(self.__rect))
+        self.__drawn_count += len(rects)
+        return rects
+
+    def clear(self):
+        """
+        Metoda zamalowująca powierzchnię planszy, np. przed narysowaniem przesuniętego widoku.
+        """
+        self.__surface.fill(black)
+
+    def get_rect(self):
+        return self.__rect
+
+    def pop_drawn_count(self):
+        """
+        Metoda zwracająca liczbę pól narysowanych od poprzedniego wywołania i zerująca licznik.
+        """
+        count, self.__drawn_count = self.__drawn_count, 0
+        return count
+
+    def blit(self, screen):
+        """
+        Metoda kopiująca całą planszę na ekran.
+        :param screen: ekran
+        """
+        screen.blit(self.__surface, self.__rect)
+
+
 class Rectangle:
     """
     Klasa, po której dziedziczy większość dalszych klas. Definiuje najbardziej podstawowy prostokąt, dając podstawę
@@ -119,6 +338,7 @@ class TextBox(Rectangle, ABC):
         self.__text = ""
         self.__font = font
         self.__txt_surface = font.render(self.__text, True, self.color)
+        self.__txt_color = self.color
         self.__active = False
 
     def event_handler(self, event):
@@ -144,7 +364,9 @@ class TextBox(Rectangle, ABC):
                     self.__text += event.unicode
                     if len(self.__text) > self.w // 10:
                         self.__text = self.__text[:-1]
-                self.__txt_surface = self.__font.render(self.__text, True, self.color)
+                # Tekst renderowany jest dopiero przy rysowaniu, więc kilka klawiszy w jednej klatce renderuje go raz
+                self.__txt_surface = None
+                self.__txt_color = self.color
 
     def draw(self, screen, thickness=2, border=False):
         """
@@ -153,6 +375,8 @@ class TextBox(Rectangle, ABC):
         :param thickness: grubość krawędzi pola
         :param border: czy ma rysować dodatkowe krawędzie
         """
+        if self.__txt_surface is None:
+            self.__txt_surface = self.__font.render(self.__text, True, self.__txt_color)
         screen.blit(self.__txt_surface, (self.rect.x + 5, self.rect.y + 5))
         super().draw(screen, thickness, False)
 
@@ -172,7 +396,8 @@ class TextBox(Rectangle, ABC):
         Metoda czyści pole tekstowe.
         """
         self.__text = ""
-        self.__txt_surface = self.__font.render(self.__text, True, self.color)
+        self.__txt_surface = None
+        self.__txt_color = self.color
 
     def isEmpty(self):
         """
@@ -190,18 +415,24 @@ class Button(Rectangle, ABC):
     Klasa definiująca duży przycisk służący do zaczęcia nowej gry.
     """
 
-    def highlight(self, screen, thickness=0):
+    def is_hovered(self, position):
+        """
+        :param position: pozycja myszki
+        :return: czy myszka znajduje się nad przyciskiem
+        """
+        return self.rect.x <= position[0] <= self.rect.x + self.rect.w \
+            and self.rect.y <= position[1] <= self.rect.y + self.rect.h
+
+    def highlight(self, screen, thickness=0, position=None):
         """
         Metoda realizująca podświetlenie przycisku zaczęcia nowej gry, gdy się na nią najedzie. Daje to poczucie
         interaktywności przycisku.
         :param screen: ekran
         :param thickness: grubość ścianek domyślnie wypełnienie
+        :param position: pozycja myszki, domyślnie odczytywana z pygame
         """
-        mouse = pg.mouse.get_pos()
-
         # Odczyt pozycji myszki i ustalenie czy przycisk ma się podświetlić
-        if self.rect.x <= mouse[0] <= self.rect.x + self.rect.w \
-                and self.rect.y <= mouse[1] <= self.rect.y + self.rect.h:
+        if self.is_hovered(pg.mouse.get_pos() if position is None else position):
             a, b, c = self.default_color
             self.color = (a + 10 if a < 245 else 255, b + 10 if b < 245 else 255, c + 10 if c < 245 else 255)
         else:
@@ -221,12 +452,16 @@ class Button(Rectangle, ABC):
 
 class Field(Rectangle):
     """
-    Klasa definiująca podstawowy element gry, czyli pole, ale bez miny.
+    Klasa definiująca podstawowy element gry, czyli pole, ale bez miny. Pole jest jedynie widokiem na stan planszy
+    (logic.Board) - sam przechowuje wyłącznie położenie i kolor, a odczyty i zmiany stanu przekazuje do planszy.
     """
 
-    def __init__(self, x, y, w, h, color=white):
+    def __init__(self, board, i, j, x, y, w, h, color=white):
         """
         Konstruktor nowego pola.
+        :param board: plansza, na którą pole jest widokiem
+        :param i: pierwszy indeks pola na planszy
+        :param j: drugi indeks pola na planszy
         :param x: położenie x pola
         :param y: położenie y pola
         :param w: szerokość pola
@@ -234,9 +469,9 @@ class Field(Rectangle):
         :param color: kolor
         """
         super().__init__(x, y, w, h, color)
-        self.__clicked = False
-        self.__border_mines = None
-        self.__right_clicks = 0
+        self.__board = board
+        self.__i = i
+        self.__j = j
 
     def event_handler(self, event):
         """
@@ -244,7 +479,7 @@ class Field(Rectangle):
         :param event: przychodzące wydarzenie
         :return: bool: czy aktywowane pole graniczy z jakąś miną
         """
-        if not self.__clicked:
+        if not self.get_clicked():
             if event.type == pg.MOUSEBUTTONDOWN:
                 if self.rect.collidepoint(event.pos):
                     left, _, right = pg.mouse.get_pressed(3)
@@ -261,59 +496,56 @@ class Field(Rectangle):
         Metoda aktywująca pole pod warunkiem, że już nie zostało aktywowane.
         :return: true - pole nie graniczy z żadną miną; false - pole graniczy z jakąkolwiek miną
         """
-        if not self.__clicked:
-            self.__clicked = True
-            r, g, b = self.color
-            self.color = (r + 30 if r < 225 else 255, g + 30 if g < 225 else 255, b + 30 if b < 225 else 255)
-            return self.__border_mines == 0
+        return self.__board.activate(self.__i, self.__j)
 
     def draw(self, screen, thickness=0, border=False):
         """
-        Metoda rysująca pole oraz rysująca na nim znaki czy cyfry min dookoła.
+        Metoda rysująca pole wraz ze znakami czy cyfrą min dookoła jednym skopiowaniem gotowego kafelka.
         :param screen: ekran, na którym ma rysować
-        :param thickness: grubość ścianek prostokąta, domyślnie zero co jest wypełnieniem
+        :param thickness: nieużywane, pole jest zawsze wypełnione
         :param border: czy rysować otoczkę dookoła
         """
-        super().draw(screen, thickness, border)
-        font = pg.font.SysFont('timesnewroman.ttf', int(self.h // 1.5) if self.h <= self.w else int(self.w // 1.5))
-
-        # Wyświetla cyfrę min w sąsiedztwie miny, jeżeli aktywowane
-        if self.__clicked and self.__border_mines != 0 and not isinstance(self, FieldWithMine):
-            write_text(font, screen, str(self.__border_mines),
-                       (self.rect.centerx - font.get_height() / 3, self.rect.centery - font.get_height() / 2))
+        margin = 1 if border else 0
+        screen.blit(self.get_tile(border), (self.rect.x - margin, self.rect.y - margin))
 
-        # Wyświetla X jako flagę "Tu jest mina", jeśli pole nieaktywowane
-        elif self.__right_clicks == 1 and not self.__clicked:
-            pg.draw.line(screen, (0, 0, 0), self.rect.bottomleft, self.rect.topright, 3)
-            pg.draw.line(screen, (0, 0, 0), self.rect.bottomright, self.rect.topleft, 3)
-
-        # Wyświetla ? jako flagę "Tu może być mina", jeśli pole nieaktywowane
-        elif self.__right_clicks == 2 and not self.__clicked:
-            write_text(font, screen, "?",
-                       (self.rect.centerx - font.get_height() / 3, self.rect.centery - font.get_height() / 2))
+    def get_tile(self, border=False):
+        """
+        Metoda wybierająca z atlasu kafelek odpowiadający stanowi pola: kolor oraz cyfrę min w sąsiedztwie, jeżeli
+        aktywowane, albo X lub ? jako flagę, jeśli pole nieaktywowane.
+        :param border: czy kafelek ma zawierać otoczkę dookoła
+        :return: kafelek pola
+        """
+        mark = field_mark(isinstance(self, FieldWithMine), self.get_clicked(), self.get_right_clicks(),
+                          self.__board.get_border_value(self.__i, self.__j))
+        return get_tile_atlas(self.rect.w, self.rect.h).get_tile(self.color, mark, border)
 
-    def set_border_mines(self, border_mines):
-        self.__border_mines = border_mines
+    @property
+    def color(self):
+        """
+        Kolor pola wyliczany ze stanu planszy: miny mogą mieć wspólny kolor ustawiony przez grę, a odkryte pola bez
+        min są rozjaśnione.
+        """
+        return field_color(self.default_color, self.__board.get_mines_color(), isinstance(self, FieldWithMine),
+                           self.get_clicked())
 
     def get_clicked(self):
-        return self.__clicked
+        return self.__board.is_revealed(self.__i, self.__j)
 
     def left_click(self):
-        self.__clicked = True
+        self.__board.reveal_mine(self.__i, self.__j)
 
     def right_click(self):
         """
         Metoda zmieniająca stan pola ze trzech możliwych: podstawowego,
         z flagą "Tu jest mina" i z flagą "Tu może być mina".
         """
-        if not self.__clicked:
-            self.__right_clicks = (self.__right_clicks + 1) % 3
+        self.__board.cycle_flag(self.__i, self.__j)
 
     def set_right_clicks(self, value):
-        self.__right_clicks = value % 3
+        self.__board.set_flag(self.__i, self.__j, value)
 
     def get_right_clicks(self):
-        return self.__right_clicks
+        return self.__board.get_flag(self.__i, self.__j)
 
     def get_color(self):
         return self.color
@@ -342,8 +574,8 @@ class FieldWithMine(Field):
                         super().right_click()
         return False
 
-    def set_color(self, color):
-        self.color = color
+    def __repr__(self):
+        return "Mina"
 
 
 class Interface:
@@ -371,35 +603,64 @@ class Interface:
                              Rectangle(265, 550, 35, 35, self.__game.get_color())]
         self.__attributes = []
 
+        # Obszary komunikatu i liczników oraz ostatnio narysowany ich stan, żeby odświeżać je tylko przy zmianie
+        self.__message_rect = pg.Rect(0, 107, 395, 50)
+        self.__counter_rects = [pg.Rect(45, 552, 85, 32), pg.Rect(175, 552, 85, 32), pg.Rect(305, 552, 85, 32)]
+        self.__drawn_hud = None
+        self.__hovered = False
+
     def display_nonstop(self, update=False):
         """
         Metoda wyświetlająca najważniejsze elementy na ekranie, które potrzebują rysowania za każdym razem.
         Metoda występuje samodzielnie albo jako składowa innej metody, wobec tego przyjmuje argument czy ma po sobie
-        odświeżyć ekran czy jeszcze nie.
+        odświeżyć zajmowane przez te elementy fragmenty ekranu czy jeszcze nie.
         :param update: czy metoda ma odświeżyć ekran
+        :return: lista prostokątów zajmowanych przez narysowane elementy
         """
+        rects = []
         for box in self.__boxes:
+            self.__screen.fill(self.__background_color, box.rect)
             box.draw(self.__screen)
+            rects.append(box.rect)
 
-        self.__button.highlight(self.__screen)
-        pg.draw.polygon(self.__screen, (0, 220, 0), [(325, 27), (325, 77), (365, 50)])
+        rects.append(self.display_button())
 
         if update:
-            pg.display.update()
+            pg.display.update(rects)
+        return rects
 
-    def display(self):
+    def display_button(self, position=None):
         """
-        Metoda wyświetlająca cały ekran od nowa, odświeżająca go.
+        Metoda rysująca przycisk nowej gry, podświetlony, jeśli znajduje się nad nim myszka.
+        :param position: pozycja myszki, domyślnie odczytywana z pygame
+        :return: prostokąt zajmowany przez przycisk
         """
-        self.__screen.fill(self.__background_color)
-
-        write_text(self.__font, self.__screen, "Rozmiar planszy:", (5, 5))
-        write_text(self.__font, self.__screen, "Liczba min:", (5, 55))
-        write_text(self.__font, self.__screen, "x", (59, 27))
+        position = pg.mouse.get_pos() if position is None else position
+        self.__hovered = self.__button.is_hovered(position)
+        self.__button.highlight(self.__screen, position=position)
+        pg.draw.polygon(self.__screen, (0, 220, 0), [(325, 27), (325, 77), (365, 50)])
+        return self.__button.rect.inflate(4, 4)
 
-        self.display_nonstop()
+    def hover(self, position):
+        """
+        Metoda obsługująca ruch myszki. Ruch nie zmienia niczego poza podświetleniem przycisku nowej gry, więc
+        przycisk rysowany jest ponownie tylko wtedy, gdy myszka nad niego wjedzie albo z niego zjedzie.
+        :param position: pozycja myszki
+        :return: lista prostokątów ekranu, które należy odświeżyć
+        """
+        if self.__button.is_hovered(position) == self.__hovered:
+            return []
+        return [self.display_button(position)]
 
-        pg.draw.line(self.__screen, (0, 0, 0), (0, 105), (400, 105), 2)
+    def display_hud(self, clear=False):
+        """
+        Metoda wyświetlająca komunikat dla gracza oraz liczniki min i flag.
+        :param clear: czy przed rysowaniem zamalować tło pod komunikatem i licznikami
+        :return: lista prostokątów zajmowanych przez narysowane elementy
+        """
+        if clear:
+            for rect in [self.__message_rect] + self.__counter_rects:
+                self.__screen.fill(self.__background_color, rect)
 
         # Wyświetlanie komunikatów do gracza o problemach, bądź rezultacie rozgrywki
         if self.__message == 0:
@@ -411,6 +672,29 @@ class Interface:
         elif self.__message == 3:
             write_text(self.__font, self.__screen, "Wygrałeś!", (157, 125))
 
+        # Liczby flag
+        flags = self.__game.get_flags_count()
+        counters = [self.__game.get_mines(), flags[0], flags[1]]
+        for counter, rect in zip(counters, self.__counter_rects):
+            write_text(self.__font, self.__screen, ": " + str(counter), (rect.x, rect.y + 8))
+
+        self.__drawn_hud = (self.__message, counters)
+        return [self.__message_rect] + self.__counter_rects
+
+    def display(self):
+        """
+        Metoda wyświetlająca cały ekran od nowa, odświeżająca go.
+        """
+        self.__screen.fill(self.__background_color)
+
+        write_text(self.__font, self.__screen, "Rozmiar planszy:", (5, 5))
+        write_text(self.__font, self.__screen, "Liczba min:", (5, 55))
+        write_text(self.__font, self.__screen, "x", (59, 27))
+
+        self.display_nonstop()
+
+        pg.draw.line(self.__screen, (0, 0, 0), (0, 105), (400, 105), 2)
+
         # Ikony liczby min i flag
         for prop in self.__properties:
             prop.draw(self.__screen, 0, True)
@@ -426,15 +710,22 @@ class Interface:
                    (rect_mine.centerx - self.__font.get_height() / 3.6,
                     rect_mine.centery - self.__font.get_height() / 2.4))
 
-        # Liczby flag
-        flags = self.__game.get_flags_count()
-        write_text(self.__font, self.__screen, ": " + str(self.__game.get_mines()), (45, 560))
-        write_text(self.__font, self.__screen, ": " + str(flags[0]), (175, 560))
-        write_text(self.__font, self.__screen, ": " + str(flags[1]), (305, 560))
-
+        self.display_hud()
         self.__game.display()
         pg.display.update()
 
+    def display_changes(self):
+        """
+        Metoda wyświetlająca jedynie to, co zmieniło się od poprzedniego rysowania: zmienione pola planszy, komunikat
+        i liczniki, a także pola tekstowe i przycisk. Odświeża na ekranie wyłącznie zajmowane przez nie prostokąty.
+        """
+        rects = self.display_nonstop()
+        flags = self.__game.get_flags_count()
+        if self.__drawn_hud != (self.__message, [self.__game.get_mines(), flags[0], flags[1]]):
+            rects += self.display_hud(True)
+        rects += self.__game.display_changes()
+        pg.display.update(rects)
+
     def event_handler(self, event):
         """
         Handler iterujący po każdym ze zdefiniowanych elementów interfejsu; dysponujący, kumulujący oraz rozporządzający
@@ -1,71 +1,710 @@
 import numpy as np
-import interface
 
 # Wyrażenia lambda decydujące o dopuszczalnych rozmiarach planszy czy liczby min
 size_condition = lambda n, m: n > 15 or n < 2 or m > 15 or m < 2
+large_size_condition = lambda n, m: n > large_size or n < 2 or m > large_size or m < 2
 mines_condition = lambda mines, n, m: mines < 0 or mines > m * n
 
 # Domyślny kolor
 white = (255, 255, 255)
 
+# Największy rozmiar planszy w trybie dużych plansz
+large_size = 1000
 
-def create_field_arrays(n, m, mines, color=white):
+# Sposoby rozmieszczania min: od razu przy tworzeniu gry albo dopiero przy pierwszym odkryciu pola - poza odkrywanym
+# polem, poza nim i jego sąsiedztwem albo tak, żeby planszę można było rozwiązać bez zgadywania
+placements = ["random", "safe", "area", "no_guess"]
+
+
+# Położenie lewego górnego rogu planszy oraz jej rozmiar w pikselach
+starting_points = (5, 160)
+size_board = (385, 385)
+
+# Najmniejszy i największy rozmiar pola w pikselach na planszach, które nie mieszczą się w całości, oraz krotność
+# zmiany rozmiaru pola przy jednym kroku przybliżania
+min_cell_size = 20
+max_cell_size = 64
+zoom_step = 1.25
+
+
+def create_field_arrays(n, m, mines, rng=None, excluded=None):
+    """
+    Funkcja losująca rozmieszczenie min na planszy. Zamiast macierzy obiektów zwraca zwartą macierz logiczną numpy,
+    w której prawda oznacza pole z miną - pozwala to wykonywać operacje na całej planszy jedną operacją na masce.
+    Położenia min losowane są jednym losowaniem bez zwracania spośród płaskich indeksów pól, więc każde rozłożenie
+    min jest równie prawdopodobne, a czas losowania nie zależy od gęstości min.
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param rng: generator liczb pseudolosowych albo ziarno, domyślnie losowe
+    :param excluded: macierz logiczna pól, na których nie może być min; miny rozkładane są równomiernie na pozostałych
+    :return: macierz min o wymiarach m na n
     """
-    Funkcja tworząca plansze pod postacią macierzy pól zarówno z jak i bez min. Funkcja korzysta z biblioteki numpy
-    celem optymalizacji czasu pracy oraz potrzeby wykorzystania bardziej zaawansowanych wariantów generatora range()
-    i funkcji generujących liczby pseudolosowe.
+    rng = np.random.default_rng(rng)
+    mines_array = np.zeros(m * n, dtype=bool)
+    if excluded is None:
+        mines_array[rng.choice(m * n, size=mines, replace=False)] = True
+    else:
+        mines_array[rng.choice(np.flatnonzero(~excluded), size=mines, replace=False)] = True
+    return mines_array.reshape(m, n)
+
+
+def first_click_exclusion(n, m, mines, i, j, area=True):
+    """
+    Funkcja wyznaczająca pola wolne od min przy pierwszym kliknięciu: samo kliknięte pole, a na życzenie także jego
+    sąsiedztwo. Wykluczane jest tylko tyle, ile pozwala liczba min.
     :param n: pierwszy rozmiar planszy
     :param m: drugi rozmiar planszy
     :param mines: liczba min na planszy
+    :param i: pierwszy indeks klikniętego pola
+    :param j: drugi indeks klikniętego pola
+    :param area: czy wykluczyć także sąsiedztwo pola
+    :return: macierz logiczna wykluczonych pól
+    """
+    excluded = np.zeros((m, n), dtype=bool)
+    if area:
+        excluded[max(i - 1, 0):i + 2, max(j - 1, 0):j + 2] = True
+        if n * m - np.count_nonzero(excluded) >= mines:
+            return excluded
+        excluded[:] = False
+    if n * m - 1 >= mines:
+        excluded[i, j] = True
+    return excluded
+
+
+def create_field_views(board, color=white):
+    """
+    Funkcja tworząca macierz pól będących widokami na stan planszy. Pola nie przechowują własnego stanu, służą
+    jedynie do rysowania oraz przekazywania kliknięć do planszy. Moduł interface (a z nim pygame) importowany jest
+    dopiero tutaj, więc sama logika gry działa bez pygame.
+    :param board: plansza, na którą pola mają być widokami
     :param color: kolor pól
     :return: macierz pól
     """
-    starting_points = (5, 160)
-    size_board = (385, 385)
-    size_field = (size_board[0] / n, size_board[1] / m)
-
-    # Utworzenie macierzy z samymi polami bez min
-    mines_array = np.array([[interface.Field(x, y, size_field[0], size_field[1], color)
-                             for x in np.arange(starting_points[0], starting_points[0] + size_board[0], size_field[0])]
-                            for y in np.arange(starting_points[1], starting_points[1] + size_board[1], size_field[1])])
-
-    # Pętla losująca położenia zadanej liczby min
-    i = mines
-    while i > 0:
-        a = np.random.randint(0, m)
-        b = np.random.randint(0, n)
-        if not isinstance(mines_array[a][b], interface.FieldWithMine):
-            i -= 1
-            mines_array[a][b] = interface.FieldWithMine(mines_array[a][b].x, mines_array[a][b].y,
-                                                        mines_array[a][b].w, mines_array[a][b].h, color)
-    return mines_array
+    import interface
+
+    n, m = board.get_size()
+    viewport = Viewport(n, m)
+
+    fields = np.empty((m, n), dtype=object)
+    for i in range(m):
+        for j in range(n):
+            field_class = interface.FieldWithMine if board.is_mine(i, j) else interface.Field
+            fields[i][j] = field_class(board, i, j, *viewport.cell_rect(i, j), color)
+    return fields
+
+
+def field_index(position, start, size, count):
+    """
+    Funkcja przeliczająca współrzędną piksela na indeks pola wzdłuż jednej osi planszy. Uwzględnia obcinanie
+    współrzędnych pól do liczb całkowitych przez pg.Rect, więc wynik zgadza się z rect.collidepoint pola.
+    :param position: współrzędna piksela
+    :param start: współrzędna początku planszy
+    :param size: rozmiar pola
+    :param count: liczba pól wzdłuż osi
+    :return: indeks pola albo None, jeśli piksel nie należy do żadnego pola
+    """
+    index = int((position - start) // size)
+    if index + 1 < count and position >= int(start + (index + 1) * size):
+        index += 1
+    if 0 <= index < count and position < int(start + index * size) + int(size):
+        return index
+    return None
+
+
+class Viewport:
+    """
+    Klasa opisująca widoczny fragment planszy na ekranie. Plansza, której pola mieszczą się w obszarze planszy
+    z rozmiarem co najmniej min_cell_size, jest rozciągana na cały obszar jak dotychczas. Większa plansza rysowana
+    jest polami o stałym rozmiarze, a obszar planszy pokazuje jedynie jej fragment, który można przesuwać
+    i przybliżać. Rozmieszczenie, trafianie kliknięciem i rysowanie dotyczy wyłącznie widocznych pól, więc ich koszt
+    nie zależy od rozmiaru planszy.
+    """
+
+    def __init__(self, n, m, x=starting_points[0], y=starting_points[1], w=size_board[0], h=size_board[1]):
+        """
+        Konstruktor widoku.
+        :param n: pierwszy rozmiar planszy
+        :param m: drugi rozmiar planszy
+        :param x: położenie x obszaru planszy na ekranie
+        :param y: położenie y obszaru planszy na ekranie
+        :param w: szerokość obszaru planszy
+        :param h: wysokość obszaru planszy
+        """
+        self.__n = n
+        self.__m = m
+        self.__rect = (x, y, w, h)
+        fit = (w / n, h / m)
+        self.__scrollable = min(fit) < min_cell_size
+        self.__cell = (min_cell_size, min_cell_size) if self.__scrollable else fit
+        self.__offset = (0, 0)
+
+    def is_scrollable(self):
+        return self.__scrollable
+
+    def get_rect(self):
+        return self.__rect
+
+    def get_cell_size(self):
+        return self.__cell
+
+    def get_offset(self):
+        return self.__offset
+
+    def scroll(self, dx, dy):
+        """
+        Metoda przesuwająca widoczny fragment planszy w granicach planszy.
+        :param dx: przesunięcie w poziomie w pikselach
+        :param dy: przesunięcie w pionie w pikselach
+        :return: czy widoczny fragment się zmienił
+        """
+        if not self.__scrollable:
+            return False
+        _, _, w, h = self.__rect
+        cell_w, cell_h = self.__cell
+        offset = (int(min(max(self.__offset[0] + dx, 0), max(self.__n * cell_w - w, 0))),
+                  int(min(max(self.__offset[1] + dy, 0), max(self.__m * cell_h - h, 0))))
+        changed = offset != self.__offset
+        self.__offset = offset
+        return changed
+
+    def zoom(self, steps, anchor=None):
+        """
+        Metoda zmieniająca rozmiar pól o zadaną liczbę kroków tak, żeby punkt planszy pod wskazanym punktem ekranu
+        pozostał na swoim miejscu.
+        :param steps: liczba kroków, dodatnia przybliża, ujemna oddala
+        :param anchor: punkt ekranu (x, y), domyślnie środek obszaru planszy
+        :return: czy widoczny fragment się zmienił
+        """
+        if not self.__scrollable:
+            return False
+        x, y, w, h = self.__rect
+        anchor_x, anchor_y = anchor if anchor is not None else (x + w / 2, y + h / 2)
+        size = int(min(max(round(self.__cell[0] * zoom_step ** steps), min_cell_size), max_cell_size))
+        if size == self.__cell[0]:
+            return False
+        scale = size / self.__cell[0]
+        self.__cell = (size, size)
+        self.__offset = (round((self.__offset[0] + anchor_x - x) * scale - (anchor_x - x)),
+                         round((self.__offset[1] + anchor_y - y) * scale - (anchor_y - y)))
+        self.scroll(0, 0)
+        return True
+
+    def visible_range(self):
+        """
+        :return: (pierwszy wiersz, wiersz za ostatnim, pierwsza kolumna, kolumna za ostatnią) widocznych pól
+        """
+        _, _, w, h = self.__rect
+        cell_w, cell_h = self.__cell
+        offset_x, offset_y = self.__offset
+        return (int(offset_y // cell_h), min(int(-(-(offset_y + h) // cell_h)), self.__m),
+                int(offset_x // cell_w), min(int(-(-(offset_x + w) // cell_w)), self.__n))
+
+    def cell_rect(self, i, j):
+        """
+        :return: (x, y, szerokość, wysokość) pola na ekranie przed obcięciem do liczb całkowitych
+        """
+        x, y, _, _ = self.__rect
+        cell_w, cell_h = self.__cell
+        return x + j * cell_w - self.__offset[0], y + i * cell_h - self.__offset[1], cell_w, cell_h
+
+    def hit_test(self, position):
+        """
+        Metoda wyznaczająca widoczne pole leżące pod wskazanym punktem ekranu.
+        :param position: pozycja (x, y) na ekranie
+        :return: (i, j) indeksy pola albo None, jeśli punkt nie leży na żadnym widocznym polu
+        """
+        x, y, w, h = self.__rect
+        if self.__scrollable and not (x <= position[0] < x + w and y <= position[1] < y + h):
+            return None
+        i = field_index(position[1] + self.__offset[1], y, self.__cell[1], self.__m)
+        j = field_index(position[0] + self.__offset[0], x, self.__cell[0], self.__n)
+        if i is None or j is None:
+            return None
+        return i, j
 
 
 def border_values(n, m, mines_array):
     """
-    Funkcja wyliczająca dla każdego pola na planszy liczbę min jaka je otacza.
+    Funkcja wyliczająca dla każdego pola na planszy liczbę min jaka je otacza. Zamiast zliczać sąsiadów każdego pola
+    osobno, sumuje dziewięć przesuniętych kopii obramowanej zerami macierzy min - całość to kilka operacji
+    wektorowych niezależnie od rozmiaru planszy. Pole z miną wlicza również samo siebie.
     :param n: pierwszy rozmiar planszy
     :param m: drugi rozmiar planszy
-    :param mines_array: macierz pól
+    :param mines_array: macierz min
     :return: macierz liczby min w każdym polu
     """
-    return np.array([[count_mines_nearby(n, m, mines_array, i, j) for j, field in enumerate(row)]
-                     for i, row in enumerate(mines_array)])
+    padded = np.zeros((m + 2, n + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = mines_array
+    values = np.zeros((m, n), dtype=np.uint8)
+    for q in range(3):
+        for p in range(3):
+            values += padded[q:q + m, p:p + n]
+    return values
+
+
+# Liczba pól, do której obszary odkrywane są zwykłym przeszukiwaniem wszerz zamiast podziałem całej planszy
+small_board = 256
 
 
-def count_mines_nearby(n, m, mines_array, i, j):
+def flood_fill(zero_array, i, j):
     """
-    Funkcja tworząca macierz prawdy dookoła danego pola i zliczająca liczbę wystąpień tej prawdy.
-    :param n: pierwszy rozmiar planszy
-    :param m: drugi rozmiar planszy
-    :param mines_array: macierz pól
-    :param i: pierwszy indeks pola
-    :param j: drugi indeks pola
-    :return:
+    Funkcja wyznaczająca iteracyjnie (przeszukiwaniem wszerz) spójny obszar pól bez min w sąsiedztwie, do którego
+    należy wskazane pole, wraz z jego obramowaniem. Koszt zależy jedynie od wielkości obszaru, więc funkcja
+    przeznaczona jest dla małych plansz, dla których podział całej planszy na obszary byłby droższy.
+    :param zero_array: macierz logiczna pól bez min w sąsiedztwie
+    :param i: pierwszy indeks pola startowego
+    :param j: drugi indeks pola startowego
+    :return: macierz logiczna obszaru wraz z obramowaniem
+    """
+    m, n = zero_array.shape
+    zeros = zero_array.tolist()
+    area = [[False] * n for _ in range(m)]
+    area[i][j] = True
+    queue = [(i, j)]
+    for y, x in queue:
+        if zeros[y][x]:
+            for q in range(max(y - 1, 0), min(y + 2, m)):
+                for p in range(max(x - 1, 0), min(x + 2, n)):
+                    if not area[q][p]:
+                        area[q][p] = True
+                        queue.append((q, p))
+    return np.array(area)
+
+
+def zero_regions(zero_array):
+    """
+    Funkcja dzieląca pola bez min w sąsiedztwie na spójne (ośmiokierunkowo) obszary. Obszary wyznaczane są
+    iteracyjnie i wektorowo: wiersze dzielone są na poziome odcinki, odcinki stykające się w sąsiednich wierszach są
+    łączone, a etykiety scalane aż do ustalenia się. Brak rekurencji i operacji na pojedynczych polach sprawia, że
+    plansza o milionie pól dzielona jest w ułamku sekundy.
+    :param zero_array: macierz logiczna pól bez min w sąsiedztwie
+    :return: (macierz etykiet obszarów z zerem dla pozostałych pól, tablica granic [góra, dół, lewo, prawo] obszarów)
+    """
+    m, n = zero_array.shape
+
+    # Numeracja poziomych odcinków - nowy odcinek zaczyna się tam, gdzie poprzednie pole w wierszu nie jest zerowe
+    starts = zero_array.copy()
+    starts[:, 1:] &= ~zero_array[:, :-1]
+    ends = zero_array.copy()
+    ends[:, :-1] &= ~zero_array[:, 1:]
+    runs = np.cumsum(starts.ravel()).reshape(m, n) * zero_array
+
+    # Pary odcinków stykających się w sąsiednich wierszach (również po przekątnej). Każda para styka się przy
+    # początku jednego z odcinków, więc wystarczy sprawdzać sąsiedztwo początków.
+    upper, lower = [], []
+    for offset in (-1, 0, 1):
+        columns_a = slice(max(-offset, 0), n - max(offset, 0))
+        columns_b = slice(max(offset, 0), n - max(-offset, 0))
+        a, b = runs[:-1, columns_a], runs[1:, columns_b]
+        touching = (a > 0) & (b > 0) & (starts[:-1, columns_a] | starts[1:, columns_b])
+        upper.append(a[touching])
+        lower.append(b[touching])
+    upper, lower = np.concatenate(upper), np.concatenate(lower)
+
+    # Scalanie etykiet: korzeń o większym numerze podpinany jest pod mniejszy, a ścieżki są skracane
+    labels = np.arange(runs.max() + 1)
+    while True:
+        la, lb = labels[upper], labels[lower]
+        differ = la != lb
+        if not differ.any():
+            break
+        np.minimum.at(labels, np.maximum(la, lb)[differ], np.minimum(la, lb)[differ])
+        while True:
+            compressed = labels[labels]
+            if np.array_equal(compressed, labels):
+                break
+            labels = compressed
+
+    _, labels = np.unique(labels, return_inverse=True)
+    regions = labels[runs]
+
+    # Granice każdego obszaru, żeby późniejsze odkrywanie dotyczyło tylko prostokąta obejmującego obszar
+    rows, first_columns = np.nonzero(starts)
+    _, last_columns = np.nonzero(ends)
+    ids = labels[1:]
+    bounds = np.zeros((labels.max() + 1, 4), dtype=np.int64)
+    bounds[:, 0] = m
+    bounds[:, 2] = n
+    np.minimum.at(bounds[:, 0], ids, rows)
+    np.maximum.at(bounds[:, 1], ids, rows)
+    np.minimum.at(bounds[:, 2], ids, first_columns)
+    np.maximum.at(bounds[:, 3], ids, last_columns)
+    return regions, bounds
+
+
+def dilate(array):
     """
-    return np.sum(np.array([[1 if isinstance(mines_array[q][p], interface.FieldWithMine) else 0
-                             for p in range(j - 1 if j > 0 else 0, j + 2 if j + 2 <= n else j + 1)]
-                            for q in range(i - 1 if i > 0 else 0, i + 2 if i + 2 <= m else i + 1)]))
+    Funkcja rozszerzająca maskę logiczną o wszystkich ośmiu sąsiadów każdego zaznaczonego pola.
+    :param array: macierz logiczna
+    :return: rozszerzona macierz logiczna
+    """
+    m, n = array.shape
+    padded = np.zeros((m + 2, n + 2), dtype=bool)
+    padded[1:-1, 1:-1] = array
+    result = np.zeros((m, n), dtype=bool)
+    for q in range(3):
+        for p in range(3):
+            result |= padded[q:q + m, p:p + n]
+    return result
+
+
+def read_only(array):
+    """
+    Funkcja zwracająca widok macierzy, którego nie można modyfikować.
+    :param array: macierz
+    :return: widok tylko do odczytu
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class Board:
+    """
+    Klasa przechowująca stan planszy w zwartych tablicach numpy: położenie min, odkryte pola, flagi oraz liczby min
+    w sąsiedztwie. Operacje na całej planszy sprowadzają się do pojedynczych operacji na maskach.
+    """
+
+    def __init__(self, n, m, mines_array=None):
+        """
+        Konstruktor planszy.
+        :param n: pierwszy rozmiar planszy
+        :param m: drugi rozmiar planszy
+        :param mines_array: macierz logiczna min o wymiarach m na n; bez niej plansza nie ma min, dopóki nie zostaną
+        rozmieszczone metodą place_mines
+        """
+        self.__n = n
+        self.__m = m
+        self.__placed = mines_array is not None
+        self.__mines = mines_array if self.__placed else np.zeros((m, n), dtype=bool)
+        self.__revealed = np.zeros((m, n), dtype=bool)
+        self.__flags = np.zeros((m, n), dtype=np.uint8)
+        self.__border_values = border_values(n, m, mines_array) if self.__placed else np.zeros((m, n), dtype=np.uint8)
+        self.__zero_array = self.__border_values == 0
+        self.__regions = None
+        self.__mines_color = None
+
+        # Liczniki aktualizowane przy każdej zmianie stanu, żeby sprawdzanie wygranej, przegranej i liczby flag
+        # nie wymagało przeglądania całej planszy
+        self.__revealed_safe = 0
+        self.__exploded = False
+        self.__correct_flags = 0
+        self.__wrong_flags = 0
+        self.__question_flags = 0
+
+        # Pola zmienione od ostatniego odczytu zmian - na ich podstawie interfejs rysuje tylko to, co potrzebne
+        self.__changes = []
+
+    def __reveal_area(self, top, bottom, left, right, area):
+        """
+        Metoda odkrywająca pola zaznaczone w masce ograniczonej do prostokąta planszy i aktualizująca liczniki.
+        :param top: pierwszy wiersz prostokąta
+        :param bottom: wiersz za ostatnim wierszem prostokąta
+        :param left: pierwsza kolumna prostokąta
+        :param right: kolumna za ostatnią kolumną prostokąta
+        :param area: maska pól do odkrycia o rozmiarach prostokąta
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        revealed = self.__revealed[top:bottom, left:right]
+        mines = self.__mines[top:bottom, left:right]
+        flags = self.__flags[top:bottom, left:right]
+        area &= ~revealed
+        revealed |= area
+
+        new_mines = np.count_nonzero(area & mines)
+        self.__revealed_safe += int(np.count_nonzero(area)) - int(new_mines)
+        self.__exploded = self.__exploded or new_mines > 0
+
+        # Odkrycie pola usuwa z niego flagę
+        cleared = flags[area]
+        if cleared.any():
+            marked = cleared == 1
+            marked_mines = int(np.count_nonzero(marked & mines[area]))
+            self.__correct_flags -= marked_mines
+            self.__wrong_flags -= int(np.count_nonzero(marked)) - marked_mines
+            self.__question_flags -= int(np.count_nonzero(cleared == 2))
+            flags[area] = 0
+
+        rows, columns = np.nonzero(area)
+        rows += top
+        columns += left
+        if len(rows):
+            self.__changes.append((rows, columns))
+        return rows, columns
+
+    def __reveal_field(self, i, j):
+        """
+        Metoda odkrywająca pojedyncze pole i aktualizująca liczniki bez tworzenia masek.
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if self.__revealed[i, j]:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        self.__revealed[i, j] = True
+        if self.__mines[i, j]:
+            self.__exploded = True
+        else:
+            self.__revealed_safe += 1
+        if self.__flags[i, j]:
+            self.__change_flag(i, j, 0)
+        changed = np.array([i]), np.array([j])
+        self.__changes.append(changed)
+        return changed
+
+    def __change_flag(self, i, j, value):
+        """
+        Metoda ustawiająca flagę pola i aktualizująca liczniki flag.
+        """
+        for flag, step in ((self.__flags[i, j], -1), (value, 1)):
+            if flag == 1 and self.__mines[i, j]:
+                self.__correct_flags += step
+            elif flag == 1:
+                self.__wrong_flags += step
+            elif flag == 2:
+                self.__question_flags += step
+        self.__flags[i, j] = value
+        self.__changes.append((np.array([i]), np.array([j])))
+
+    def activate(self, i, j):
+        """
+        Metoda odkrywająca pole pod warunkiem, że nie zostało jeszcze odkryte. Odkrycie pola usuwa z niego flagę.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: true - pole nie graniczy z żadną miną; false - pole graniczy z miną; None - pole już odkryte
+        """
+        if not self.__revealed[i, j]:
+            self.__reveal_field(i, j)
+            return bool(self.__border_values[i, j] == 0)
+
+    def reveal(self, i, j):
+        """
+        Metoda odkrywająca pole tak, jakby zostało kliknięte. Jeśli pole nie graniczy z żadną miną odkrywany jest cały
+        obszar wyznaczony przez pola sąsiadujące z minami lub krawędzie planszy.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if self.__zero_array[i, j] and not self.__revealed[i, j]:
+            return self.reveal_area(i, j)
+        return self.__reveal_field(i, j)
+
+    def reveal_area(self, i, j):
+        """
+        Metoda odkrywająca sąsiedztwo pola, a dalej cały spójny obszar pól bez min w sąsiedztwie wraz z jego
+        obramowaniem. Na dużych planszach podział planszy na obszary liczony jest raz, przy pierwszym odkrywaniu,
+        a zmiany wykonywane są jedynie na prostokącie obejmującym odkrywany obszar.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if self.__zero_array[i, j] and self.__n * self.__m <= small_board:
+            top, bottom, left, right = 0, self.__m, 0, self.__n
+            area = flood_fill(self.__zero_array, i, j)
+        elif self.__zero_array[i, j]:
+            if self.__regions is None:
+                self.__regions = zero_regions(self.__zero_array)
+            regions, bounds = self.__regions
+            label = regions[i, j]
+            top, bottom, left, right = bounds[label]
+            top, left = max(top - 1, 0), max(left - 1, 0)
+            bottom, right = min(bottom + 2, self.__m), min(right + 2, self.__n)
+            area = dilate(regions[top:bottom, left:right] == label)
+        else:
+            top, left = max(i - 1, 0), max(j - 1, 0)
+            bottom, right = min(i + 2, self.__m), min(j + 2, self.__n)
+            area = np.ones((bottom - top, right - left), dtype=bool)
+        return self.__reveal_area(top, bottom, left, right, area)
+
+    def reveal_many(self, rows, columns):
+        """
+        Metoda odkrywająca naraz wiele pól tak, jakby każde z nich zostało kliknięte. Maska wskazanych pól budowana jest
+        jedynie na prostokącie, który je obejmuje. Obszary pól bez min w sąsiedztwie wyznaczane są razem, tak jak przy
+        odkrywaniu pojedynczego pola: na małych planszach przeszukiwaniem wszerz, na dużych z podziału planszy na
+        obszary, a całość odkrywana jest jedną operacją na masce prostokąta obejmującego wskazane pola i ich obszary.
+        :param rows: wiersze pól
+        :param columns: kolumny pól
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if not len(rows):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        top, bottom = int(rows.min()), int(rows.max()) + 1
+        left, right = int(columns.min()), int(columns.max()) + 1
+        requested = np.zeros((bottom - top, right - left), dtype=bool)
+        requested[rows - top, columns - left] = True
+        seeds = np.argwhere(requested & self.__zero_array[top:bottom, left:right] &
+                            ~self.__revealed[top:bottom, left:right]) + (top, left)
+        if not len(seeds):
+            return self.__reveal_area(top, bottom, left, right, requested)
+
+        if self.__n * self.__m <= small_board:
+            area = np.zeros((self.__m, self.__n), dtype=bool)
+            for i, j in seeds:
+                if not area[i, j]:
+                    area |= flood_fill(self.__zero_array, i, j)
+            area[top:bottom, left:right] |= requested
+            return self.__reveal_area(0, self.__m, 0, self.__n, area)
+
+        if self.__regions is None:
+            self.__regions = zero_regions(self.__zero_array)
+        regions, bounds = self.__regions
+        labels = np.unique(regions[seeds[:, 0], seeds[:, 1]])
+        outer_top = min(top, max(int(bounds[labels, 0].min()) - 1, 0))
+        outer_bottom = max(bottom, min(int(bounds[labels, 1].max()) + 2, self.__m))
+        outer_left = min(left, max(int(bounds[labels, 2].min()) - 1, 0))
+        outer_right = max(right, min(int(bounds[labels, 3].max()) + 2, self.__n))
+        area = dilate(np.isin(regions[outer_top:outer_bottom, outer_left:outer_right], labels))
+        area[top - outer_top:bottom - outer_top, left - outer_left:right - outer_left] |= requested
+        return self.__reveal_area(outer_top, outer_bottom, outer_left, outer_right, area)
+
+    def chord_cells(self, i, j):
+        """
+        Metoda wyznaczająca pola odkrywane przy kliknięciu obydwoma przyciskami na odkrytą liczbę: jeśli w sąsiedztwie
+        pola stoi dokładnie tyle flag "Tu jest mina", ile min je otacza, są to wszystkie nieodkryte sąsiednie pola bez
+        tej flagi.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: (wiersze, kolumny) pól do odkrycia, puste, jeśli liczba flag się nie zgadza
+        """
+        top, left = max(i - 1, 0), max(j - 1, 0)
+        bottom, right = min(i + 2, self.__m), min(j + 2, self.__n)
+        marked = self.__flags[top:bottom, left:right] == 1
+        if not self.__revealed[i, j] or self.__mines[i, j] or \
+                np.count_nonzero(marked) != self.__border_values[i, j]:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        rows, columns = np.nonzero(~self.__revealed[top:bottom, left:right] & ~marked)
+        return rows + top, columns + left
+
+    def reveal_mine(self, i, j):
+        """
+        Metoda oznaczająca pole jako kliknięte bez sprawdzania jego sąsiedztwa.
+        """
+        self.__reveal_field(i, j)
+
+    def cycle_flag(self, i, j):
+        """
+        Metoda zmieniająca stan flagi pola ze trzech możliwych: brak flagi, "Tu jest mina" i "Tu może być mina".
+        Odkrytych pól nie można oznaczać.
+        """
+        if not self.__revealed[i, j]:
+            self.__change_flag(i, j, (self.__flags[i, j] + 1) % 3)
+
+    def set_flag(self, i, j, value):
+        self.__change_flag(i, j, value % 3)
+
+    def reset_mines_flag(self):
+        """
+        Metoda resetująca flagi dla pól z minami.
+        """
+        self.__question_flags -= int(np.count_nonzero(self.__flags[self.__mines] == 2))
+        self.__correct_flags = 0
+        self.__flags[self.__mines] = 0
+        self.__changes.append(np.nonzero(self.__mines))
+
+    def place_mines(self, mines_array):
+        """
+        Metoda rozmieszczająca miny na planszy utworzonej bez nich, np. dopiero przy pierwszym kliknięciu. Liczby min
+        w sąsiedztwie wyliczane są w tym momencie, a liczniki flag postawionych wcześniej - od nowa.
+        :param mines_array: macierz logiczna min o wymiarach m na n
+        """
+        self.__mines[...] = mines_array
+        self.__border_values[...] = border_values(self.__n, self.__m, self.__mines)
+        self.__zero_array = self.__border_values == 0
+        self.__regions = None
+        self.__placed = True
+        self.__count_state()
+        self.__changes.append(np.nonzero(self.__mines))
+
+    def is_placed(self):
+        return self.__placed
+
+    def load_state(self, revealed, flags):
+        """
+        Metoda zastępująca stan gracza (np. wczytany z zapisu) i wyliczająca liczniki od nowa. Flagi odkrytych pól są
+        usuwane, a wszystkie pola oznaczane jako zmienione.
+        :param revealed: macierz logiczna odkrytych pól
+        :param flags: macierz flag (0 - brak, 1 - "Tu jest mina", 2 - "Tu może być mina")
+        """
+        self.__revealed[...] = revealed
+        self.__flags[...] = flags
+        self.__flags[self.__revealed] = 0
+        self.__count_state()
+        self.__changes = [np.nonzero(np.ones((self.__m, self.__n), dtype=bool))]
+
+    def __count_state(self):
+        """
+        Metoda wyliczająca od nowa liczniki odkrytych pól i flag na podstawie całej planszy.
+        """
+        self.__revealed_safe = int(np.count_nonzero(self.__revealed & ~self.__mines))
+        self.__exploded = bool((self.__revealed & self.__mines).any())
+        marked = self.__flags == 1
+        self.__correct_flags = int(np.count_nonzero(marked & self.__mines))
+        self.__wrong_flags = int(np.count_nonzero(marked)) - self.__correct_flags
+        self.__question_flags = int(np.count_nonzero(self.__flags == 2))
+
+    def pop_changes(self):
+        """
+        Metoda zwracająca pola zmienione od poprzedniego wywołania i czyszcząca listę zmian.
+        :return: (wiersze, kolumny) zmienionych pól, pola mogą się powtarzać
+        """
+        if not self.__changes:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        rows = np.concatenate([change[0] for change in self.__changes])
+        columns = np.concatenate([change[1] for change in self.__changes])
+        self.__changes = []
+        return rows, columns
+
+    def get_flags_count(self):
+        """
+        Metoda zwracająca ilość postawionych flag "Tu jest mina" oraz "Tu może być mina".
+        :return: (liczba flag "Tu jest mina", liczba flag "Tu może być mina")
+        """
+        return self.__correct_flags + self.__wrong_flags, self.__question_flags
+
+    def is_mine_revealed(self):
+        return self.__exploded
+
+    def count_revealed_safe(self):
+        return self.__revealed_safe
+
+    def count_correct_flags(self):
+        return self.__correct_flags
+
+    def count_wrong_flags(self):
+        return self.__wrong_flags
+
+    def get_size(self):
+        return self.__n, self.__m
+
+    def is_mine(self, i, j):
+        return bool(self.__mines[i, j])
+
+    def is_revealed(self, i, j):
+        return bool(self.__revealed[i, j])
+
+    def get_flag(self, i, j):
+        return int(self.__flags[i, j])
+
+    def get_border_value(self, i, j):
+        return int(self.__border_values[i, j])
+
+    def get_mines_array(self):
+        return read_only(self.__mines)
+
+    def get_revealed_array(self):
+        return read_only(self.__revealed)
+
+    def get_flags_array(self):
+        return read_only(self.__flags)
+
+    def get_border_values(self):
+        return read_only(self.__border_values)
+
+    def get_mines_color(self):
+        return self.__mines_color
+
+    def set_mines_color(self, color):
+        self.__mines_color = color
+        self.__changes.append(np.nonzero(self.__mines))
 
 
 class IncorrectBoardSize(Exception):
@@ -84,22 +723,44 @@ class IncorrectMinesValue(Exception):
 
 class Game:
     """
-    Klasa definiująca logiczną część gry.
+    Klasa definiująca logiczną część gry. Rozgrywka odbywa się przez metody reveal i toggle_flag, które nie wymagają
+    pygame - interfejs graficzny jest jedynie jednym ze sposobów ich wywoływania.
     """
 
-    def __init__(self, n, m, mines, screen=None, color=white):
+    def __init__(self, n, m, mines, screen=None, color=white, rng=None, large=False, mines_array=None,
+                 placement="random"):
+        """
+        Konstruktor gry.
+        :param n: pierwszy rozmiar planszy
+        :param m: drugi rozmiar planszy
+        :param mines: liczba min na planszy
+        :param screen: ekran, na którym rysowana jest plansza
+        :param color: kolor pól
+        :param rng: generator liczb pseudolosowych albo ziarno używane do rozmieszczenia min
+        :param large: tryb dużych plansz - rozmiar do large_size na large_size zamiast 15 na 15
+        :param mines_array: gotowe rozmieszczenie min o wymiarach m na n zamiast losowania; liczba min musi się zgadzać
+        :param placement: sposób rozmieszczenia min (placements); poza "random" miny losowane są dopiero przy pierwszym
+        odkryciu pola, więc utworzenie gry nie wymaga ani losowania, ani liczenia min w sąsiedztwie
+        """
+        if placement not in placements:
+            raise ValueError("nieznany sposób rozmieszczenia min: {!r}".format(placement))
         self.__screen = screen
         self.__color = color
         self.__game_over = False
         self.__cheat = False
         self.__message = None
+        self.__recorder = None
 
         # Część decydująca o poprawności nadchodzących danych.
         try:
-            if size_condition(n, m):
+            if (large_size_condition if large else size_condition)(n, m):
+                raise IncorrectBoardSize
+            elif mines_array is not None and np.shape(mines_array) != (m, n):
                 raise IncorrectBoardSize
             elif mines_condition(mines, n, m):
                 raise IncorrectMinesValue
+            elif mines_array is not None and np.count_nonzero(mines_array) != mines:
+                raise IncorrectMinesValue
         except IncorrectBoardSize:
             # Niepoprawny rozmiar planszy. Ustawia odpowiednią wiadomość do wysłania do interfejsu.
             self.__message = 0
@@ -110,82 +771,266 @@ class Game:
             self.__n = n
             self.__m = m
             self.__mines = mines
-            self.__fields = create_field_arrays(self.__n, self.__m, self.__mines, self.__color)
-            self.__border_values = border_values(self.__n, self.__m, self.__fields)
+            if mines_array is None and placement == "random":
+                mines_array = create_field_arrays(self.__n, self.__m, self.__mines, rng)
+            self.__rng = rng
+            self.__placement = "random" if mines_array is not None else placement
+            self.__board = Board(self.__n, self.__m, None if mines_array is None else np.array(mines_array, dtype=bool))
+            self.__fields = None
+            self.__surface = None
+            self.__viewport = Viewport(n, m)
+            self.__viewport_changed = False
+
+    def get_fields(self):
+        """
+        Metoda zwracająca macierz pól-widoków na planszę. Pola tworzone są dopiero przy pierwszym zapytaniu, więc gra
+        bez interfejsu nie alokuje żadnych obiektów pól. Rysowanie z nich nie korzysta, a na dużych planszach ich
+        położenie odpowiada nieprzesuniętemu widokowi.
+        :return: macierz pól
+        """
+        if self.__fields is None:
+            self.__fields = create_field_views(self.__board, self.__color)
+        return self.__fields
+
+    def get_surface(self):
+        """
+        Metoda zwracająca pozaekranową powierzchnię planszy, tworzoną przy pierwszym rysowaniu.
+        :return: powierzchnia planszy
+        """
+        if self.__surface is None:
+            import interface
+            self.__surface = interface.BoardSurface(*self.__viewport.get_rect())
+        return self.__surface
 
     def display(self):
         """
-        Metoda wywołująca dla każdego pola z macierzy pól metodę draw.
+        Metoda rysująca wszystkie widoczne pola na powierzchni planszy i kopiująca ją na ekran.
+        """
+        self.__board.pop_changes()
+        self.__viewport_changed = False
+        top, bottom, left, right = self.__viewport.visible_range()
+        rows, columns = np.mgrid[top:bottom, left:right]
+        surface = self.get_surface()
+        surface.clear()
+        surface.draw_cells(self.__board, rows.ravel(), columns.ravel(), self.__viewport, self.__color)
+        surface.blit(self.__screen)
+
+    def display_changes(self):
+        """
+        Metoda rysująca jedynie widoczne pola zmienione od poprzedniego rysowania, a po przesunięciu lub przybliżeniu
+        widoku - wszystkie widoczne pola.
+        :return: lista prostokątów ekranu, które należy odświeżyć
         """
-        for i, row in enumerate(self.__fields):
-            for j, field in enumerate(row):
-                field.set_border_mines(self.__border_values[i][j])
-                field.draw(self.__screen, 0, True)
+        if self.__viewport_changed:
+            self.display()
+            return [self.get_surface().get_rect()]
+        rows, columns = self.__board.pop_changes()
+        top, bottom, left, right = self.__viewport.visible_range()
+        visible = (rows >= top) & (rows < bottom) & (columns >= left) & (columns < right)
+        cells = set(zip(rows[visible].tolist(), columns[visible].tolist()))
+        if not cells:
+            return []
+        rows, columns = zip(*cells)
+        rects = self.get_surface().draw_cells(self.__board, rows, columns, self.__viewport, self.__color)
+        self.get_surface().blit(self.__screen)
+        return rects
 
     def reveal_nearby(self, i, j):
         """
-        Metoda rekurencyjnie odkrywająca sąsiednie pola jeśli są spełnione do tego warunki.
+        Metoda odkrywająca sąsiednie pola, a dalej cały obszar pól bez min w sąsiedztwie. Odkrywanie odbywa się
+        iteracyjnie, więc nie zależy od limitu rekurencji.
         :param i: pozycja x pola
         :param j: pozycja y pola
+        :return: (wiersze, kolumny) nowo odkrytych pól
         """
-        for q in range(i - 1 if i > 0 else 0, i + 2 if i + 2 <= self.__m else i + 1):
-            for p in range(j - 1 if j > 0 else 0, j + 2 if j + 2 <= self.__n else j + 1):
-                if self.__fields[q][p].activation():
-                    self.reveal_nearby(q, p)
+        return self.__board.reveal_area(i, j)
 
     def change_mines_color(self, color):
         """
         Metoda zmieniająca kolor min. Przydatna w momencie pokazania wygranej, przegranej, bądź wykorzystania kodu.
         :param color: na jaki kolor chcemy zmienić
         """
-        for i, row in enumerate(self.__fields):
-            for j, field in enumerate(row):
-                if isinstance(field, interface.FieldWithMine):
-                    field.set_color(color)
+        self.__board.set_mines_color(color)
 
     def reset_mines_flag(self):
         """
         Metoda resetująca flagi dla pól z minami.
         """
-        for i, row in enumerate(self.__fields):
-            for j, field in enumerate(row):
-                if isinstance(field, interface.FieldWithMine):
-                    field.set_right_clicks(0)
+        self.__board.reset_mines_flag()
 
-    def event_handler(self, event):
+    def hit_test(self, position):
         """
-        Event handler dla logiki iterujący po każdym polu w macierzy i przekazujący do każdego pola event.
-        :param event: przychodzące wydarzenie
+        Metoda wyznaczająca pole leżące pod wskazanym punktem na podstawie widoku planszy.
+        :param position: pozycja (x, y) na ekranie
+        :return: (i, j) indeksy pola albo None, jeśli punkt nie leży na żadnym widocznym polu
+        """
+        return self.__viewport.hit_test(position)
+
+    def scroll(self, dx, dy):
+        """
+        Metoda przesuwająca widok planszy.
+        :param dx: przesunięcie w poziomie w pikselach
+        :param dy: przesunięcie w pionie w pikselach
+        """
+        if self.__viewport.scroll(dx, dy):
+            self.__viewport_changed = True
+
+    def zoom(self, steps, anchor=None):
         """
+        Metoda przybliżająca (steps > 0) albo oddalająca (steps < 0) widok planszy wokół wskazanego punktu ekranu.
+        """
+        if self.__viewport.zoom(steps, anchor):
+            self.__viewport_changed = True
+
+    def __place_mines(self, i, j):
+        """
+        Metoda rozmieszczająca miny przy pierwszym odkryciu pola tak, żeby odkrywane pole (i zależnie od sposobu
+        rozmieszczenia jego sąsiedztwo) było wolne od min. Miny rozkładane są równomiernie na pozostałych polach,
+        a przy planszach bez zgadywania - przez moduł generator, o ile plansza nie jest dla niego za duża ani za gęsta.
+        Generator dostaje ograniczoną liczbę prób, więc gdy nie znajdzie planszy od razu, miny rozmieszczane są jak
+        przy "area", bez zatrzymywania gry na dłużej niż klatkę lub dwie.
+        :param i: pierwszy indeks odkrywanego pola
+        :param j: drugi indeks odkrywanego pola
+        """
+        rng = np.random.default_rng(self.__rng)
+        mines_array = None
+        if self.__placement == "no_guess":
+            import generator
+            cells = self.__n * self.__m
+            if cells <= generator.max_size and self.__mines <= generator.max_density * cells:
+                try:
+                    mines_array = generator.create_no_guess_arrays(self.__n, self.__m, self.__mines, (i, j), rng,
+                                                                   passes=generator.max_passes)
+                except generator.GenerationFailed:
+                    pass
+        if mines_array is None:
+            excluded = first_click_exclusion(self.__n, self.__m, self.__mines, i, j, self.__placement != "safe")
+            mines_array = create_field_arrays(self.__n, self.__m, self.__mines, rng, excluded)
+        self.__board.place_mines(mines_array)
+
+    def reveal(self, i, j):
+        """
+        Metoda odkrywająca pole tak, jak kliknięcie lewym przyciskiem myszy, wraz ze sprawdzeniem warunków końca gry.
+        Jeśli miny nie zostały jeszcze rozmieszczone, rozmieszczane są przed odkryciem pola.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if self.__recorder is not None:
+            self.__recorder.reveal(i, j)
+        if self.__game_over:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        if not self.__board.is_placed():
+            self.__place_mines(i, j)
+        changed = self.__board.reveal(i, j)
+        if self.__board.is_mine(i, j):
+            # W wypadku, gdy kliknięte pole jest miną gra się kończy.
+            self.check_lose_condition()
+        else:
+            self.check_win_condition()
+        return changed
+
+    def __reveal_many(self, rows, columns):
+        """
+        Metoda odkrywająca naraz wiele pól jedną operacją planszy, z jednym sprawdzeniem warunków końca gry.
+        :param rows: wiersze pól
+        :param columns: kolumny pól
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if self.__game_over or not len(rows):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        if not self.__board.is_placed():
+            self.__place_mines(rows[0], columns[0])
+        changed = self.__board.reveal_many(rows, columns)
+        if self.__board.is_mine_revealed():
+            self.check_lose_condition()
+        else:
+            self.check_win_condition()
+        return changed
+
+    def reveal_many(self, cells):
+        """
+        Metoda odkrywająca naraz wiele pól tak, jakby każde zostało kliknięte lewym przyciskiem myszy. W odróżnieniu od
+        kolejnych wywołań reveal obszary pól bez min w sąsiedztwie wyznaczane są razem, warunki końca gry sprawdzane są
+        raz, a zmienione pola trafiają do jednej listy zmian. Pola spoza planszy odrzucane są wyjątkiem IndexError,
+        zanim cokolwiek zostanie odkryte albo nagrane.
+        :param cells: (wiersze, kolumny) pól, np. wynik np.nonzero dla maski pól
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        rows, columns = (np.asarray(index, dtype=np.intp).ravel() for index in cells)
+        if ((rows < 0) | (rows >= self.__m) | (columns < 0) | (columns >= self.__n)).any():
+            raise IndexError("pola spoza planszy {}x{}".format(self.__n, self.__m))
+        if self.__recorder is not None:
+            self.__recorder.reveal_many(rows, columns)
+        return self.__reveal_many(rows, columns)
+
+    def chord(self, i, j):
+        """
+        Metoda odkrywająca sąsiedztwo odkrytej liczby tak, jak kliknięcie środkowym albo obydwoma przyciskami myszy:
+        jeśli wokół pola stoi tyle flag "Tu jest mina", ile min je otacza, odkrywane są naraz wszystkie pozostałe
+        nieodkryte sąsiednie pola. Źle postawiona flaga kończy się więc odkryciem miny.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: (wiersze, kolumny) nowo odkrytych pól
+        """
+        if self.__recorder is not None:
+            self.__recorder.chord(i, j)
+        if self.__game_over:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return self.__reveal_many(*self.__board.chord_cells(i, j))
+
+    def toggle_flag(self, i, j):
+        """
+        Metoda zmieniająca flagę pola tak, jak kliknięcie prawym przyciskiem myszy, wraz ze sprawdzeniem wygranej.
+        :param i: pierwszy indeks pola
+        :param j: drugi indeks pola
+        :return: stan flagi pola po zmianie
+        """
+        if self.__recorder is not None:
+            self.__recorder.flag(i, j)
         if not self.__game_over:
-            for i, row in enumerate(self.__fields):
-                for j, field in enumerate(row):
-                    if isinstance(field, interface.FieldWithMine):
-                        # W wypadku, gdy kliknięte pole jest miną gra się kończy.
-                        field.event_handler(event)
-                        self.check_lose_condition()
-                    else:
-                        # W momencie, gdy kliknięte pole nie jest miną sprawdzane jest czy sąsiaduje z polami z miną.
-                        # Jeśli tak to nie dzieje się nic, jeśli nie to odkrywane są pola sąsiadujące.
-                        # Sprawdzany jest również warunek wygranej.
-                        is_empty = field.event_handler(event)
-                        if field.get_clicked():
-                            field.set_right_clicks(0)
-                        if is_empty:
-                            self.reveal_nearby(i, j)
-                        self.check_win_condition()
+            self.__board.cycle_flag(i, j)
+            self.check_win_condition()
+        return self.__board.get_flag(i, j)
+
+    def event_handler(self, event):
+        """
+        Event handler dla logiki. Pozycja kliknięcia przeliczana jest bezpośrednio na indeksy pola, a kliknięcie
+        zamieniane na wywołanie reveal albo toggle_flag, a kliknięcie środkowym przyciskiem albo jednym z przycisków,
+        gdy drugi jest już wciśnięty - na wywołanie chord. Kółko myszy i strzałki przesuwają widok dużej planszy,
+        a kółko z wciśniętym Ctrl go przybliża. Pozostałe wydarzenia (np. ruch myszki) nie dotykają planszy.
+        :param event: przychodzące wydarzenie pygame
+        """
+        import pygame as pg
+
+        scroll_keys = {pg.K_LEFT: (-1, 0), pg.K_RIGHT: (1, 0), pg.K_UP: (0, -1), pg.K_DOWN: (0, 1)}
+        if event.type == pg.MOUSEWHEEL:
+            if pg.key.get_mods() & pg.KMOD_CTRL:
+                self.zoom(event.y, pg.mouse.get_pos())
+            else:
+                cell_w, cell_h = self.__viewport.get_cell_size()
+                self.scroll(-event.x * 3 * cell_w, -event.y * 3 * cell_h)
+        elif event.type == pg.KEYDOWN and event.key in scroll_keys:
+            cell_w, cell_h = self.__viewport.get_cell_size()
+            dx, dy = scroll_keys[event.key]
+            self.scroll(dx * cell_w, dy * cell_h)
+        elif event.type == pg.MOUSEBUTTONDOWN:
+            cell = self.hit_test(event.pos)
+            if cell is None:
+                return
+            if event.button == pg.BUTTON_MIDDLE or event.button in (pg.BUTTON_LEFT, pg.BUTTON_RIGHT) and \
+                    all(pg.mouse.get_pressed()[::2]):
+                self.chord(*cell)
+            elif event.button == pg.BUTTON_LEFT:
+                self.reveal(*cell)
+            elif event.button == pg.BUTTON_RIGHT:
+                self.toggle_flag(*cell)
 
     def check_lose_condition(self):
         """
         Metoda sprawdzająca czy gracz przegrał.
         """
-        click_count = 0
-        for i, row in enumerate(self.__fields):
-            for j, field in enumerate(row):
-                if isinstance(field, interface.FieldWithMine):
-                    if field.get_clicked():
-                        click_count += 1
-        if click_count > 0:
+        if self.__board.is_mine_revealed():
             self.reset_mines_flag()
             self.change_mines_color("red")
             self.__game_over = True
@@ -195,47 +1040,48 @@ class Game:
         """
         Metoda sprawdzająca dwa niezależne od siebie warunki wygranej rozgrywki.
         """
-        counter_clicked = 0
-        counter_flags = 0
-        not_mine_clicked = True
-        for row in self.__fields:
-            for field in row:
-                if not isinstance(field, interface.FieldWithMine):
-                    if field.get_clicked():
-                        counter_clicked += 1
-                    elif field.get_right_clicks() == 1:
-                        not_mine_clicked = False
-                elif isinstance(field, interface.FieldWithMine) and field.get_right_clicks() == 1:
-                    counter_flags += 1
-
-        if counter_clicked == self.__n * self.__m - self.__mines:
+        if self.__board.count_revealed_safe() == self.__n * self.__m - self.__mines:
             # Wariant z kliknięciem wszystkich pól niebędących minami
             self.change_mines_color("green")
             self.reset_mines_flag()
             self.__game_over = True
             self.__message = 3
-        elif not_mine_clicked and counter_flags == self.__mines:
+        elif self.__board.count_wrong_flags() == 0 and self.__board.count_correct_flags() == self.__mines:
             # Wariant z zaznaczeniem flagami wszystkich pól z minami
             self.__game_over = True
             self.__message = 3
 
+    def load_state(self, revealed, flags):
+        """
+        Metoda przywracająca stan gracza na planszy, np. z zapisanej gry, wraz ze sprawdzeniem warunków końca gry.
+        :param revealed: macierz logiczna odkrytych pól
+        :param flags: macierz flag pól
+        """
+        self.__board.load_state(revealed, flags)
+        self.__game_over = False
+        self.__message = None
+        self.check_lose_condition()
+        if not self.__game_over:
+            self.check_win_condition()
+
     def get_flags_count(self):
         """
         Metoda zliczająca ilość postawionych flag "Tu jest mina" oraz "Tu może być mina".
         :return: (liczba flag "Tu jest mina", liczba flag "Tu może być mina")
         """
-        mine_flag_counter = 0
-        predicted_flag_counter = 0
-        for row in self.__fields:
-            for field in row:
-                if field.get_right_clicks() == 1:
-                    mine_flag_counter += 1
-                elif field.get_right_clicks() == 2:
-                    predicted_flag_counter += 1
-        return mine_flag_counter, predicted_flag_counter
+        return self.__board.get_flags_count()
+
+    def get_viewport(self):
+        return self.__viewport
 
     def get_field(self, i, j):
-        return self.__fields[i][j]
+        return self.get_fields()[i][j]
+
+    def get_board(self):
+        return self.__board
+
+    def get_size(self):
+        return self.__n, self.__m
 
     def get_message(self):
         return self.__message
@@ -249,11 +1095,22 @@ class Game:
     def get_mines(self):
         return self.__mines
 
+    def get_placement(self):
+        return self.__placement
+
+    def set_recorder(self, recorder):
+        """
+        Metoda ustawiająca nagranie (recording.Recorder), do którego dopisywane są odkrycia, flagi i użycie kodu.
+        """
+        self.__recorder = recorder
+
     def set_cheat(self):
         """
         Metoda ustawiająca cheaty do gry po wciśnięciu kombinacji "xyzzy" oraz zmieniająca kolor pól z minami.
         """
         if not self.__cheat:
+            if self.__recorder is not None:
+                self.__recorder.cheat()
             self.__cheat = True
             r, g, b = self.__color
             self.change_mines_color((r - 30 if r >= 30 else 0, g - 20 if g >= 20 else 0, b - 10 if b >= 10 else 0))
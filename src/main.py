@@ -20,72 +20,135 @@ def cheats(key_counter, incoming_event):
 
 
 if __name__ == '__main__':
+    import argparse
     import pygame as pg
+    import instrumentation
     import interface
     import logic
+    import recording
+
+    parser = argparse.ArgumentParser(description="Saper.")
+    parser.add_argument("--stats", metavar="PLIK",
+                        help="mierzy czas obsługi wydarzeń i rysowania klatek, wyświetla podsumowanie pod planszą "
+                             "i zapisuje histogramy do pliku JSON przy wyjściu")
+    parser.add_argument("--large", action="store_true",
+                        help="tryb dużych plansz (do {0}x{0}) z przesuwanym i przybliżanym widokiem: kółko myszy "
+                             "i strzałki przesuwają, Ctrl z kółkiem przybliża".format(logic.large_size))
+    parser.add_argument("--record", metavar="PLIK",
+                        help="nagrywa przebieg rozgrywki do pliku, który można odtworzyć modułem recording.py")
+    parser.add_argument("--placement", choices=logic.placements, default="safe",
+                        help="sposób rozmieszczania min: od razu (random), przy pierwszym kliknięciu poza klikniętym "
+                             "polem (safe), poza nim i jego sąsiedztwem (area) albo bez potrzeby zgadywania (no_guess)")
+    parsed = parser.parse_args()
+    stats = instrumentation.FrameStats(parsed.stats is not None)
+    recorder = recording.Recorder(parsed.record is not None)
 
     # Zdefiniowane podstawowe elementy
     background_color = (200, 200, 200)
     fields_color = (120, 60, 40)
-    screen = interface.set_window((395, 590), "Minesweeper", background_color)
+    overlay_rect = pg.Rect(0, 590, 395, instrumentation.overlay_height)
+    screen = interface.set_window((395, 590 + (overlay_rect.h if stats.is_enabled() else 0)), "Minesweeper",
+                                  background_color)
     font = pg.font.SysFont('timesnewroman.ttf', 24)
-    clock = pg.time.Clock()
 
     # Inicjacja domyślnej gry oraz pierwsze wygenerowanie interfejsu
-    game = logic.Game(6, 6, 4, screen, fields_color)
+    seed = recording.random_seed()
+    game = logic.Game(6, 6, 4, screen, fields_color, rng=seed, large=parsed.large, placement=parsed.placement)
+    recorder.new_game(6, 6, 4, seed, parsed.large, parsed.placement)
+    game.set_recorder(recorder)
     display = interface.Interface(screen, font, game, background_color)
     display.display()
 
     # Wyrażenie lambda zwracający czy podany event jest warty obsłużenia
     event_handler = lambda x: x.type == pg.MOUSEBUTTONDOWN or x.type == pg.KEYDOWN \
-                              or x.type == pg.MOUSEMOTION or x.type == pg.MOUSEBUTTONUP
+                              or x.type == pg.MOUSEBUTTONUP or x.type == pg.MOUSEWHEEL
+
+    # Pozostałe rodzaje wydarzeń nie trafiają do kolejki, więc nie wybudzają pętli
+    pg.event.set_blocked(None)
+    pg.event.set_allowed([pg.QUIT, pg.KEYDOWN, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP, pg.MOUSEMOTION, pg.MOUSEWHEEL,
+                          pg.WINDOWEXPOSED])
 
-    # Główna pętla programu
+    # Główna pętla programu. Nic w grze nie jest animowane, więc pętla śpi do nadejścia wydarzenia, a z włączonymi
+    # pomiarami budzi się dodatkowo, żeby odświeżyć pasek z podsumowaniem.
+    timeout = int(instrumentation.overlay_interval * 1000) if stats.is_enabled() else None
     pressed_keys = 0
     game_won = 0
     running = True
     while running:
-        attributes_list = []
+        received = interface.wait_events(timeout)
+        if not received:
+            stats.draw_overlay(screen, overlay_rect, background_color)
+            continue
+
+        # Wydarzenia klatki obsługiwane są razem, po połączeniu ruchów myszki i obrotów kółka, a ekran rysowany jest
+        # raz, na końcu klatki: w całości po rozpoczęciu nowej gry, w przeciwnym razie tylko zmienione fragmenty.
+        stats.start_frame()
+        events = interface.coalesce_events(received)
+        stats.count_events(len(received), len(events))
+        full_redraw = False
+        changed = False
+        exposed = False
+        hover_rects = []
 
-        for event in pg.event.get():
+        for event in events:
             if event.type == pg.QUIT:
                 running = False
 
+            # Odsłonięte okno trzeba odświeżyć, a ruch myszki zmienia jedynie podświetlenie przycisku nowej gry
+            if event.type == pg.WINDOWEXPOSED:
+                exposed = True
+            if event.type == pg.MOUSEMOTION:
+                hover_rects += display.hover(event.pos)
+
             if event.type == pg.KEYDOWN:
                 pressed_keys = cheats(pressed_keys, event)
                 if pressed_keys == 5:
                     pressed_keys = 0
                     game.set_cheat()
-                    display.display()
 
             if event_handler(event):
+                changed = True
                 attributes_list = display.event_handler(event)
 
                 # Sprawdzanie czy przychodzą do nas dane zebrane ze wszystkich 3 pól.
                 if len(attributes_list) == 3:
-                    temp_game = logic.Game(attributes_list[0], attributes_list[1],
-                                           attributes_list[2], screen, fields_color)
+                    seed = recording.random_seed()
+                    temp_game = logic.Game(attributes_list[0], attributes_list[1], attributes_list[2], screen,
+                                           fields_color, rng=seed, large=parsed.large,
+                                           placement=parsed.placement)
                     display.set_message(temp_game.get_message())
                     if temp_game.get_message() is None:
+                        recorder.new_game(*attributes_list, seed, parsed.large, parsed.placement)
                         game = temp_game
+                        game.set_recorder(recorder)
                         display.set_game(game)
                         game_won = 0
-                    display.display()
+                    full_redraw = True
 
                 game.event_handler(event)
                 if game_won == 0 and game.get_game_over():
                     game_won += 1
+                if event.type == pg.MOUSEBUTTONUP and game_won == 1:
+                    game_won += 1
+                    display.set_message(game.get_message())
 
-                # Część decyzyjna czy potrzebne jest odświeżanie całego ekranu czy tylko krytycznych elementów.
-                # Znaczący wpływ na płynność rozgrywki oraz liczbę FPS'ów, szczególnie dla dużych plansz np. 15x15.
-                if event.type == pg.MOUSEBUTTONUP or not display.areTextBoxesEmpty():
-                    if game_won == 1:
-                        game_won += 1
-                        display.set_message(game.get_message())
-                    display.display()
-                else:
-                    display.display_nonstop(True)
+        # Rysowane są tylko zmienione pola, komunikat i liczniki oraz elementy rysowane za każdym razem,
+        # a odświeżane wyłącznie zajmowane przez nie fragmenty ekranu niezależnie od rozmiaru planszy.
+        if full_redraw:
+            stats.render(display.display, game, True)
+        else:
+            if changed:
+                stats.render(display.display_changes, game)
+            if exposed:
+                pg.display.update()
+            elif hover_rects:
+                pg.display.update(hover_rects)
 
-        clock.tick(60)
+        stats.end_frame()
+        stats.draw_overlay(screen, overlay_rect, background_color)
 
+    if stats.is_enabled():
+        stats.dump(parsed.stats)
+    if recorder.is_enabled():
+        recorder.dump(parsed.record)
     pg.quit()
@@ -0,0 +1,196 @@
+import argparse
+import struct
+import time
+import numpy as np
+import logic
+
+# Nagłówek zapisu wydarzeń, nagłówek każdego wydarzenia (rodzaj i milisekundy od początku nagrania) oraz dane
+# wydarzeń: parametry nowej gry (n, m, liczba min, ziarno, tryb dużych plansz, indeks sposobu rozmieszczenia min
+# w logic.placements), indeksy pola oraz liczba pól odkrywanych naraz, po której następują ich indeksy
+header = struct.Struct("<4sB")
+event_header = struct.Struct("<BI")
+new_game_data = struct.Struct("<IIIQ?B")
+cell_data = struct.Struct("<II")
+count_data = struct.Struct("<I")
+magic = b"SAPE"
+version = 3
+
+# Rodzaje wydarzeń
+new_game, reveal, flag, cheat, reveal_many, chord = range(6)
+payloads = {new_game: new_game_data, reveal: cell_data, flag: cell_data, cheat: None, reveal_many: count_data,
+            chord: cell_data}
+
+
+class IncorrectRecording(Exception):
+    """
+    Wyjątek rzucany w momencie odtwarzania danych, które nie są poprawnym nagraniem.
+    """
+    pass
+
+
+def random_seed():
+    """
+    :return: losowe ziarno planszy, które można zapisać w nagraniu
+    """
+    return int(np.random.default_rng().integers(2 ** 63))
+
+
+class Recorder:
+    """
+    Klasa nagrywająca przebieg rozgrywki: parametry i ziarno każdej nowej gry, odkrycia pól (także wielu naraz
+    i odkrycia sąsiedztwa liczby), zmiany flag i użycie kodu "xyzzy". Wydarzenia dopisywane są do bufora w zwartej
+    postaci binarnej razem z czasem od początku nagrania.
+    Nagranie wyłączone zawiera sam nagłówek, a liczba wydarzeń pozostaje zerowa.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Konstruktor nagrania.
+        :param enabled: czy nagrywanie jest włączone
+        """
+        self.__enabled = enabled
+        self.__start = time.perf_counter()
+        self.__data = bytearray(header.pack(magic, version))
+        self.__events = 0
+
+    def is_enabled(self):
+        return self.__enabled
+
+    def __add(self, kind, *values):
+        if not self.__enabled:
+            return
+        milliseconds = min(int((time.perf_counter() - self.__start) * 1e3), 2 ** 32 - 1)
+        self.__data += event_header.pack(kind, milliseconds)
+        if payloads[kind] is not None:
+            self.__data += payloads[kind].pack(*values)
+        self.__events += 1
+
+    def new_game(self, n, m, mines, seed, large=False, placement="random"):
+        self.__add(new_game, n, m, mines, seed, large, logic.placements.index(placement))
+
+    def reveal(self, i, j):
+        self.__add(reveal, i, j)
+
+    def reveal_many(self, rows, columns):
+        self.__add(reveal_many, len(rows))
+        if self.__enabled:
+            self.__data += np.column_stack((rows, columns)).astype("<u4").tobytes()
+
+    def chord(self, i, j):
+        self.__add(chord, i, j)
+
+    def flag(self, i, j):
+        self.__add(flag, i, j)
+
+    def cheat(self):
+        self.__add(cheat)
+
+    def count_events(self):
+        return self.__events
+
+    def to_bytes(self):
+        return bytes(self.__data)
+
+    def dump(self, path):
+        """
+        Metoda zapisująca nagranie do pliku.
+        :param path: ścieżka pliku
+        """
+        with open(path, "wb") as file:
+            file.write(self.__data)
+
+
+def read_events(data):
+    """
+    Funkcja odczytująca kolejne wydarzenia nagrania.
+    :param data: nagranie
+    :return: generator krotek (rodzaj, milisekundy od początku nagrania, dane wydarzenia); danymi odkrycia wielu pól
+    są (wiersze, kolumny)
+    """
+    if len(data) < header.size or header.unpack_from(data) != (magic, version):
+        raise IncorrectRecording
+    offset = header.size
+    while offset < len(data):
+        if offset + event_header.size > len(data):
+            raise IncorrectRecording
+        kind, milliseconds = event_header.unpack_from(data, offset)
+        offset += event_header.size
+        if kind not in payloads:
+            raise IncorrectRecording
+        values = ()
+        if payloads[kind] is not None:
+            if offset + payloads[kind].size > len(data):
+                raise IncorrectRecording
+            values = payloads[kind].unpack_from(data, offset)
+            offset += payloads[kind].size
+        if kind == reveal_many:
+            size = values[0] * cell_data.size
+            if offset + size > len(data):
+                raise IncorrectRecording
+            cells = np.frombuffer(data, dtype="<u4", count=2 * values[0], offset=offset).reshape(-1, 2)
+            values = (cells[:, 0], cells[:, 1])
+            offset += size
+        yield kind, milliseconds, values
+
+
+def replay(data):
+    """
+    Funkcja odtwarzająca nagranie bez interfejsu graficznego i bez czekania na czasy wydarzeń. Każda nowa gra tworzona
+    jest z zapisanego ziarna, więc odkrycia i flagi trafiają na tę samą planszę co w nagraniu.
+    :param data: nagranie
+    :return: (gra w stanie z końca nagrania albo None, jeśli nagranie nie zawiera gry, liczba wydarzeń)
+    """
+    game = None
+    events = 0
+    for kind, _, values in read_events(data):
+        events += 1
+        if kind == new_game:
+            n, m, mines, seed, large, placement = values
+            if placement >= len(logic.placements):
+                raise IncorrectRecording
+            game = logic.Game(n, m, mines, rng=seed, large=large, placement=logic.placements[placement])
+            if game.get_message() is not None:
+                raise IncorrectRecording
+        elif game is None:
+            raise IncorrectRecording
+        elif kind == reveal:
+            game.reveal(*values)
+        elif kind == reveal_many:
+            game.reveal_many(values)
+        elif kind == chord:
+            game.chord(*values)
+        elif kind == flag:
+            game.toggle_flag(*values)
+        else:
+            game.set_cheat()
+    return game, events
+
+
+def main(args=None):
+    """
+    Punkt wejścia odtwarzania nagrań z linii poleceń. Dla każdego nagrania wypisuje stan gry na końcu oraz tempo
+    odtwarzania.
+    :param args: argumenty linii poleceń, domyślnie sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Odtwarzanie nagranych rozgrywek sapera bez interfejsu graficznego.")
+    parser.add_argument("recordings", nargs="+", metavar="PLIK", help="pliki nagrań")
+    parsed = parser.parse_args(args)
+
+    total_events, total_time = 0, 0.0
+    for path in parsed.recordings:
+        with open(path, "rb") as file:
+            data = file.read()
+        start = time.perf_counter()
+        game, events = replay(data)
+        elapsed = time.perf_counter() - start
+        total_events += events
+        total_time += elapsed
+        state = "brak gry" if game is None else "odkryte pola: {}  flagi: {}  komunikat: {}".format(
+            game.get_board().count_revealed_safe(), game.get_flags_count()[0], game.get_message())
+        print("{}  wydarzenia: {}  {}  czas: {:.1f} ms".format(path, events, state, elapsed * 1e3), flush=True)
+    print("łącznie wydarzenia: {}  wydarzenia/s: {:.0f}".format(
+        total_events, total_events / total_time if total_time else 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+import argparse
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import generator
+import logic
+import solver
+
+# Liczba kolejnych gier rozgrywanych z jednego strumienia liczb pseudolosowych. Strumienie numerowane są od początku
+# symulacji, więc wynik dla danego ziarna nie zależy od liczby procesów ani od podziału gier na paczki.
+games_per_stream = 1000
+
+# Przybliżona liczba pól wszystkich plansz rozgrywanych razem przez symulację zbiorczą
+batch_cells = 1 << 18
+
+
+def random_strategy(game, rng):
+    """
+    Strategia klikająca losowe nieodkryte pole.
+    :param game: rozgrywana gra
+    :param rng: generator liczb pseudolosowych
+    :return: (i, j) pole do odkrycia
+    """
+    hidden = np.flatnonzero(~game.get_board().get_revealed_array())
+    return divmod(int(hidden[rng.integers(len(hidden))]), game.get_size()[0])
+
+
+# Solvery przypisane do rozgrywanych gier, usuwane razem z grą
+solvers = weakref.WeakKeyDictionary()
+
+
+def solver_strategy(game, rng):
+    """
+    Strategia odkrywająca pola, które solver uznał za na pewno bezpieczne, a gdy takich brak - losowe nieodkryte pole,
+    które nie jest na pewno miną.
+    :param game: rozgrywana gra
+    :param rng: generator liczb pseudolosowych
+    :return: (i, j) pole do odkrycia
+    """
+    if game not in solvers:
+        solvers[game] = solver.Solver(game.get_board())
+    game_solver = solvers[game]
+    game_solver.update()
+    safe = game_solver.get_safe()
+    if safe:
+        return min(safe)
+    hidden = ~game.get_board().get_revealed_array()
+    for cell in game_solver.get_mines():
+        hidden[cell] = False
+    hidden = np.flatnonzero(hidden)
+    return divmod(int(hidden[rng.integers(len(hidden))]), game.get_size()[0])
+
+
+# Silniki prawdopodobieństwa przypisane do rozgrywanych gier, usuwane razem z grą
+engines = weakref.WeakKeyDictionary()
+
+
+def probability_strategy(game, rng):
+    """
+    Strategia odkrywająca pola, które solver uznał za na pewno bezpieczne, a gdy takich brak - nieodkryte pole
+    o najmniejszym prawdopodobieństwie miny.
+    :param game: rozgrywana gra
+    :param rng: generator liczb pseudolosowych, używany przez silnik do szacowania dużych składowych losowaniem
+    :return: (i, j) pole do odkrycia
+    """
+    if game not in solvers:
+        solvers[game] = solver.Solver(game.get_board())
+        engines[game] = solver.ProbabilityEngine(rng=rng)
+    game_solver = solvers[game]
+    game_solver.update()
+    safe = game_solver.get_safe()
+    if safe:
+        return min(safe)
+    probabilities = engines[game].probabilities(game.get_board(), game.get_mines(), game_solver)
+    probabilities[game.get_board().get_revealed_array()] = np.inf
+    return tuple(int(index) for index in np.unravel_index(np.argmin(probabilities), probabilities.shape))
+
+
+# Dostępne strategie - funkcje przyjmujące grę oraz generator liczb pseudolosowych i zwracające pole do odkrycia
+strategies = {"random": random_strategy, "solver": solver_strategy, "probability": probability_strategy}
+
+
+def play(game, strategy, rng):
+    """
+    Funkcja rozgrywająca jedną grę zadaną strategią aż do jej zakończenia.
+    :param game: gra do rozegrania
+    :param strategy: strategia wybierająca kolejne pole do odkrycia
+    :param rng: generator liczb pseudolosowych
+    :return: (czy gra wygrana, liczba kliknięć, liczba odkrytych pól bez min)
+    """
+    clicks = 0
+    while not game.get_game_over():
+        game.reveal(*strategy(game, rng))
+        clicks += 1
+    return game.get_message() == 3, clicks, game.get_board().count_revealed_safe()
+
+
+class Statistics:
+    """
+    Klasa zbierająca zbiorcze statystyki rozegranych gier.
+    """
+
+    def __init__(self):
+        self.__games = 0
+        self.__wins = 0
+        self.__clicks = 0
+        self.__revealed = 0
+        self.__time = 0.0
+
+    def add(self, won, clicks, revealed):
+        """
+        Metoda dodająca wynik pojedynczej gry.
+        :param won: czy gra została wygrana
+        :param clicks: liczba kliknięć
+        :param revealed: liczba odkrytych pól bez min
+        """
+        self.__games += 1
+        self.__wins += int(won)
+        self.__clicks += clicks
+        self.__revealed += revealed
+
+    def add_many(self, won, clicks, revealed):
+        """
+        Metoda dodająca wyniki wielu gier naraz.
+        :param won: wektor informujący, czy kolejne gry zostały wygrane
+        :param clicks: wektor liczb kliknięć
+        :param revealed: wektor liczb odkrytych pól bez min
+        """
+        self.__games += len(won)
+        self.__wins += int(np.count_nonzero(won))
+        self.__clicks += int(np.sum(clicks))
+        self.__revealed += int(np.sum(revealed))
+
+    def add_time(self, seconds):
+        self.__time += seconds
+
+    def merge(self, other):
+        """
+        Metoda dołączająca statystyki z innego zbioru gier.
+        :param other: statystyki do dołączenia
+        """
+        self.__games += other.get_games()
+        self.__wins += other.get_wins()
+        self.__clicks += other.get_clicks()
+        self.__revealed += other.get_revealed()
+        self.__time += other.get_time()
+
+    def get_games(self):
+        return self.__games
+
+    def get_wins(self):
+        return self.__wins
+
+    def get_clicks(self):
+        return self.__clicks
+
+    def get_revealed(self):
+        return self.__revealed
+
+    def get_time(self):
+        return self.__time
+
+    def __str__(self):
+        games = max(self.__games, 1)
+        return "gry: {}  wygrane: {:.2%}  kliknięcia/grę: {:.2f}  odkryte pola/grę: {:.2f}  " \
+               "czas/grę: {:.1f} us  gry/s: {:.0f}".format(self.__games, self.__wins / games, self.__clicks / games,
+                                                         self.__revealed / games, self.__time / games * 1e6,
+                                                         self.__games / self.__time if self.__time else 0)
+
+
+def window_min(array, fill):
+    """
+    Funkcja wyznaczająca minimum wartości w kwadratach 3x3 dla stosu plansz.
+    :param array: macierz o wymiarach (plansze, m, n)
+    :param fill: wartość pól poza planszą
+    :return: minima kwadratów o wymiarach (plansze, m, n)
+    """
+    k, m, n = array.shape
+    padded = np.full((k, m + 2, n + 2), fill, dtype=array.dtype)
+    padded[:, 1:-1, 1:-1] = array
+    vertical = np.minimum(np.minimum(padded[:, :-2], padded[:, 1:-1]), padded[:, 2:])
+    return np.minimum(np.minimum(vertical[:, :, :-2], vertical[:, :, 1:-1]), vertical[:, :, 2:])
+
+
+def play_random_batch(n, m, mines, count, rng):
+    """
+    Funkcja rozgrywająca naraz wiele gier strategią losową bez tworzenia obiektów gry. Strategia losowa klika pola
+    w losowej kolejności, pomijając już odkryte, więc wystarczy wylosować kolejność wszystkich pól. Pole zostaje
+    odkryte w chwili własnego kliknięcia albo kliknięcia dowolnego pola obszaru zer, z którym sąsiaduje - chwile
+    odkrycia obszarów zer wyznaczane są przez rozchodzenie się minimum po sąsiednich zerach. Gra kończy się
+    kliknięciem pierwszej miny albo odkryciem ostatniego pola bez miny.
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param count: liczba gier
+    :param rng: generator liczb pseudolosowych
+    :return: (czy gry wygrane, liczby kliknięć, liczby odkrytych pól bez min) - wektory długości count
+    """
+    cells = n * m
+    layouts = generator.random_layouts(count, n, m, mines, np.zeros((m, n), dtype=bool), rng)
+    dtype = np.min_scalar_type(cells)
+    ranks = np.empty((count, cells), dtype=dtype)
+    np.put_along_axis(ranks, np.argsort(rng.random((count, cells)), axis=1), np.arange(cells, dtype=dtype), axis=1)
+    ranks = ranks.reshape(count, m, n)
+    zero = generator.window_sums(layouts.view(np.int8))[0] == 0
+    regions = np.where(zero, ranks, cells).astype(dtype)
+    active = np.flatnonzero(zero.reshape(count, -1).any(axis=1))
+    while len(active):
+        spread = np.where(zero[active], window_min(regions[active], cells), cells).astype(dtype)
+        changed = (spread != regions[active]).reshape(len(active), -1).any(axis=1)
+        regions[active] = spread
+        active = active[changed]
+    times = np.where(layouts, ranks, np.minimum(ranks, window_min(regions, cells))).reshape(count, -1)
+    layouts = layouts.reshape(count, -1)
+    ranks = ranks.reshape(count, -1)
+    hit = np.where(layouts, ranks, cells).min(axis=1)
+    last = np.where(layouts, 0, times).max(axis=1)
+    won = (last < hit) & (mines < cells)
+    end = np.where(won, last, hit)
+    clicks = np.count_nonzero((times == ranks) & (ranks <= end[:, None]), axis=1)
+    revealed = np.count_nonzero(~layouts & (times < hit[:, None]), axis=1)
+    return won, clicks, revealed
+
+
+def simulate(n, m, mines, games, strategy, rng, batched=False):
+    """
+    Funkcja rozgrywająca zadaną liczbę gier na losowych planszach.
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param games: liczba gier
+    :param strategy: strategia wybierająca kolejne pole do odkrycia
+    :param rng: generator liczb pseudolosowych używany do plansz i strategii
+    :param batched: czy rozgrywać gry zbiorczo, bez obiektów gry - tylko dla strategii losowej
+    :return: statystyki rozegranych gier
+    """
+    if batched and strategy is not random_strategy:
+        raise ValueError("zbiorczo można rozgrywać tylko gry strategią losową")
+    statistics = Statistics()
+    start = time.perf_counter()
+    if batched:
+        count = max(batch_cells // (n * m), 1)
+        for first in range(0, games, count):
+            statistics.add_many(*play_random_batch(n, m, mines, min(count, games - first), rng))
+    else:
+        for _ in range(games):
+            statistics.add(*play(logic.Game(n, m, mines, rng=rng), strategy, rng))
+    statistics.add_time(time.perf_counter() - start)
+    return statistics
+
+
+def simulate_streams(n, m, mines, games, strategy, entropy, first_stream, batched=False):
+    """
+    Funkcja rozgrywająca gry z kolejnych niezależnych strumieni liczb pseudolosowych wyprowadzonych z ziarna
+    symulacji. Wykonywana w procesach roboczych.
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param games: liczba gier
+    :param strategy: strategia wybierająca kolejne pole do odkrycia
+    :param entropy: ziarno całej symulacji
+    :param first_stream: numer pierwszego strumienia
+    :param batched: czy rozgrywać gry zbiorczo
+    :return: statystyki rozegranych gier
+    """
+    statistics = Statistics()
+    stream = first_stream
+    while games > 0:
+        rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(stream,)))
+        statistics.merge(simulate(n, m, mines, min(games, games_per_stream), strategy, rng, batched))
+        games -= games_per_stream
+        stream += 1
+    return statistics
+
+
+def simulate_parallel(n, m, mines, games, strategy, seed=None, workers=None, chunk=10000, batched=False):
+    """
+    Funkcja rozdzielająca gry w paczkach na pulę procesów i łącząca ich statystyki w kolejności paczek.
+    :param n: pierwszy rozmiar planszy
+    :param m: drugi rozmiar planszy
+    :param mines: liczba min na planszy
+    :param games: liczba gier
+    :param strategy: strategia wybierająca kolejne pole do odkrycia
+    :param seed: ziarno symulacji, domyślnie losowe
+    :param workers: liczba procesów, domyślnie liczba rdzeni
+    :param chunk: przybliżona liczba gier w paczce, zaokrąglana do wielokrotności games_per_stream
+    :param batched: czy rozgrywać gry zbiorczo
+    :return: generator statystyk wszystkich gier rozegranych do końca kolejnej paczki
+    """
+    entropy = np.random.SeedSequence(seed).entropy
+    chunk = max(chunk // games_per_stream, 1) * games_per_stream
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(simulate_streams, n, m, mines, min(chunk, games - start), strategy, entropy,
+                               start // games_per_stream, batched) for start in range(0, games, chunk)]
+        statistics = Statistics()
+        for future in futures:
+            statistics.merge(future.result())
+            yield statistics
+
+
+def main(args=None):
+    """
+    Punkt wejścia symulacji uruchamianej z linii poleceń. Wypisuje zbiorcze statystyki co zadaną liczbę gier.
+    :param args: argumenty linii poleceń, domyślnie sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Symulacja wielu gier w sapera bez interfejsu graficznego.")
+    parser.add_argument("-n", type=int, default=8, help="pierwszy rozmiar planszy")
+    parser.add_argument("-m", type=int, default=8, help="drugi rozmiar planszy")
+    density = parser.add_mutually_exclusive_group()
+    density.add_argument("--mines", type=int, help="liczba min na planszy (domyślnie 12)")
+    density.add_argument("--density", type=float, help="gęstość min na planszy z przedziału [0, 1]")
+    parser.add_argument("--games", type=int, default=100000, help="liczba gier do rozegrania")
+    parser.add_argument("--strategy", choices=sorted(strategies), default="random", help="strategia gracza")
+    parser.add_argument("--report", type=int, default=10000, help="co ile gier wypisywać statystyki")
+    parser.add_argument("--seed", type=int, help="ziarno symulacji, domyślnie losowe")
+    parser.add_argument("--workers", type=int, help="liczba procesów, domyślnie liczba rdzeni")
+    parser.add_argument("--batched", action="store_true",
+                        help="rozgrywaj gry zbiorczo, bez obiektów gry (tylko strategia losowa)")
+    parsed = parser.parse_args(args)
+
+    mines = round(parsed.density * parsed.n * parsed.m) if parsed.density is not None else parsed.mines
+    mines = 12 if mines is None else mines
+    if logic.size_condition(parsed.n, parsed.m):
+        parser.error("niepoprawny rozmiar planszy")
+    if logic.mines_condition(mines, parsed.n, parsed.m):
+        parser.error("niepoprawna liczba min")
+    if parsed.batched and parsed.strategy != "random":
+        parser.error("zbiorczo można rozgrywać tylko gry strategią losową")
+
+    seed = np.random.SeedSequence(parsed.seed).entropy
+    print("ziarno:", seed, flush=True)
+    start = time.perf_counter()
+    for statistics in simulate_parallel(parsed.n, parsed.m, mines, parsed.games, strategies[parsed.strategy], seed,
+                                        parsed.workers, parsed.report, parsed.batched):
+        print("{}  łącznie gry/s: {:.0f}".format(statistics, statistics.get_games() / (time.perf_counter() - start)),
+              flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,416 @@
+import math
+import numpy as np
+
+# Domyślne ograniczenia silnika prawdopodobieństwa: największa liczba pól składowej przeglądanej dokładnie, liczba
+# losowań dla większych składowych oraz największa łączna liczba losowanych pól (losowania razy pola składowej), która
+# ogranicza czas szacowania bardzo dużych składowych
+max_component = 40
+samples = 20000
+max_sampled_cells = 2000000
+
+
+class Solver:
+    """
+    Klasa wyznaczająca pola, które na podstawie widocznego stanu planszy na pewno są bezpieczne albo na pewno zawierają
+    minę. Każde odkryte pole z cyfrą tworzy ograniczenie: wśród jego nieznanych sąsiadów jest dokładnie tyle min, ile
+    pozostało do wskazania. Ograniczenia rozwiązywane są regułami dla pojedynczego ograniczenia oraz dla par
+    nachodzących na siebie ograniczeń i aktualizowane przyrostowo - po odkryciu pól sprawdzane są tylko ograniczenia,
+    których dotyczy zmiana. Flagi gracza nie są brane pod uwagę, bo mogą być błędne.
+    """
+
+    def __init__(self, board):
+        """
+        Konstruktor solvera.
+        :param board: plansza (logic.Board), której widoczny stan jest analizowany
+        """
+        self.__board = board
+        n, m = board.get_size()
+        self.__seen = np.zeros((m, n), dtype=bool)
+        self.__mines = set()
+        self.__safe = set()
+        self.__constraints = {}
+        self.__containing = {}
+        self.__queue = []
+        self.update()
+
+    def update(self, changed=None):
+        """
+        Metoda uwzględniająca nowo odkryte pola i propagująca wynikające z nich wnioski.
+        :param changed: (wiersze, kolumny) nowo odkrytych pól, np. wynik Game.reveal; domyślnie wyznaczane przez
+        porównanie z odkrytymi polami planszy
+        """
+        if changed is None:
+            changed = np.nonzero(self.__board.get_revealed_array() & ~self.__seen)
+        rows, columns = changed
+        cells = [(i, j) for i, j in zip(rows.tolist(), columns.tolist()) if not self.__seen[i, j]]
+        self.__seen[rows, columns] = True
+
+        for cell in cells:
+            self.__mark(cell, self.__board.is_mine(*cell))
+        self.__safe.difference_update(cells)
+        for cell in cells:
+            if not self.__board.is_mine(*cell):
+                self.__add_constraint(cell)
+        self.__propagate()
+
+    def __neighbours(self, i, j):
+        n, m = self.__board.get_size()
+        return [(q, p) for q in range(max(i - 1, 0), min(i + 2, m)) for p in range(max(j - 1, 0), min(j + 2, n))
+                if (q, p) != (i, j)]
+
+    def __add_constraint(self, cell):
+        """
+        Metoda tworząca ograniczenie dla odkrytego pola z jego nieznanych sąsiadów i pozostałej liczby min.
+        """
+        unknown = set()
+        remaining = self.__board.get_border_value(*cell)
+        for neighbour in self.__neighbours(*cell):
+            if neighbour in self.__mines:
+                remaining -= 1
+            elif not self.__seen[neighbour] and neighbour not in self.__safe:
+                unknown.add(neighbour)
+        if unknown:
+            self.__constraints[cell] = [unknown, remaining]
+            for neighbour in unknown:
+                self.__containing.setdefault(neighbour, set()).add(cell)
+            self.__queue.append(cell)
+
+    def __mark(self, cell, mine):
+        """
+        Metoda zapisująca, że pole na pewno jest miną albo jest bezpieczne, i usuwająca je z ograniczeń.
+        """
+        if cell in self.__mines or cell in self.__safe:
+            return
+        if mine:
+            self.__mines.add(cell)
+        elif not self.__seen[cell]:
+            self.__safe.add(cell)
+        for key in self.__containing.pop(cell, ()):
+            constraint = self.__constraints[key]
+            constraint[0].discard(cell)
+            if mine:
+                constraint[1] -= 1
+            if not constraint[0]:
+                del self.__constraints[key]
+            else:
+                self.__queue.append(key)
+
+    def __propagate(self):
+        """
+        Metoda przetwarzająca kolejkę zmienionych ograniczeń aż do wyczerpania wniosków.
+        """
+        while self.__queue:
+            key = self.__queue.pop()
+            if key not in self.__constraints:
+                continue
+            unknown, remaining = self.__constraints[key]
+
+            # Reguły pojedynczego ograniczenia
+            if remaining == 0 or remaining == len(unknown):
+                for cell in list(unknown):
+                    self.__mark(cell, remaining > 0)
+                continue
+
+            # Reguła par: różnica liczby min równa rozmiarowi różnicy zbiorów wyznacza obie różnice
+            others = set().union(*(self.__containing[cell] for cell in unknown))
+            others.discard(key)
+            for other in others:
+                other_unknown, other_remaining = self.__constraints[other]
+                only_key, only_other = unknown - other_unknown, other_unknown - unknown
+                if remaining - other_remaining == len(only_key):
+                    mines, safe = only_key, only_other
+                elif other_remaining - remaining == len(only_other):
+                    mines, safe = only_other, only_key
+                else:
+                    continue
+                if mines or safe:
+                    for cell in list(mines):
+                        self.__mark(cell, True)
+                    for cell in list(safe):
+                        self.__mark(cell, False)
+                    self.__queue.append(key)
+                    break
+
+    def get_safe(self):
+        """
+        :return: zbiór nieodkrytych pól, które na pewno nie zawierają miny
+        """
+        return set(self.__safe)
+
+    def get_mines(self):
+        """
+        :return: zbiór pól, które na pewno zawierają minę
+        """
+        return set(self.__mines)
+
+    def get_constraints(self):
+        """
+        :return: lista ograniczeń (zbiór nieznanych pól, liczba min wśród nich) nierozstrzygniętych przez solver
+        """
+        return [(set(unknown), remaining) for unknown, remaining in self.__constraints.values()]
+
+
+def log_binomial(n, k):
+    """
+    Funkcja zwracająca logarytm naturalny współczynnika dwumianowego albo -inf, gdy współczynnik jest zerowy.
+    """
+    if k < 0 or k > n:
+        return -math.inf
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def log_convolve(a, b):
+    """
+    Funkcja splatająca dwa rozkłady zapisane jako logarytmy wag.
+    :param a: logarytmy wag pierwszego rozkładu
+    :param b: logarytmy wag drugiego rozkładu
+    :return: logarytmy wag rozkładu sumy
+    """
+    a_max, b_max = a.max(), b.max()
+    with np.errstate(divide="ignore"):
+        return np.log(np.convolve(np.exp(a - a_max), np.exp(b - b_max))) + a_max + b_max
+
+
+def log_sum(values):
+    """
+    Funkcja zwracająca logarytm sumy wag zapisanych jako logarytmy.
+    """
+    top = values.max()
+    if top == -math.inf:
+        return top
+    return top + math.log(np.exp(values - top).sum())
+
+
+class ProbabilityEngine:
+    """
+    Klasa wyznaczająca dokładne prawdopodobieństwo miny w każdym nieodkrytym polu. Nierozstrzygnięte ograniczenia
+    solvera dzielone są na niezależne składowe (pola brzegu połączone wspólnymi ograniczeniami). Dla każdej składowej
+    przeglądane są wszystkie zgodne rozmieszczenia min (z nawrotami i zapamiętywaniem podproblemów), a wyniki składowych
+    łączone są z pozostałymi polami planszy przez wagi dwumianowe wynikające z łącznej liczby min. Składowe większe
+    od zadanego limitu szacowane są losowaniem.
+    """
+
+    def __init__(self, max_component=max_component, samples=samples, rng=None):
+        """
+        Konstruktor silnika.
+        :param max_component: największa liczba pól składowej przeglądanej dokładnie
+        :param samples: liczba losowań dla składowych większych od limitu; dla bardzo dużych składowych zmniejszana
+        tak, żeby nie przekroczyć max_sampled_cells losowanych pól
+        :param rng: generator liczb pseudolosowych albo ziarno dla losowania
+        """
+        self.__max_component = max_component
+        self.__samples = samples
+        self.__rng = np.random.default_rng(rng)
+        self.__cache = {}
+
+    def probabilities(self, board, mines, board_solver=None):
+        """
+        Metoda wyznaczająca prawdopodobieństwo miny w każdym polu planszy.
+        :param board: plansza (logic.Board)
+        :param mines: łączna liczba min na planszy, np. Game.get_mines()
+        :param board_solver: solver tej planszy; domyślnie tworzony od nowa
+        :return: macierz prawdopodobieństw, 0 dla pól odkrytych i bezpiecznych, 1 dla pól na pewno z miną
+        """
+        if board_solver is None:
+            board_solver = Solver(board)
+        result = np.zeros(board.get_revealed_array().shape)
+        unknown = ~board.get_revealed_array()
+        for cell in board_solver.get_mines():
+            result[cell] = 1.0
+            unknown[cell] = False
+        for cell in board_solver.get_safe():
+            unknown[cell] = False
+
+        components = self.__components(board_solver.get_constraints())
+        for cells, _ in components:
+            for cell in cells:
+                unknown[cell] = False
+        interior = int(np.count_nonzero(unknown))
+        remaining = mines - len(board_solver.get_mines())
+
+        # Rozkłady liczby min w każdej składowej oraz ich splot
+        results = [self.__component_result(cells, constraints) for cells, constraints in components]
+        with np.errstate(divide="ignore"):
+            log_counts = [np.log(counts.astype(float)) for counts, _ in results]
+
+        def total_weights(parts):
+            convolved = np.zeros(1)
+            for part in parts:
+                convolved = log_convolve(convolved, part)
+            return convolved
+
+        # Prawdopodobieństwa pól każdej składowej
+        for index, ((cells, _), (counts, hits)) in enumerate(zip(components, results)):
+            others = total_weights(log_counts[:index] + log_counts[index + 1:])
+            weights = np.array([log_sum(np.array([others[s] + log_binomial(interior, remaining - k - s)
+                                                  for s in range(len(others))])) + log_counts[index][k]
+                                for k in range(len(counts))])
+            weights = np.exp(weights - weights.max())
+            weights /= weights.sum()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                conditional = np.nan_to_num(hits / counts[:, None].astype(float))
+            for cell, probability in zip(cells, weights @ conditional):
+                result[cell] = probability
+
+        # Prawdopodobieństwo pól poza brzegiem jest wspólne i zależy od liczby min pozostałych dla nich
+        if interior:
+            totals = total_weights(log_counts)
+            weights = np.array([totals[s] + log_binomial(interior, remaining - s) for s in range(len(totals))])
+            weights = np.exp(weights - weights.max())
+            weights /= weights.sum()
+            result[unknown] = sum(weight * (remaining - s) / interior for s, weight in enumerate(weights))
+        return result
+
+    def __components(self, constraints):
+        """
+        Metoda dzieląca ograniczenia na niezależne składowe połączone wspólnymi polami.
+        :return: lista (uporządkowana lista pól, lista ograniczeń (zbiór pól, liczba min)) dla każdej składowej
+        """
+        containing = {}
+        for index, (cells, _) in enumerate(constraints):
+            for cell in cells:
+                containing.setdefault(cell, []).append(index)
+
+        components = []
+        visited = set()
+        for start in range(len(constraints)):
+            if start in visited:
+                continue
+            # Przeszukiwanie wszerz porządkuje pola tak, żeby ograniczenia zamykały się możliwie szybko
+            visited.add(start)
+            queue = [start]
+            cells = []
+            seen_cells = set()
+            for index in queue:
+                for cell in sorted(constraints[index][0]):
+                    if cell not in seen_cells:
+                        seen_cells.add(cell)
+                        cells.append(cell)
+                        for other in containing[cell]:
+                            if other not in visited:
+                                visited.add(other)
+                                queue.append(other)
+            components.append((cells, [constraints[index] for index in queue]))
+        return components
+
+    def __component_result(self, cells, constraints):
+        """
+        Metoda zwracająca dla składowej liczbę zgodnych rozmieszczeń min dla każdej liczby min k oraz liczbę tych
+        rozmieszczeń, w których dane pole zawiera minę. Wyniki zapamiętywane są między wywołaniami, więc składowe
+        niezmienione przez ostatnie kliknięcie nie są liczone ponownie.
+        :return: (liczby rozmieszczeń [k], liczby rozmieszczeń z miną w polu [k, pole])
+        """
+        key = frozenset((frozenset(unknown), remaining) for unknown, remaining in constraints)
+        if key not in self.__cache:
+            if len(self.__cache) > 10000:
+                self.__cache.clear()
+            index = {cell: position for position, cell in enumerate(cells)}
+            positions = [sorted(index[cell] for cell in unknown) for unknown, _ in constraints]
+            targets = [remaining for _, remaining in constraints]
+            if len(cells) <= self.__max_component:
+                self.__cache[key] = enumerate_component(len(cells), positions, targets)
+            else:
+                count = max(1, min(self.__samples, max_sampled_cells // len(cells)))
+                self.__cache[key] = sample_component(len(cells), positions, targets, count, self.__rng)
+        return self.__cache[key]
+
+
+def component_checks(size, positions):
+    """
+    Funkcja przygotowująca dla każdego pola składowej listę ograniczeń, które go dotyczą, wraz z liczbą pól tych
+    ograniczeń leżących dalej w kolejności.
+    """
+    checks = [[] for _ in range(size)]
+    for constraint, cells in enumerate(positions):
+        for order, position in enumerate(cells):
+            checks[position].append((constraint, len(cells) - order - 1))
+    return checks
+
+
+def enumerate_component(size, positions, targets):
+    """
+    Funkcja przeglądająca z nawrotami wszystkie rozmieszczenia min w składowej zgodne z ograniczeniami. Podproblemy
+    (pozycja, liczby brakujących min w ograniczeniach) zapamiętywane są, więc powtarzające się stany liczone są raz.
+    :param size: liczba pól składowej
+    :param positions: dla każdego ograniczenia posortowane pozycje jego pól
+    :param targets: dla każdego ograniczenia liczba min wśród jego pól
+    :return: (liczby rozmieszczeń [k], liczby rozmieszczeń z miną w polu [k, pole])
+    """
+    checks = component_checks(size, positions)
+    memo = {}
+
+    def solve(position, needed):
+        key = (position, needed)
+        if key in memo:
+            return memo[key]
+        counts = np.zeros(size + 1, dtype=np.int64)
+        hits = np.zeros((size + 1, size), dtype=np.int64)
+        if position == size:
+            counts[0] = 1
+        else:
+            for value in (0, 1):
+                updated = list(needed)
+                feasible = True
+                for constraint, later in checks[position]:
+                    updated[constraint] -= value
+                    if updated[constraint] < 0 or updated[constraint] > later:
+                        feasible = False
+                        break
+                if not feasible:
+                    continue
+                sub_counts, sub_hits = solve(position + 1, tuple(updated))
+                if value:
+                    counts[1:] += sub_counts[:-1]
+                    hits[1:] += sub_hits[:-1]
+                    hits[1:, position] += sub_counts[:-1]
+                else:
+                    counts += sub_counts
+                    hits += sub_hits
+        memo[key] = counts, hits
+        return counts, hits
+
+    return solve(0, tuple(targets))
+
+
+def sample_component(size, positions, targets, samples, rng):
+    """
+    Funkcja szacująca wyniki składowej losowaniem: rozmieszczenie budowane jest pole po polu z losowym wyborem spośród
+    wartości zgodnych z ograniczeniami, a każda próbka ważona jest iloczynem liczby możliwych wyborów, co daje
+    nieobciążone oszacowanie liczby rozmieszczeń. Wszystkie próbki budowane są naraz - dla każdego pola wybór
+    wykonywany jest jedną operacją na macierzy brakujących min (próbki na ograniczenia).
+    :param size: liczba pól składowej
+    :param positions: dla każdego ograniczenia posortowane pozycje jego pól
+    :param targets: dla każdego ograniczenia liczba min wśród jego pól
+    :param samples: liczba losowań
+    :param rng: generator liczb pseudolosowych
+    :return: (oszacowane liczby rozmieszczeń [k], oszacowane liczby rozmieszczeń z miną w polu [k, pole])
+    """
+    checks = component_checks(size, positions)
+    # Macierze przechowywane są wierszami ograniczeń i pól, żeby wybór wierszy dla pola był ciągły w pamięci. Liczby
+    # brakujących min nie spadają poniżej zera ani nie przekraczają liczby pozostałych pól ograniczenia o więcej niż
+    # jedno, więc wystarczy sprawdzić, czy pole może być puste (nie brakuje więcej min niż pól dalej) i czy może być
+    # miną (w każdym ograniczeniu brakuje jakiejś miny). Próbki odrzucone mają wagę zero i nie wpływają na wynik.
+    needed = np.repeat(np.array(targets, dtype=np.int8)[:, None], samples, axis=1)
+    weights = np.ones(samples)
+    mines = np.zeros((size, samples), dtype=bool)
+    heads = np.unpackbits(np.frombuffer(rng.bytes(-(-size * samples // 8)), dtype=np.uint8),
+                          count=size * samples).reshape(size, samples).astype(bool)
+    for position in range(size):
+        constraints = [constraint for constraint, _ in checks[position]]
+        later = np.array([later for _, later in checks[position]], dtype=np.int8)[:, None]
+        current = needed[constraints]
+        allow_empty = (current <= later).all(axis=0)
+        allow_mine = current.min(axis=0) >= 1
+        weights *= allow_empty.astype(np.int8) + allow_mine
+        value = allow_mine & (heads[position] | ~allow_empty)
+        needed[constraints] -= value
+        mines[position] = value
+
+    counts = np.zeros(size + 1)
+    hits = np.zeros((size + 1, size))
+    totals = np.count_nonzero(mines, axis=0)
+    np.add.at(counts, totals, weights)
+    order = np.argsort(totals, kind="stable")
+    groups, starts = np.unique(totals[order], return_index=True)
+    hits[groups] = np.add.reduceat(mines[:, order] * weights[order], starts, axis=1).T
+    return counts / samples, hits / samples
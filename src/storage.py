@@ -0,0 +1,85 @@
+import struct
+import numpy as np
+import logic
+
+# Nagłówek zapisu: znacznik formatu, wersja, rozmiary planszy, liczba min i indeks sposobu rozmieszczenia min
+# w logic.placements
+header = struct.Struct("<4sBIIIB")
+magic = b"SAPR"
+version = 2
+
+
+class IncorrectSaveFile(Exception):
+    """
+    Wyjątek rzucany w momencie wczytywania danych, które nie są poprawnym zapisem gry.
+    """
+    pass
+
+
+def dumps(game):
+    """
+    Funkcja zapisująca pełny stan gry w zwartym formacie binarnym. Po nagłówku następują cztery płaszczyzny bitowe
+    spakowane po osiem pól na bajt: miny, odkryte pola oraz młodszy i starszy bit flagi (0 - brak, 1 - "Tu jest mina",
+    2 - "Tu może być mina"). Plansza 1000x1000 zajmuje około 500 KB. Jeśli miny nie zostały jeszcze rozmieszczone,
+    płaszczyzna min jest pusta, a po wczytaniu miny zostaną rozmieszczone przy pierwszym odkryciu pola.
+    :param game: zapisywana gra
+    :return: zapis gry
+    """
+    board = game.get_board()
+    n, m = game.get_size()
+    flags = board.get_flags_array()
+    planes = (board.get_mines_array(), board.get_revealed_array(), flags & 1, flags >> 1)
+    return header.pack(magic, version, n, m, game.get_mines(), logic.placements.index(game.get_placement())) + \
+        b"".join(np.packbits(plane, axis=None).tobytes() for plane in planes)
+
+
+def loads(data, screen=None, color=logic.white):
+    """
+    Funkcja odtwarzająca grę z zapisu. Płaszczyzny bitowe rozpakowywane są bezpośrednio do macierzy planszy, bez
+    tworzenia obiektów dla pojedynczych pól. Plansze większe niż 15x15 wczytywane są w trybie dużych plansz.
+    :param data: zapis gry
+    :param screen: ekran, na którym rysowana jest plansza
+    :param color: kolor pól
+    :return: wczytana gra
+    """
+    if len(data) < header.size:
+        raise IncorrectSaveFile
+    tag, file_version, n, m, mines, placement = header.unpack_from(data)
+    plane_size = -(-n * m // 8)
+    if tag != magic or file_version != version or len(data) != header.size + 4 * plane_size or \
+            placement >= len(logic.placements):
+        raise IncorrectSaveFile
+
+    packed = np.frombuffer(data, dtype=np.uint8, offset=header.size).reshape(4, plane_size)
+    mines_array, revealed, low, high = np.unpackbits(packed, axis=1, count=n * m).reshape(4, m, n)
+    if (low & high).any():
+        raise IncorrectSaveFile
+    placed = logic.placements[placement] == "random" or mines_array.any()
+    game = logic.Game(n, m, mines, screen, color, large=logic.size_condition(n, m),
+                      mines_array=mines_array.astype(bool) if placed else None, placement=logic.placements[placement])
+    if game.get_message() is not None:
+        raise IncorrectSaveFile
+    game.load_state(revealed.astype(bool), low | high << 1)
+    return game
+
+
+def save(game, path):
+    """
+    Funkcja zapisująca grę do pliku.
+    :param game: zapisywana gra
+    :param path: ścieżka pliku
+    """
+    with open(path, "wb") as file:
+        file.write(dumps(game))
+
+
+def load(path, screen=None, color=logic.white):
+    """
+    Funkcja wczytująca grę z pliku.
+    :param path: ścieżka pliku
+    :param screen: ekran, na którym rysowana jest plansza
+    :param color: kolor pól
+    :return: wczytana gra
+    """
+    with open(path, "rb") as file:
+        return loads(file.read(), screen, color)
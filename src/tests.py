@@ -1,7 +1,21 @@
+import itertools
+import os
+import subprocess
+import sys
+import time
 import unittest
 import numpy as np
+import pygame as pg
+import benchmarks
+import chunked
+import generator
+import instrumentation
 import logic
+import recording
 import interface
+import simulation
+import solver
+import storage
 
 
 class StartNewGame(unittest.TestCase):
@@ -282,5 +296,1228 @@ class ResetsInNewGame(unittest.TestCase):
                 self.assertEqual((255, 255, 255), game.get_field(i, j).get_color())
 
 
+class BoardArrays(unittest.TestCase):
+    def test_stateIsKeptInCompactArrays(self):
+        # given
+        n, m, mines = (8, 8, 12)
+        mines_array = logic.create_field_arrays(n, m, mines)
+
+        # when
+        board = logic.Board(n, m, mines_array)
+
+        # then
+        self.assertEqual(bool, mines_array.dtype)
+        self.assertEqual((m, n), mines_array.shape)
+        self.assertEqual(mines, np.count_nonzero(mines_array))
+        self.assertEqual((0, 0), board.get_flags_count())
+
+    def test_fieldIsViewOnBoard(self):
+        # given
+        game = logic.Game(8, 8, 12)
+        i, j = (np.random.randint(0, 8), np.random.randint(0, 8))
+
+        # when
+        game.get_field(i, j).right_click()
+
+        # then
+        self.assertEqual(1, game.get_board().get_flag(i, j))
+        self.assertEqual(game.get_board().is_mine(i, j), isinstance(game.get_field(i, j), interface.FieldWithMine))
+
+    def test_changeMinesColorAppliesToEveryMine(self):
+        # given
+        n, m, mines = (8, 8, 12)
+        game = logic.Game(n, m, mines)
+
+        # when
+        game.change_mines_color("red")
+
+        # then
+        for i in range(n):
+            for j in range(m):
+                field = game.get_field(i, j)
+                expected = "red" if isinstance(field, interface.FieldWithMine) else (255, 255, 255)
+                self.assertEqual(expected, field.get_color())
+
+    def test_resetMinesFlagKeepsOtherFlags(self):
+        # given
+        n, m, mines = (8, 8, 12)
+        game = logic.Game(n, m, mines)
+        for i in range(n):
+            for j in range(m):
+                game.get_field(i, j).right_click()
+
+        # when
+        game.reset_mines_flag()
+
+        # then
+        self.assertEqual((n * m - mines, 0), game.get_flags_count())
+
+
+def count_mines_nearby(n, m, mines_array, i, j):
+    """
+    Pierwotna, niewektorowa implementacja zliczania min dookoła pola - wzorzec dla testu równoważności.
+    """
+    return np.sum(np.array([[1 if mines_array[q][p] else 0
+                             for p in range(j - 1 if j > 0 else 0, j + 2 if j + 2 <= n else j + 1)]
+                            for q in range(i - 1 if i > 0 else 0, i + 2 if i + 2 <= m else i + 1)]))
+
+
+class BorderValues(unittest.TestCase):
+    def test_shouldMatchPerFieldCounting(self):
+        for n, m, mines in [(2, 2, 1), (8, 8, 12), (5, 11, 20), (15, 15, 225), (13, 7, 0)]:
+            # given
+            mines_array = logic.create_field_arrays(n, m, mines)
+
+            # when
+            values = logic.border_values(n, m, mines_array)
+
+            # then
+            expected = [[count_mines_nearby(n, m, mines_array, i, j) for j in range(n)] for i in range(m)]
+            self.assertEqual(np.uint8, values.dtype)
+            self.assertEqual(expected, values.tolist())
+
+    def test_shouldHandleBoardsBeyondGameLimits(self):
+        # given
+        mines_array = np.ones((300, 400), dtype=bool)
+
+        # when
+        values = logic.border_values(400, 300, mines_array)
+
+        # then
+        self.assertEqual(9, values[150][200])
+        self.assertEqual(4, values[0][0])
+        self.assertEqual(6, values[0][200])
+
+
+class MinesPlacement(unittest.TestCase):
+    def test_shouldPlaceExactNumberOfMinesForAnyDensity(self):
+        for mines in [0, 1, 112, 224, 225]:
+            # when
+            mines_array = logic.create_field_arrays(15, 15, mines)
+
+            # then
+            self.assertEqual(mines, np.count_nonzero(mines_array))
+
+    def test_everyLayoutShouldBeEquallyLikely(self):
+        # given
+        rng = np.random.default_rng(0)
+        counts = {}
+
+        # when
+        for _ in range(6000):
+            layout = tuple(np.flatnonzero(logic.create_field_arrays(2, 2, 2, rng)))
+            counts[layout] = counts.get(layout, 0) + 1
+
+        # then
+        self.assertEqual(6, len(counts))
+        for count in counts.values():
+            self.assertAlmostEqual(1000, count, delta=150)
+
+
+def reveal_recursively(n, m, values, revealed, i, j):
+    """
+    Pierwotne, rekurencyjne odkrywanie sąsiedztwa - wzorzec dla testu odkrywania obszaru.
+    """
+    for q in range(i - 1 if i > 0 else 0, i + 2 if i + 2 <= m else i + 1):
+        for p in range(j - 1 if j > 0 else 0, j + 2 if j + 2 <= n else j + 1):
+            if not revealed[q][p]:
+                revealed[q][p] = True
+                if values[q][p] == 0:
+                    reveal_recursively(n, m, values, revealed, q, p)
+
+
+class RevealArea(unittest.TestCase):
+    def test_shouldMatchRecursiveReveal(self):
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            # given
+            n, m = rng.integers(2, 26, size=2)
+            mines_array = logic.create_field_arrays(n, m, rng.integers(0, n * m // 4 + 1), rng)
+            board = logic.Board(n, m, mines_array)
+            values = logic.border_values(n, m, mines_array)
+            zeros = np.argwhere(values == 0)
+            if len(zeros) == 0:
+                continue
+            i, j = zeros[rng.integers(len(zeros))]
+
+            # when
+            rows, columns = board.reveal(i, j)
+
+            # then
+            expected = np.zeros((m, n), dtype=bool)
+            expected[i][j] = True
+            reveal_recursively(n, m, values, expected, i, j)
+            self.assertEqual(int(np.count_nonzero(expected)), len(rows))
+            self.assertTrue(np.all(expected[rows, columns]))
+
+    def test_shouldRevealMillionFieldsWithoutRecursion(self):
+        # given
+        board = logic.Board(1000, 1000, np.zeros((1000, 1000), dtype=bool))
+
+        # when
+        rows, _ = board.reveal(500, 500)
+
+        # then
+        self.assertEqual(1000 * 1000, len(rows))
+        self.assertEqual(1000 * 1000, board.count_revealed_safe())
+
+    def test_shouldReportOnlyNewlyRevealedFields(self):
+        # given
+        mines_array = np.zeros((8, 8), dtype=bool)
+        mines_array[:, 4] = True
+        board = logic.Board(8, 8, mines_array)
+        board.reveal(0, 0)
+
+        # when
+        rows, columns = board.reveal(7, 0)
+
+        # then
+        self.assertEqual(0, len(rows))
+        self.assertEqual(8 * 4, board.count_revealed_safe())
+
+
+class HitTest(unittest.TestCase):
+    def test_shouldAgreeWithFieldRectangles(self):
+        for n, m in [(8, 8), (15, 15), (7, 13), (2, 2)]:
+            # given
+            game = logic.Game(n, m, 0)
+
+            # when / then
+            for y in range(150, 555, 7):
+                for x in range(0, 395, 7):
+                    cell = game.hit_test((x, y))
+                    colliding = [(i, j) for i in range(m) for j in range(n)
+                                 if game.get_field(i, j).rect.collidepoint((x, y))]
+                    self.assertEqual(colliding[0] if colliding else None, cell)
+
+
+class BoardCounters(unittest.TestCase):
+    def test_countersShouldMatchBoardState(self):
+        # given
+        n, m, mines = (15, 15, 40)
+        rng = np.random.default_rng(2)
+        board = logic.Board(n, m, logic.create_field_arrays(n, m, mines, rng))
+
+        for step in range(600):
+            # when
+            i, j = rng.integers(0, m), rng.integers(0, n)
+            action = rng.integers(0, 10)
+            if action == 0:
+                board.reveal(i, j)
+            elif action == 1:
+                board.set_flag(i, j, rng.integers(0, 3))
+            elif action == 2 and step % 50 == 0:
+                board.reset_mines_flag()
+            else:
+                board.cycle_flag(i, j)
+
+            # then
+            cells = [(q, p) for q in range(m) for p in range(n)]
+            flags = [board.get_flag(q, p) for q, p in cells]
+            self.assertEqual((flags.count(1), flags.count(2)), board.get_flags_count())
+            self.assertEqual(sum(1 for q, p in cells if board.get_flag(q, p) == 1 and board.is_mine(q, p)),
+                             board.count_correct_flags())
+            self.assertEqual(sum(1 for q, p in cells if board.is_revealed(q, p) and not board.is_mine(q, p)),
+                             board.count_revealed_safe())
+            self.assertEqual(any(board.is_revealed(q, p) and board.is_mine(q, p) for q, p in cells),
+                             board.is_mine_revealed())
+
+
+class ChangedFields(unittest.TestCase):
+    def test_shouldReportChangedFieldsOnce(self):
+        # given
+        mines_array = np.zeros((8, 8), dtype=bool)
+        mines_array[:, 4] = True
+        board = logic.Board(8, 8, mines_array)
+
+        # when
+        board.cycle_flag(7, 7)
+        board.reveal(0, 0)
+        rows, columns = board.pop_changes()
+
+        # then
+        self.assertEqual({(7, 7)} | {(i, j) for i in range(8) for j in range(4)}, set(zip(rows, columns)))
+        self.assertEqual(0, len(board.pop_changes()[0]))
+
+    def test_mineColorChangeShouldMarkEveryMine(self):
+        # given
+        game = logic.Game(8, 8, 12)
+        game.get_board().pop_changes()
+
+        # when
+        game.change_mines_color("red")
+        rows, columns = game.get_board().pop_changes()
+
+        # then
+        self.assertEqual(12, len(set(zip(rows, columns))))
+        self.assertTrue(all(game.get_board().is_mine(i, j) for i, j in zip(rows, columns)))
+
+
+class BoardRendering(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+
+    def test_redrawingChangesShouldMatchFullRedraw(self):
+        # given
+        screen = pg.Surface((395, 590))
+        game = logic.Game(12, 12, 20, screen, (120, 60, 40))
+        game.display()
+        board = game.get_board()
+
+        # when
+        board.cycle_flag(0, 0)
+        board.cycle_flag(11, 11)
+        board.cycle_flag(11, 11)
+        for i in range(12):
+            if not board.is_mine(i, 5):
+                board.reveal(i, 5)
+        game.set_cheat()
+        game.display_changes()
+        incremental = pg.image.tobytes(screen, "RGB")
+        game.display()
+
+        # then
+        self.assertEqual(pg.image.tobytes(screen, "RGB"), incremental)
+
+    def test_tilesShouldBeRenderedOnce(self):
+        # given
+        atlas = interface.get_tile_atlas(25, 25)
+
+        # when
+        tile = atlas.get_tile((120, 60, 40), 3, True)
+
+        # then
+        self.assertIs(tile, atlas.get_tile((120, 60, 40), 3, True))
+        self.assertEqual((27, 27), tile.get_size())
+
+
+class HeadlessGame(unittest.TestCase):
+    def test_logicShouldNotImportPygame(self):
+        # when
+        result = subprocess.run([sys.executable, "-c", "import sys, logic; logic.Game(8, 8, 12).reveal(0, 0); "
+                                                       "print('pygame' in sys.modules)"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+                                check=True)
+
+        # then
+        self.assertEqual("False", result.stdout.strip())
+
+    def test_shouldWinByRevealingAllSafeFields(self):
+        # given
+        n, m, mines = (8, 8, 12)
+        game = logic.Game(n, m, mines)
+        board = game.get_board()
+
+        # when
+        for i in range(m):
+            for j in range(n):
+                if not board.is_mine(i, j):
+                    game.reveal(i, j)
+
+        # then
+        self.assertEqual(True, game.get_game_over())
+        self.assertEqual(3, game.get_message())
+
+    def test_shouldLoseByRevealingMine(self):
+        # given
+        game = logic.Game(8, 8, 12)
+        i, j = np.argwhere([[game.get_board().is_mine(q, p) for p in range(8)] for q in range(8)])[0]
+
+        # when
+        game.reveal(i, j)
+
+        # then
+        self.assertEqual(True, game.get_game_over())
+        self.assertEqual(2, game.get_message())
+
+    def test_toggleFlagShouldCycleFlagStates(self):
+        # given
+        game = logic.Game(8, 8, 12)
+
+        # when
+        states = [game.toggle_flag(3, 3) for _ in range(3)]
+
+        # then
+        self.assertEqual([1, 2, 0], states)
+
+
+class Simulation(unittest.TestCase):
+    def test_playShouldFinishGame(self):
+        # given
+        rng = np.random.default_rng(3)
+        game = logic.Game(8, 8, 12, rng=rng)
+
+        # when
+        won, clicks, revealed = simulation.play(game, simulation.random_strategy, rng)
+
+        # then
+        self.assertEqual(True, game.get_game_over())
+        self.assertEqual(revealed == 8 * 8 - 12, won)
+        self.assertGreaterEqual(revealed, clicks - 1)
+
+    def test_statisticsShouldAggregateGames(self):
+        # given
+        rng = np.random.default_rng(4)
+
+        # when
+        first = simulation.simulate(8, 8, 1, 50, simulation.random_strategy, rng)
+        second = simulation.simulate(8, 8, 1, 30, simulation.random_strategy, rng)
+        first.merge(second)
+
+        # then
+        self.assertEqual(80, first.get_games())
+        self.assertGreater(first.get_wins(), 0)
+        self.assertGreaterEqual(first.get_clicks(), 80)
+
+    def test_parallelRunShouldNotDependOnWorkerCount(self):
+        # when
+        results = []
+        for workers, chunk in [(1, 1000), (3, 2000)]:
+            statistics = list(simulation.simulate_parallel(8, 8, 12, 4500, simulation.random_strategy, 11, workers,
+                                                           chunk))[-1]
+            results.append((statistics.get_games(), statistics.get_wins(), statistics.get_clicks(),
+                            statistics.get_revealed()))
+
+        # then
+        self.assertEqual(4500, results[0][0])
+        self.assertEqual(results[0], results[1])
+
+    def test_probabilityStrategyShouldBeReproducible(self):
+        # when
+        results = []
+        for _ in range(2):
+            statistics = simulation.simulate(15, 15, 45, 60, simulation.probability_strategy,
+                                             np.random.default_rng(5))
+            results.append((statistics.get_wins(), statistics.get_clicks(), statistics.get_revealed()))
+
+        # then
+        self.assertEqual(results[0], results[1])
+
+    def test_batchedRandomStrategyShouldMatchPlayedGames(self):
+        # when
+        played = simulation.simulate(5, 5, 2, 4000, simulation.random_strategy, np.random.default_rng(6))
+        batched = simulation.simulate(5, 5, 2, 40000, simulation.random_strategy, np.random.default_rng(7), True)
+
+        # then
+        self.assertEqual(40000, batched.get_games())
+        self.assertAlmostEqual(played.get_wins() / 4000, batched.get_wins() / 40000, delta=0.04)
+        self.assertAlmostEqual(played.get_clicks() / 4000, batched.get_clicks() / 40000, delta=0.15)
+        self.assertAlmostEqual(played.get_revealed() / 4000, batched.get_revealed() / 40000, delta=0.5)
+
+    def test_batchedGamesShouldHandleEmptyAndFullBoards(self):
+        # when
+        empty = simulation.play_random_batch(4, 3, 0, 10, np.random.default_rng(8))
+        full = simulation.play_random_batch(4, 3, 12, 10, np.random.default_rng(8))
+
+        # then
+        self.assertEqual([True] * 10, empty[0].tolist())
+        self.assertEqual([1] * 10, empty[1].tolist())
+        self.assertEqual([12] * 10, empty[2].tolist())
+        self.assertEqual([False] * 10, full[0].tolist())
+        self.assertEqual([1] * 10, full[1].tolist())
+        self.assertEqual([0] * 10, full[2].tolist())
+
+    def test_batchedRunShouldRejectOtherStrategies(self):
+        # then
+        with self.assertRaises(ValueError):
+            simulation.simulate(8, 8, 12, 10, simulation.solver_strategy, np.random.default_rng(9), True)
+
+    def test_sameSeedShouldGiveSameBoard(self):
+        # when
+        first = logic.create_field_arrays(15, 15, 40, 123)
+        second = logic.create_field_arrays(15, 15, 40, 123)
+
+        # then
+        self.assertTrue(np.array_equal(first, second))
+
+    def test_shouldRejectIncorrectBoard(self):
+        with self.assertRaises(SystemExit):
+            simulation.main(["-n", "20", "--games", "1"])
+
+
+class ConstraintSolver(unittest.TestCase):
+    def test_shouldSolveOneTwoOnePattern(self):
+        # given
+        mines_array = np.array([[True, False, True], [False, False, False]])
+        board = logic.Board(3, 2, mines_array)
+        for j in range(3):
+            board.reveal(1, j)
+
+        # when
+        board_solver = solver.Solver(board)
+
+        # then
+        self.assertEqual({(0, 1)}, board_solver.get_safe())
+        self.assertEqual({(0, 0), (0, 2)}, board_solver.get_mines())
+
+    def test_deductionsShouldBeCorrectAndMatchFreshSolver(self):
+        rng = np.random.default_rng(6)
+        for _ in range(20):
+            # given
+            board = logic.Board(30, 16, logic.create_field_arrays(30, 16, 99, rng))
+            board_solver = solver.Solver(board)
+
+            while not board.is_mine_revealed() and board.count_revealed_safe() < 30 * 16 - 99:
+                # when
+                safe = board_solver.get_safe()
+                if safe:
+                    cell = min(safe)
+                else:
+                    hidden = np.argwhere(~board.get_revealed_array())
+                    cell = tuple(hidden[rng.integers(len(hidden))])
+                board_solver.update(board.reveal(*cell))
+
+                # then
+                self.assertFalse(any(board.is_mine(*cell) for cell in board_solver.get_safe()))
+                self.assertTrue(all(board.is_mine(*cell) for cell in board_solver.get_mines()))
+
+            fresh_solver = solver.Solver(board)
+            self.assertEqual(fresh_solver.get_safe(), board_solver.get_safe())
+            self.assertEqual(fresh_solver.get_mines(), board_solver.get_mines())
+
+
+class MineProbabilities(unittest.TestCase):
+    @staticmethod
+    def enumerate_layouts(board, mines):
+        """
+        Funkcja wyznaczająca prawdopodobieństwa min przez przejrzenie wszystkich rozmieszczeń min zgodnych z planszą.
+        """
+        n, m = board.get_size()
+        revealed = board.get_revealed_array()
+        hidden = [tuple(cell) for cell in np.argwhere(~revealed)]
+        total = np.zeros((m, n))
+        layouts = 0
+        for chosen in itertools.combinations(hidden, mines):
+            mines_array = np.zeros((m, n), dtype=bool)
+            mines_array[tuple(np.transpose(chosen))] = True
+            if np.array_equal(logic.border_values(n, m, mines_array)[revealed], board.get_border_values()[revealed]):
+                total += mines_array
+                layouts += 1
+        return total / layouts
+
+    def test_shouldMatchEnumerationOfAllLayouts(self):
+        rng = np.random.default_rng(3)
+        for _ in range(10):
+            # given
+            board = logic.Board(5, 4, logic.create_field_arrays(5, 4, 4, rng))
+            safe = np.argwhere(~np.array([[board.is_mine(i, j) for j in range(5)] for i in range(4)]))
+            for i, j in safe[rng.choice(len(safe), 3, replace=False)]:
+                board.reveal(i, j)
+
+            # when
+            probabilities = solver.ProbabilityEngine().probabilities(board, 4)
+
+            # then
+            np.testing.assert_allclose(probabilities, self.enumerate_layouts(board, 4), atol=1e-12)
+
+    def test_samplingShouldApproximateExactProbabilities(self):
+        # given
+        board = logic.Board(6, 5, logic.create_field_arrays(6, 5, 6, 4))
+        safe = np.argwhere(~np.array([[board.is_mine(i, j) for j in range(6)] for i in range(5)]))
+        for i, j in safe[:4]:
+            board.reveal(i, j)
+
+        # when
+        exact = solver.ProbabilityEngine().probabilities(board, 6)
+        sampled = solver.ProbabilityEngine(max_component=0, samples=20000, rng=5).probabilities(board, 6)
+
+        # then
+        np.testing.assert_allclose(sampled, exact, atol=0.03)
+
+    def test_shouldAgreeWithSolverAndMineCountOnExpertBoard(self):
+        # given
+        board = logic.Board(30, 16, logic.create_field_arrays(30, 16, 99, 8))
+        board_solver = solver.Solver(board)
+        engine = solver.ProbabilityEngine()
+        hidden = np.argwhere(~np.array([[board.is_mine(i, j) for j in range(30)] for i in range(16)]))
+        for i, j in hidden[::40]:
+            board_solver.update(board.reveal(i, j))
+
+        # when
+        probabilities = engine.probabilities(board, 99, board_solver)
+
+        # then
+        self.assertAlmostEqual(99, probabilities[~board.get_revealed_array()].sum())
+        self.assertTrue(all(probabilities[cell] == 0 for cell in board_solver.get_safe()))
+        self.assertTrue(all(probabilities[cell] == 1 for cell in board_solver.get_mines()))
+        self.assertTrue(np.all((probabilities >= 0) & (probabilities <= 1)))
+
+
+class Benchmarks(unittest.TestCase):
+    def test_shouldMeasureSelectedBenchmarksForAllowedSizes(self):
+        # given
+        names = ["border_values", "check_win_condition"]
+
+        # when
+        results = benchmarks.run([(8, 8), (1001, 2)], [0.1, 0.2], names, repeat=1)
+
+        # then
+        measured = [(result["benchmark"], result["n"], result["density"]) for result in results]
+        self.assertEqual([("border_values", 8, 0.1), ("border_values", 8, 0.2), ("border_values", 1001, 0.1),
+                          ("border_values", 1001, 0.2), ("check_win_condition", 8, 0.1),
+                          ("check_win_condition", 8, 0.2)], measured)
+        self.assertTrue(all(0 < result["min_ms"] <= result["median_ms"] for result in results))
+
+    def test_shouldReportOnlySlowerBenchmarks(self):
+        # given
+        previous = [{"benchmark": "display", "n": 8, "m": 8, "density": 0.1, "median_ms": 1.0},
+                    {"benchmark": "display", "n": 15, "m": 15, "density": 0.1, "median_ms": 2.0}]
+        current = [{"benchmark": "display", "n": 8, "m": 8, "density": 0.1, "median_ms": 1.2},
+                   {"benchmark": "display", "n": 15, "m": 15, "density": 0.1, "median_ms": 3.0},
+                   {"benchmark": "display", "n": 30, "m": 16, "density": 0.1, "median_ms": 9.0}]
+
+        # when
+        regressions = benchmarks.compare(previous, current)
+
+        # then
+        self.assertEqual([(current[1], 2.0, 3.0)], regressions)
+
+
+class FrameInstrumentation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+
+    def test_histogramShouldCountValuesInBuckets(self):
+        # given
+        histogram = instrumentation.Histogram([1, 10, 100])
+
+        # when
+        for value in [0.5, 1, 2, 5, 50, 500]:
+            histogram.add(value)
+
+        # then
+        self.assertEqual([2, 2, 1, 1], histogram.to_dict()["counts"])
+        self.assertEqual(10, histogram.percentile(0.5))
+        self.assertEqual(500, histogram.percentile(1))
+        self.assertEqual(500, histogram.get_max())
+
+    def test_shouldRecordRedrawsAndDrawnFields(self):
+        # given
+        game = logic.Game(6, 6, 4, pg.Surface((395, 590)))
+        stats = instrumentation.FrameStats()
+
+        # when
+        stats.start_frame()
+        stats.render(game.display, game, True)
+        stats.end_frame()
+        stats.start_frame()
+        game.toggle_flag(0, 0)
+        stats.render(game.display_changes, game)
+        stats.end_frame()
+
+        # then
+        self.assertEqual(1, stats.get_full_redraws())
+        self.assertEqual(1, stats.get_partial_redraws())
+        self.assertEqual(36, stats.get_histogram("fields").get_max())
+        self.assertEqual(2, stats.get_histogram("render_ms").get_count())
+        self.assertEqual(1, stats.get_histogram("interval_ms").get_count())
+
+    def test_disabledStatsShouldOnlyDraw(self):
+        # given
+        game = logic.Game(6, 6, 4, pg.Surface((395, 590)))
+        stats = instrumentation.FrameStats(False)
+
+        # when
+        stats.start_frame()
+        stats.render(game.display, game, True)
+        stats.end_frame()
+
+        # then
+        self.assertEqual(36, game.get_surface().pop_drawn_count())
+        self.assertEqual(0, stats.to_dict()["frames"])
+
+
+class LargeBoard(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+
+    def test_largeBoardsShouldBeAllowedOnlyInLargeMode(self):
+        # when
+        normal = logic.Game(100, 100, 10)
+        large = logic.Game(100, 100, 10, large=True)
+        too_large = logic.Game(1001, 2, 1, large=True)
+
+        # then
+        self.assertEqual(0, normal.get_message())
+        self.assertIsNone(large.get_message())
+        self.assertEqual(0, too_large.get_message())
+
+    def test_hitTestShouldAgreeWithCellRectanglesAfterScrollAndZoom(self):
+        # given
+        viewport = logic.Viewport(200, 120)
+        viewport.scroll(1234, 567)
+        viewport.zoom(3, (100, 300))
+        top, bottom, left, right = viewport.visible_range()
+
+        for y in range(150, 555, 5):
+            for x in range(0, 395, 5):
+                # when
+                cell = viewport.hit_test((x, y))
+
+                # then
+                if cell is not None:
+                    self.assertTrue(pg.Rect(viewport.cell_rect(*cell)).collidepoint((x, y)))
+                    self.assertTrue(top <= cell[0] < bottom and left <= cell[1] < right)
+                else:
+                    x0, y0, w, h = viewport.get_rect()
+                    self.assertFalse(x0 <= x < x0 + w and y0 <= y < y0 + h)
+
+    def test_scrolledBoardShouldMatchFullRedraw(self):
+        # given
+        screen = pg.Surface((395, 590))
+        game = logic.Game(60, 40, 300, screen, (120, 60, 40), rng=4, large=True)
+        game.display()
+
+        # when
+        game.scroll(333, 111)
+        game.toggle_flag(10, 30)
+        game.display_changes()
+        game.zoom(-1)
+        game.display_changes()
+        incremental = pg.image.tobytes(screen, "RGB")
+        game.display()
+
+        # then
+        self.assertEqual(pg.image.tobytes(screen, "RGB"), incremental)
+
+    def test_shouldDrawOnlyVisibleFields(self):
+        # given
+        game = logic.Game(1000, 1000, 150000, pg.Surface((395, 590)), rng=5, large=True)
+        top, bottom, left, right = game.get_viewport().visible_range()
+
+        # when
+        game.display()
+        game.get_board().reveal_area(999, 999)
+        rects = game.display_changes()
+
+        # then
+        self.assertEqual((bottom - top) * (right - left), game.get_surface().pop_drawn_count())
+        self.assertEqual([], rects)
+
+
+class ChunkedBoard(unittest.TestCase):
+    def test_shouldMatchBoardBuiltFromWholeWindow(self):
+        # given
+        board = chunked.ChunkedBoard(150, 130, 0.08, seed=3, size=16, limit=4)
+        mines, values, _, _ = board.get_window(0, 130, 0, 150)
+        full = logic.Board(150, 130, mines.copy())
+        zeros = np.argwhere(values == 0)
+
+        for k in range(20):
+            i, j = zeros[k * 37 % len(zeros)]
+
+            # when
+            rows, _ = board.reveal(i, j)
+
+            # then
+            self.assertEqual(len(full.reveal(i, j)[0]), len(rows))
+        self.assertTrue(np.array_equal(logic.border_values(150, 130, mines), values))
+        self.assertTrue(np.array_equal(full.get_revealed_array(), board.get_window(0, 130, 0, 150)[2]))
+        self.assertEqual(full.count_revealed_safe(), board.count_revealed_safe())
+        self.assertEqual(4, board.count_cached_chunks())
+
+    def test_chunkShouldBeRegeneratedFromSeed(self):
+        # given
+        board = chunked.ChunkedBoard(100, 100, 0.2, seed=7, size=10, limit=1)
+        first = board.get_chunk_mines(3, 4).copy()
+
+        # when
+        board.get_chunk_mines(0, 0)
+        again = board.get_chunk_mines(3, 4)
+
+        # then
+        self.assertTrue(np.array_equal(first, again))
+        fresh = chunked.ChunkedBoard(100, 100, 0.2, seed=7, size=10)
+        self.assertTrue(np.array_equal(first, fresh.get_chunk_mines(3, 4)))
+        self.assertEqual(1, board.count_cached_chunks())
+
+    def test_untouchedChunksShouldCostNothing(self):
+        # given
+        board = chunked.ChunkedBoard(100000, 100000, 0.15, seed=1)
+
+        # when
+        board.cycle_flag(99999, 99999)
+        board.reveal(0, 0)
+
+        # then
+        self.assertEqual(1, board.get_flag(99999, 99999))
+        self.assertEqual(2, board.count_touched_chunks())
+        self.assertLessEqual(board.count_cached_chunks(), 9)
+
+
+class SaveLoad(unittest.TestCase):
+    def test_explicitLayoutShouldBeUsed(self):
+        # given
+        mines_array = np.zeros((5, 4), dtype=bool)
+        mines_array[2, 3] = True
+
+        # when
+        game = logic.Game(4, 5, 1, mines_array=mines_array)
+        wrong_count = logic.Game(4, 5, 2, mines_array=mines_array)
+        wrong_shape = logic.Game(5, 4, 1, mines_array=mines_array)
+
+        # then
+        self.assertTrue(np.array_equal(mines_array, game.get_board().get_mines_array()))
+        self.assertEqual(1, wrong_count.get_message())
+        self.assertEqual(0, wrong_shape.get_message())
+
+    def test_loadedGameShouldMatchSavedGame(self):
+        # given
+        game = logic.Game(1000, 1000, 150000, rng=6, large=True)
+        board = game.get_board()
+        hidden = np.argwhere(board.get_border_values() != 0)
+        game.reveal(*np.argwhere(board.get_border_values() == 0)[0])
+        game.toggle_flag(*hidden[-1])
+        game.toggle_flag(*hidden[-2])
+        game.toggle_flag(*hidden[-2])
+
+        # when
+        data = storage.dumps(game)
+        loaded = storage.loads(data)
+
+        # then
+        self.assertLess(len(data), 1000 * 1000 // 2 + 100)
+        for getter in ("get_mines_array", "get_revealed_array", "get_flags_array", "get_border_values"):
+            self.assertTrue(np.array_equal(getattr(board, getter)(), getattr(loaded.get_board(), getter)()))
+        self.assertEqual((1, 1), loaded.get_flags_count())
+        self.assertEqual(board.count_revealed_safe(), loaded.get_board().count_revealed_safe())
+
+    def test_loadingFinishedGameShouldRestoreGameOver(self):
+        # given
+        game = logic.Game(6, 6, 4, rng=7)
+        game.reveal(*np.argwhere(game.get_board().get_mines_array())[0])
+
+        # when
+        loaded = storage.loads(storage.dumps(game))
+
+        # then
+        self.assertTrue(loaded.get_game_over())
+        self.assertEqual(2, loaded.get_message())
+
+    def test_shouldRejectDamagedData(self):
+        data = storage.dumps(logic.Game(6, 6, 4, rng=8))
+        self.assertRaises(storage.IncorrectSaveFile, storage.loads, data[:-1])
+        self.assertRaises(storage.IncorrectSaveFile, storage.loads, b"XXXX" + data[4:])
+
+
+class Recording(unittest.TestCase):
+    def test_replayShouldReproduceRecordedGame(self):
+        # given
+        recorder = recording.Recorder()
+        rng = np.random.default_rng(9)
+        seed = recording.random_seed()
+        game = logic.Game(15, 12, 20, rng=seed)
+        recorder.new_game(15, 12, 20, seed)
+        game.set_recorder(recorder)
+        for _ in range(30):
+            i, j = rng.integers(12), rng.integers(15)
+            if rng.random() < 0.3:
+                game.toggle_flag(i, j)
+            else:
+                game.reveal(i, j)
+        game.set_cheat()
+
+        # when
+        replayed, events = recording.replay(recorder.to_bytes())
+
+        # then
+        self.assertEqual(32, events)
+        self.assertEqual(events, recorder.count_events())
+        self.assertEqual(storage.dumps(game), storage.dumps(replayed))
+        self.assertEqual(game.get_message(), replayed.get_message())
+
+    def test_disabledRecorderShouldNotRecord(self):
+        # given
+        recorder = recording.Recorder(False)
+        game = logic.Game(6, 6, 4)
+        game.set_recorder(recorder)
+
+        # when
+        game.toggle_flag(0, 0)
+
+        # then
+        self.assertEqual(0, recorder.count_events())
+        self.assertEqual((None, 0), recording.replay(recorder.to_bytes()))
+
+    def test_shouldRejectDamagedRecording(self):
+        recorder = recording.Recorder()
+        recorder.new_game(6, 6, 4, 1)
+        recorder.reveal(0, 0)
+        self.assertRaises(recording.IncorrectRecording, recording.replay, recorder.to_bytes()[:-1])
+        self.assertRaises(recording.IncorrectRecording, recording.replay, recorder.to_bytes()[:5] + b"\x09")
+
+
+class IdleMainLoop(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+
+    def test_waitShouldReturnQueuedEventsOrNothingAfterTimeout(self):
+        # given
+        pg.event.clear()
+        pg.event.post(pg.event.Event(pg.MOUSEMOTION, pos=(1, 2)))
+        pg.event.post(pg.event.Event(pg.MOUSEMOTION, pos=(3, 4)))
+
+        # when
+        events = interface.wait_events(10)
+        timed_out = interface.wait_events(10)
+
+        # then
+        self.assertEqual([(1, 2), (3, 4)], [event.pos for event in events])
+        self.assertEqual([], timed_out)
+
+    def test_hoverShouldRedrawButtonOnlyWhenHighlightChanges(self):
+        # given
+        screen = pg.Surface((395, 590))
+        display = interface.Interface(screen, interface.get_font(24), logic.Game(6, 6, 4, screen), (200, 200, 200))
+        display.display_button((0, 0))
+
+        # when
+        outside = display.hover((10, 300))
+        entered = display.hover((300, 50))
+        inside = display.hover((340, 60))
+        left = display.hover((10, 10))
+
+        # then
+        self.assertEqual([], outside)
+        self.assertEqual(1, len(entered))
+        self.assertEqual([], inside)
+        self.assertEqual(entered, left)
+
+
+class EventCoalescing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.init()
+
+    def test_shouldKeepLastMotionAndSumWheel(self):
+        # given
+        events = [pg.event.Event(pg.MOUSEMOTION, pos=(1, 1)), pg.event.Event(pg.MOUSEWHEEL, x=0, y=1),
+                  pg.event.Event(pg.MOUSEWHEEL, x=1, y=2), pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(5, 5), button=1),
+                  pg.event.Event(pg.MOUSEMOTION, pos=(2, 2)), pg.event.Event(pg.MOUSEWHEEL, x=0, y=-1)]
+
+        # when
+        coalesced = interface.coalesce_events(events)
+
+        # then
+        self.assertEqual([pg.MOUSEWHEEL, pg.MOUSEBUTTONDOWN, pg.MOUSEMOTION, pg.MOUSEWHEEL],
+                         [event.type for event in coalesced])
+        self.assertEqual((1, 3), (coalesced[0].x, coalesced[0].y))
+        self.assertEqual((2, 2), coalesced[2].pos)
+
+    def test_textBoxShouldRenderEditsOnceWhenDrawn(self):
+        # given
+        box = interface.TextBox(5, 23, 45, 25, interface.get_font(24))
+        box.event_handler(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(10, 30), button=1))
+        for key, text in ((pg.K_1, "1"), (pg.K_2, "2"), (pg.K_BACKSPACE, ""), (pg.K_5, "5")):
+            box.event_handler(pg.event.Event(pg.KEYDOWN, key=key, unicode=text))
+        screen = pg.Surface((100, 100))
+
+        # when
+        box.draw(screen)
+
+        # then
+        self.assertEqual(15, box.get_value())
+
+    def test_statsShouldCountMergedEvents(self):
+        # given
+        stats = instrumentation.FrameStats()
+
+        # when
+        stats.count_events(10, 4)
+        stats.count_events(3, 3)
+
+        # then
+        self.assertEqual(6, stats.get_merged_events())
+        self.assertEqual(13, stats.to_dict()["events"])
+
+
+class NoGuessGenerator(unittest.TestCase):
+    @staticmethod
+    def solvable_by_solver(mines_array, first):
+        """
+        Sprawdzenie niezależne od generatora: gra odkrywająca jedynie pola wskazane przez solver.Solver oraz
+        wynikające z łącznej liczby min.
+        """
+        m, n = mines_array.shape
+        board = logic.Board(n, m, mines_array.copy())
+        board_solver = solver.Solver(board)
+        board_solver.update(board.reveal(*first))
+        mines = int(mines_array.sum())
+        while board.count_revealed_safe() < n * m - mines:
+            safe = board_solver.get_safe()
+            if not safe and len(board_solver.get_mines()) == mines:
+                safe = {tuple(cell) for cell in np.argwhere(~board.get_revealed_array() & ~mines_array)}
+            if not safe:
+                return False
+            for cell in safe:
+                board_solver.update(board.reveal(*cell))
+        return not board.is_mine_revealed()
+
+    def test_generatedBoardsShouldBeSolvableWithoutGuessing(self):
+        # given
+        rng = np.random.default_rng(10)
+
+        # when
+        boards = generator.generate(100, 16, 16, 40, (3, 12), rng)
+
+        # then
+        revealed, flagged = generator.solve(boards, (3, 12))
+        self.assertEqual((100, 16, 16), boards.shape)
+        self.assertTrue(np.all(boards.sum(axis=(1, 2)) == 40))
+        self.assertFalse(boards[:, 2:5, 11:14].any())
+        self.assertTrue(np.array_equal(~boards, revealed))
+        self.assertTrue(np.array_equal(boards, flagged))
+        self.assertTrue(all(self.solvable_by_solver(board, (3, 12)) for board in boards))
+
+    def test_singleBoardShouldBeGenerated(self):
+        # when
+        board = generator.create_no_guess_arrays(9, 9, 3, (4, 4), 0)
+
+        # then
+        self.assertEqual(3, int(board.sum()))
+        self.assertTrue(self.solvable_by_solver(board, (4, 4)))
+
+    def test_deductionShouldNeverRevealMineOrFlagSafeField(self):
+        # given
+        excluded = np.zeros((16, 16), dtype=bool)
+        excluded[7:10, 7:10] = True
+        layouts = generator.random_layouts(500, 16, 16, 60, excluded, np.random.default_rng(11))
+
+        # when
+        revealed, flagged = generator.solve(layouts, (8, 8))
+
+        # then
+        self.assertFalse((revealed & layouts).any())
+        self.assertFalse((flagged & ~layouts).any())
+
+    def test_solveShouldStopAtFiftyFiftyGuess(self):
+        # given
+        mines_array = np.zeros((4, 4), dtype=bool)
+        mines_array[3, 3] = True
+
+        # when
+        revealed, flagged = generator.solve(mines_array[None], (0, 0))
+
+        # then
+        self.assertEqual(16 - 1, int(revealed.sum()))
+        self.assertTrue(flagged[0, 3, 3])
+
+        # given
+        mines_array = np.zeros((2, 4), dtype=bool)
+        mines_array[0, 3] = True
+
+        # when
+        revealed, _ = generator.solve(mines_array[None], (0, 0))
+
+        # then
+        self.assertFalse(revealed[0, 0, 3] or revealed[0, 1, 3])
+
+    def test_shouldFailWhenBoardCannotBeGenerated(self):
+        self.assertRaises(generator.GenerationFailed, generator.generate, 1, 4, 4, 16, (0, 0))
+        self.assertRaises(generator.GenerationFailed, generator.generate, 1, 2, 2, 1, (0, 0), 12)
+
+
+class FirstClickPlacement(unittest.TestCase):
+    def test_firstRevealShouldNeverHitMine(self):
+        rng = np.random.default_rng(13)
+        for placement, n, m, mines in [("safe", 6, 6, 35), ("area", 9, 9, 30), ("no_guess", 9, 9, 10)]:
+            for seed in range(20):
+                # given
+                game = logic.Game(n, m, mines, rng=seed, placement=placement)
+                i, j = rng.integers(m), rng.integers(n)
+                self.assertFalse(game.get_board().is_placed())
+
+                # when
+                game.reveal(i, j)
+
+                # then
+                mines_array = game.get_board().get_mines_array()
+                self.assertEqual(mines, np.count_nonzero(mines_array))
+                self.assertFalse(game.get_game_over() and game.get_message() == 2)
+                if placement != "safe":
+                    self.assertFalse(mines_array[max(i - 1, 0):i + 2, max(j - 1, 0):j + 2].any())
+
+    def test_remainingFieldsShouldBeEquallyLikely(self):
+        # given
+        rng = np.random.default_rng(14)
+        excluded = logic.first_click_exclusion(2, 2, 2, 0, 0)
+        counts = {}
+
+        # when
+        for _ in range(6000):
+            layout = tuple(np.flatnonzero(logic.create_field_arrays(2, 2, 2, rng, excluded)))
+            counts[layout] = counts.get(layout, 0) + 1
+
+        # then
+        self.assertEqual([[True, False], [False, False]], excluded.tolist())
+        self.assertEqual({(1, 2), (1, 3), (2, 3)}, set(counts))
+        for count in counts.values():
+            self.assertAlmostEqual(2000, count, delta=200)
+
+    def test_flagsBeforePlacementShouldBeCounted(self):
+        # given
+        reference = logic.Game(8, 8, 10, rng=15, placement="area")
+        reference.reveal(4, 4)
+        mines = np.argwhere(reference.get_board().get_mines_array())
+        game = logic.Game(8, 8, 10, rng=15, placement="area")
+        for cell in mines:
+            game.toggle_flag(*cell)
+        game.toggle_flag(4, 4)
+
+        # when
+        game.reveal(4, 4)
+
+        # then
+        self.assertTrue(np.array_equal(reference.get_board().get_mines_array(), game.get_board().get_mines_array()))
+        self.assertEqual((10, 0), game.get_flags_count())
+        self.assertTrue(game.get_game_over())
+        self.assertEqual(3, game.get_message())
+
+    def test_denseNoGuessBoardShouldFallBackQuickly(self):
+        for mines in [49, 120, 200]:
+            # given
+            game = logic.Game(15, 15, mines, rng=20, placement="no_guess")
+            start = time.perf_counter()
+
+            # when
+            game.reveal(7, 7)
+
+            # then
+            self.assertLess(time.perf_counter() - start, 0.25)
+            self.assertFalse(game.get_board().get_mines_array()[6:9, 6:9].any())
+        self.assertRaises(generator.GenerationFailed, generator.generate, 1, 15, 15, 120, (7, 7), 0, passes=1)
+
+    def test_unknownPlacementShouldBeRejected(self):
+        self.assertRaises(ValueError, logic.Game, 6, 6, 4, placement="first")
+
+    def test_unplacedGameShouldBeSavedAndReplayed(self):
+        # given
+        game = logic.Game(9, 9, 10, rng=16, placement="no_guess")
+        game.toggle_flag(0, 0)
+        recorder = recording.Recorder()
+        recorder.new_game(9, 9, 10, 17, placement="area")
+        recorder.reveal(3, 3)
+
+        # when
+        loaded = storage.loads(storage.dumps(game))
+        replayed, _ = recording.replay(recorder.to_bytes())
+
+        # then
+        self.assertFalse(loaded.get_board().is_placed())
+        self.assertEqual("no_guess", loaded.get_placement())
+        self.assertEqual((1, 0), loaded.get_flags_count())
+        self.assertFalse(replayed.get_board().get_mines_array()[2:5, 2:5].any())
+
+
+class Chording(unittest.TestCase):
+    def test_revealManyShouldMatchSequentialReveals(self):
+        for n, m, mines, count in [(200, 150, 3000, 300), (12, 12, 20, 10)]:
+            # given
+            rng = np.random.default_rng(18)
+            mines_array = logic.create_field_arrays(n, m, mines, rng)
+            safe = np.argwhere(~mines_array)
+            cells = safe[rng.choice(len(safe), count)]
+            batched = logic.Game(n, m, mines, large=True, mines_array=mines_array)
+            sequential = logic.Game(n, m, mines, large=True, mines_array=mines_array)
+            batched.get_board().pop_changes()
+
+            # when
+            rows, columns = batched.reveal_many((cells[:, 0], cells[:, 1]))
+            for cell in cells:
+                sequential.reveal(*cell)
+
+            # then
+            board = batched.get_board()
+            self.assertTrue(np.array_equal(sequential.get_board().get_revealed_array(), board.get_revealed_array()))
+            self.assertEqual(sequential.get_board().count_revealed_safe(), board.count_revealed_safe())
+            self.assertEqual(len(rows), len(set(zip(rows, columns))))
+            self.assertEqual(set(zip(*np.nonzero(board.get_revealed_array()))), set(zip(*board.pop_changes())))
+            self.assertEqual(0, len(batched.reveal_many((cells[:, 0], cells[:, 1]))[0]))
+
+    def test_revealManyShouldRejectCellsOutsideBoard(self):
+        # given
+        recorder = recording.Recorder()
+        game = logic.Game(6, 5, 3, rng=21)
+        game.set_recorder(recorder)
+
+        # when
+        for cells in [([0, -1], [0, 0]), ([0], [6]), ([5], [0])]:
+            self.assertRaises(IndexError, game.reveal_many, cells)
+
+        # then
+        self.assertFalse(game.get_board().get_revealed_array().any())
+        self.assertEqual(0, recorder.count_events())
+
+    def test_revealManyShouldEndGameOnce(self):
+        # given
+        mines_array = np.zeros((5, 5), dtype=bool)
+        mines_array[4, 4] = True
+        lost = logic.Game(5, 5, 1, mines_array=mines_array)
+        won = logic.Game(5, 5, 1, mines_array=mines_array)
+
+        # when
+        lost.reveal_many(([0, 4], [0, 4]))
+        won.reveal_many(np.nonzero(~mines_array))
+
+        # then
+        self.assertEqual(2, lost.get_message())
+        self.assertEqual(24, lost.get_board().count_revealed_safe())
+        self.assertEqual(3, won.get_message())
+
+    def test_chordShouldRevealNeighboursOnlyWhenFlagsMatch(self):
+        # given
+        mines_array = np.zeros((6, 6), dtype=bool)
+        mines_array[0, 0] = mines_array[2, 0] = mines_array[5, 5] = True
+        game = logic.Game(6, 6, 3, mines_array=mines_array)
+        game.reveal(1, 1)
+        game.toggle_flag(0, 0)
+
+        # when
+        unsatisfied = game.chord(1, 1)
+        game.toggle_flag(2, 0)
+        rows, columns = game.chord(1, 1)
+
+        # then
+        revealed = game.get_board().get_revealed_array()
+        self.assertEqual(0, len(unsatisfied[0]))
+        self.assertTrue(revealed[0:3, 0:3][~mines_array[0:3, 0:3]].all())
+        self.assertEqual(set(zip(*np.nonzero(revealed))) - {(1, 1)}, set(zip(rows, columns)))
+        self.assertEqual(3, game.get_message())
+
+        # given
+        game = logic.Game(6, 6, 3, mines_array=mines_array)
+        game.reveal(1, 1)
+        game.toggle_flag(0, 0)
+        game.toggle_flag(0, 1)
+
+        # when
+        game.chord(1, 1)
+
+        # then
+        self.assertEqual(2, game.get_message())
+        self.assertTrue(game.get_board().is_revealed(2, 0))
+
+    def test_replayShouldReproduceBatchedReveals(self):
+        # given
+        recorder = recording.Recorder()
+        game = logic.Game(15, 15, 30, rng=19, placement="area")
+        recorder.new_game(15, 15, 30, 19, placement="area")
+        game.set_recorder(recorder)
+        game.reveal_many(([7, 0, 14], [7, 14, 0]))
+        number = np.argwhere(game.get_board().get_revealed_array() & (game.get_board().get_border_values() > 0))[0]
+        game.chord(*number)
+
+        # when
+        replayed, events = recording.replay(recorder.to_bytes())
+
+        # then
+        self.assertEqual(3, events)
+        self.assertEqual(storage.dumps(game), storage.dumps(replayed))
+
+
 if __name__ == '__main__':
     unittest.main()